@@ -11,12 +11,20 @@ from uas_standards.interuss.automated_testing.scd.v1 import api as scd_api
 from monitoring.mock_uss import webapp
 from monitoring.mock_uss.config import KEY_BASE_URL
 from monitoring.mock_uss.f3548v21 import utm_client
-from monitoring.mock_uss.flights.database import FlightRecord, db
+from monitoring.mock_uss.flights.database import (
+    FlightRecord,
+    cached_operations,
+    flights,
+)
 from monitoring.monitorlib.clients import scd as scd_client
 from monitoring.monitorlib.clients.flight_planning.flight_info import FlightInfo
 from monitoring.monitorlib.fetch import QueryError
 from monitoring.monitorlib.geo import Altitude, AltitudeDatum, DistanceUnits, Volume3D
-from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
+from monitoring.monitorlib.geotemporal import (
+    Volume4D,
+    Volume4DCollection,
+    Volume4DIndex,
+)
 from monitoring.monitorlib.locality import Locality
 from monitoring.monitorlib.scd import priority_of
 from monitoring.uss_qualifier.resources.overrides import apply_overrides
@@ -119,6 +127,19 @@ def check_for_disallowed_conflicts(
 
     v1 = Volume4DCollection.from_interuss_scd_api(new_op_intent.details.volumes)
 
+    # Index all potentially-relevant operational intents so that only those near the prospective operational intent
+    # undergo exact intersection evaluation
+    index = Volume4DIndex()
+    for op_intent in op_intents:
+        index.add(
+            op_intent.reference.id,
+            Volume4DCollection.from_interuss_scd_api(
+                op_intent.details.volumes + op_intent.details.off_nominal_volumes
+            ),
+        )
+    intersecting_ids = set(index.intersecting_keys(v1))
+    preexisting_conflict_ids: Optional[set] = None
+
     for op_intent in op_intents:
         if (
             existing_flight
@@ -144,10 +165,6 @@ def check_for_disallowed_conflicts(
             )
             continue
 
-        v2 = Volume4DCollection.from_interuss_scd_api(
-            op_intent.details.volumes + op_intent.details.off_nominal_volumes
-        )
-
         modifying_activated = (
             existing_flight
             and existing_flight.op_intent.reference.state
@@ -155,16 +172,21 @@ def check_for_disallowed_conflicts(
             and op_intent.reference.state == scd_api.OperationalIntentState.Activated
         )
         if modifying_activated:
-            preexisting_conflict = Volume4DCollection.from_interuss_scd_api(
-                existing_flight.op_intent.details.volumes
-            ).intersects_vol4s(v2)
-            if preexisting_conflict:
+            if preexisting_conflict_ids is None:
+                preexisting_conflict_ids = set(
+                    index.intersecting_keys(
+                        Volume4DCollection.from_interuss_scd_api(
+                            existing_flight.op_intent.details.volumes
+                        )
+                    )
+                )
+            if op_intent.reference.id in preexisting_conflict_ids:
                 log(
                     f"intersection with {op_intent.reference.id} not considered: modification of Activated operational intent with a pre-existing conflict"
                 )
                 continue
 
-        if v1.intersects_vol4s(v2):
+        if op_intent.reference.id in intersecting_ids:
             raise PlanningError(
                 f"Requested flight (priority {new_priority}) intersected {op_intent.reference.manager}'s operational intent {op_intent.reference.id} (priority {old_priority})"
             )
@@ -382,23 +404,22 @@ def query_operational_intents(
     op_intent_refs = scd_client.query_operational_intent_references(
         utm_client, area_of_interest
     )
-    tx = db.value
     get_details_for = []
-    own_flights = {f.op_intent.reference.id: f for f in tx.flights.values() if f}
+    own_flights = {f.op_intent.reference.id: f for f in flights.values() if f}
     result = []
     for op_intent_ref in op_intent_refs:
+        cached_op_intent = cached_operations.get(op_intent_ref.id)
         if op_intent_ref.id in own_flights:
             # This is our own flight
             result.append(
                 op_intent_from_flightrecord(own_flights[op_intent_ref.id], "GET")
             )
         elif (
-            op_intent_ref.id in tx.cached_operations
-            and tx.cached_operations[op_intent_ref.id].reference.version
-            == op_intent_ref.version
+            cached_op_intent is not None
+            and cached_op_intent.reference.version == op_intent_ref.version
         ):
             # We have a current version of this op intent cached
-            result.append(tx.cached_operations[op_intent_ref.id])
+            result.append(cached_op_intent)
         else:
             # We need to get the details for this op intent
             get_details_for.append(op_intent_ref)
@@ -423,9 +444,9 @@ def query_operational_intents(
                 raise e
     result.extend(updated_op_intents)
 
-    with db as tx:
-        for op_intent in updated_op_intents:
-            tx.cached_operations[op_intent.reference.id] = op_intent
+    for op_intent in updated_op_intents:
+        with cached_operations.transact(op_intent.reference.id) as tx:
+            tx.value = op_intent
 
     return result
 
@@ -16,7 +16,7 @@ from uas_standards.astm.f3548.v21.api import (
 from monitoring.mock_uss import webapp
 from monitoring.mock_uss.auth import requires_scope
 from monitoring.mock_uss.f3548v21.flight_planning import op_intent_from_flightrecord
-from monitoring.mock_uss.flights.database import FlightRecord, db
+from monitoring.mock_uss.flights.database import FlightRecord, flights
 from monitoring.monitorlib import scd
 
 
@@ -26,9 +26,8 @@ def scdsc_get_operational_intent_details(entityid: str):
     """Implements getOperationalIntentDetails in ASTM SCD API."""
 
     # Look up entityid in database
-    tx = db.value
     flight = None
-    for f in tx.flights.values():
+    for f in flights.values():
         if f and f.op_intent.reference.id == entityid:
             flight = f
             break
@@ -61,9 +60,8 @@ def scdsc_get_operational_intent_telemetry(entityid: str):
     """Implements getOperationalIntentTelemetry in ASTM SCD API."""
 
     # Look up entityid in database
-    tx = db.value
     flight: Optional[FlightRecord] = None
-    for f in tx.flights.values():
+    for f in flights.values():
         if f and f.op_intent.reference.id == entityid:
             flight = f
             break
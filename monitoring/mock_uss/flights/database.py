@@ -1,6 +1,6 @@
 import json
 from datetime import timedelta
-from typing import Dict, Optional
+from typing import Optional
 
 from implicitdict import ImplicitDict
 from uas_standards.astm.f3548.v21.api import OperationalIntent
@@ -9,7 +9,7 @@ from monitoring.monitorlib.clients.flight_planning.flight_info import FlightInfo
 from monitoring.monitorlib.clients.mock_uss.mock_uss_scd_injection_api import (
     MockUssFlightBehavior,
 )
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.multiprocessing import SynchronizedKeyedValues
 
 DEADLOCK_TIMEOUT = timedelta(seconds=5)
 
@@ -23,14 +23,18 @@ class FlightRecord(ImplicitDict):
     locked: bool = False
 
 
-class Database(ImplicitDict):
-    """Simple in-memory pseudo-database tracking the state of the mock system"""
+def _decode_flight(b: bytes) -> Optional[FlightRecord]:
+    content = json.loads(b.decode("utf-8"))
+    # None is a placeholder for a new flight being created
+    return ImplicitDict.parse(content, FlightRecord) if content is not None else None
 
-    flights: Dict[str, Optional[FlightRecord]] = {}
-    cached_operations: Dict[str, OperationalIntent] = {}
 
+flights = SynchronizedKeyedValues(decoder=_decode_flight)
+"""Flights managed by this USS, by flight ID"""
 
-db = SynchronizedValue(
-    Database(),
-    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
+cached_operations = SynchronizedKeyedValues(
+    decoder=lambda b: ImplicitDict.parse(
+        json.loads(b.decode("utf-8")), OperationalIntent
+    ),
 )
+"""Operational intents managed by other USSs, by operational intent ID"""
@@ -1,72 +1,73 @@
-import time
-from datetime import UTC, datetime
+from datetime import timedelta
 from typing import Callable, Optional
 
-from monitoring.mock_uss.flights.database import DEADLOCK_TIMEOUT, FlightRecord, db
-from monitoring.monitorlib.delay import sleep
+from monitoring.mock_uss.flights.database import DEADLOCK_TIMEOUT, FlightRecord, flights
+from monitoring.monitorlib.multiprocessing import KeyedTransaction
 
 
-def lock_flight(flight_id: str, log: Callable[[str], None]) -> FlightRecord:
+def _flight_available(tx: KeyedTransaction) -> bool:
+    # A placeholder (None) for a new flight is always locked by the handler creating it
+    return not tx.exists or (tx.value is not None and not tx.value.locked)
+
+
+def lock_flight(
+    flight_id: str,
+    log: Callable[[str], None],
+    timeout: timedelta = DEADLOCK_TIMEOUT,
+) -> FlightRecord:
     # If this is a change to an existing flight, acquire lock to that flight
     log(f"Acquiring lock for flight {flight_id}")
-    deadline = datetime.now(UTC) + DEADLOCK_TIMEOUT
-    while True:
-        with db as tx:
-            if flight_id in tx.flights:
+    try:
+        # If we find an existing flight but it is locked, wait for it to become available
+        with flights.transact(
+            flight_id, wait_until=_flight_available, timeout=timeout.total_seconds()
+        ) as tx:
+            if tx.exists:
                 # This is an existing flight being modified
-                existing_flight = tx.flights[flight_id]
-                if existing_flight and not existing_flight.locked:
-                    log("Existing flight locked for update")
-                    existing_flight.locked = True
-                    break
+                log("Existing flight locked for update")
+                existing_flight = tx.value
+                existing_flight.locked = True
             else:
                 log("Request is for a new flight (lock established)")
-                tx.flights[flight_id] = None
+                tx.value = None
                 existing_flight = None
-                break
-        # We found an existing flight but it was locked; wait for it to become
-        # available
-        sleep(0.5, f"flight {flight_id} is currently already locked")
-
-        if datetime.now(UTC) > deadline:
-            raise RuntimeError(
-                f"Deadlock in inject_flight while attempting to gain access to flight {flight_id}"
-            )
+    except TimeoutError:
+        raise RuntimeError(
+            f"Deadlock in inject_flight while attempting to gain access to flight {flight_id}"
+        )
     return existing_flight
 
 
 def release_flight_lock(flight_id: str, log: Callable[[str], None]) -> None:
-    with db as tx:
-        if flight_id in tx.flights:
-            if tx.flights[flight_id]:
+    with flights.transact(flight_id) as tx:
+        if tx.exists:
+            if tx.value:
                 # FlightRecord was a true existing flight
                 log(f"Releasing lock on existing flight_id {flight_id}")
-                tx.flights[flight_id].locked = False
+                tx.value.locked = False
             else:
                 # FlightRecord was just a placeholder for a new flight
                 log(f"Releasing placeholder for existing flight_id {flight_id}")
-                del tx.flights[flight_id]
+                tx.delete()
 
 
-def delete_flight_record(flight_id: str) -> Optional[FlightRecord]:
-    deadline = datetime.now(UTC) + DEADLOCK_TIMEOUT
-    while True:
-        with db as tx:
-            if flight_id in tx.flights:
-                flight = tx.flights[flight_id]
-                if flight and not flight.locked:
-                    # FlightRecord was a true existing flight not being mutated anywhere else
-                    del tx.flights[flight_id]
-                    return flight
-            else:
+def delete_flight_record(
+    flight_id: str, timeout: timedelta = DEADLOCK_TIMEOUT
+) -> Optional[FlightRecord]:
+    try:
+        # There may be a race condition with another handler to create or modify the requested flight; wait for that to
+        # resolve
+        with flights.transact(
+            flight_id, wait_until=_flight_available, timeout=timeout.total_seconds()
+        ) as tx:
+            if not tx.exists:
                 # No FlightRecord found
                 return None
-        # There is a race condition with another handler to create or modify the requested flight; wait for that to resolve
-        sleep(
-            0.5,
-            f"flight {flight_id} is currently already locked while we are trying to delete it",
+            # FlightRecord was a true existing flight not being mutated anywhere else
+            flight = tx.value
+            tx.delete()
+            return flight
+    except TimeoutError:
+        raise RuntimeError(
+            f"Deadlock in delete_flight while attempting to gain access to flight {flight_id} (timeout: {timeout})"
         )
-        if datetime.now(UTC) > deadline:
-            raise RuntimeError(
-                f"Deadlock in delete_flight while attempting to gain access to flight {flight_id} (now: {datetime.now(UTC)}, deadline: {deadline})"
-            )
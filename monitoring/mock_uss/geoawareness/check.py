@@ -9,7 +9,10 @@ from uas_standards.interuss.automated_testing.geo_awareness.v1.api import (
 )
 
 from monitoring.mock_uss.geoawareness.database import Database, SourceRecord, db
-from monitoring.mock_uss.geoawareness.ed269 import evaluate_source
+from monitoring.mock_uss.geoawareness.ed269 import (
+    discard_stale_indices,
+    get_source_index,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -29,6 +32,7 @@ def combine_results(
 
 def check_geozones(req: GeozonesCheckRequest) -> List[GeozonesCheckResultGeozone]:
     sources: Dict[str, SourceRecord] = Database.get_sources(db)
+    discard_stale_indices(sources)
 
     results: List[GeozonesCheckResultGeozone] = [
         GeozonesCheckResultGeozone.Absent
@@ -49,7 +53,8 @@ def check_geozones(req: GeozonesCheckRequest) -> List[GeozonesCheckResultGeozone
             if fmt == GeozoneHttpsSourceFormat.ED_269:
                 logger.debug(f" {j+1}. ED269 source {source_id} ready.")
                 result = combine_results(
-                    result, evaluate_source(source, check.filterSets)
+                    result,
+                    get_source_index(source_id, source).evaluate(check.filterSets),
                 )
             else:
                 logger.debug(
@@ -8,7 +8,7 @@ from uas_standards.interuss.automated_testing.geo_awareness.v1.api import (
     GeozoneSourceResponseResult,
 )
 
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.multiprocessing import SynchronizedKeyedValues
 
 
 class ExistingRecordException(ValueError):
@@ -22,65 +22,65 @@ class SourceRecord(ImplicitDict):
     geozone_ed269: Optional[ED269Schema]
 
 
-class Database(ImplicitDict):
-    """Simple pseudo-database structure tracking the state of the mock system"""
+class Database(object):
+    """Simple pseudo-database structure tracking the state of the mock system.
 
-    sources: Dict[str, SourceRecord] = {}
+    Sources are stored by ID in a SynchronizedKeyedValues, so reading them only decodes sources changed since they
+    were last read in this process.
+    """
 
     @staticmethod
-    def get_source(db: SynchronizedValue, id: str) -> SourceRecord:
-        return db.value.sources.get(id, None)
+    def get_source(db: SynchronizedKeyedValues, id: str) -> SourceRecord:
+        return db.get(id, None)
 
     @staticmethod
-    def get_sources(db: SynchronizedValue) -> SourceRecord:
-        return db.value.sources
+    def get_sources(db: SynchronizedKeyedValues) -> Dict[str, SourceRecord]:
+        return dict(db.items())
 
     @staticmethod
     def insert_source(
-        db: SynchronizedValue,
+        db: SynchronizedKeyedValues,
         id: str,
         definition: CreateGeozoneSourceRequest,
         state: GeozoneSourceResponseResult,
         message: Optional[str] = None,
     ) -> SourceRecord:
-        with db as tx:
-            if id in tx.sources.keys():
+        with db.transact(id) as tx:
+            if tx.exists:
                 raise ExistingRecordException()
-            tx.sources[id] = SourceRecord(
-                definition=definition, state=state, message=message
-            )
-            result = tx.sources[id]
+            tx.value = SourceRecord(definition=definition, state=state, message=message)
+            result = tx.value
         return result
 
     @staticmethod
     def update_source_state(
-        db: SynchronizedValue,
+        db: SynchronizedKeyedValues,
         id: str,
         state: GeozoneSourceResponseResult,
         message: Optional[str] = None,
     ):
-        with db as tx:
-            tx.sources[id]["state"] = state
-            tx.sources[id]["message"] = message
-            result = tx.sources[id]
+        with db.transact(id) as tx:
+            tx.value["state"] = state
+            tx.value["message"] = message
+            result = tx.value
         return result
 
     @staticmethod
     def update_source_geozone_ed269(
-        db: SynchronizedValue, id: str, geozone: ED269Schema
+        db: SynchronizedKeyedValues, id: str, geozone: ED269Schema
     ):
-        with db as tx:
-            tx.sources[id]["geozone_ed269"] = geozone
-            result = tx.sources[id]
+        with db.transact(id) as tx:
+            tx.value["geozone_ed269"] = geozone
+            result = tx.value
         return result
 
     @staticmethod
-    def delete_source(db: SynchronizedValue, id: str):
-        with db as tx:
-            return tx.sources.pop(id, None)
+    def delete_source(db: SynchronizedKeyedValues, id: str):
+        return db.pop(id, None)
 
 
-db = SynchronizedValue(
-    Database(),
-    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
+db = SynchronizedKeyedValues(
+    capacity_bytes=160e6,
+    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), SourceRecord),
 )
+"""Geozone sources, by source ID"""
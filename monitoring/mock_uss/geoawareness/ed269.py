@@ -1,16 +1,24 @@
 import ast
 import json
 import logging
+import math
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
+import numpy as np
 import s2sphere
 from implicitdict import StringBasedDateTime
 from s2sphere import LatLng
+from shapely.affinity import scale
 from shapely.geometry import Point, Polygon
+from shapely.geometry.base import BaseGeometry
+from shapely.prepared import PreparedGeometry, prep
+from shapely.strtree import STRtree
 from uas_standards.eurocae_ed269 import (
     YESNO,
+    ED269Schema,
     HorizontalProjectionType,
+    UASZoneAirspaceVolume,
     UASZoneVersion,
     UomDimensions,
 )
@@ -23,7 +31,7 @@ from uas_standards.interuss.automated_testing.geo_awareness.v1.api import (
 )
 
 from monitoring.mock_uss.geoawareness.database import SourceRecord
-from monitoring.monitorlib.geo import flatten
+from monitoring.monitorlib.geo import EARTH_CIRCUMFERENCE_M, flatten
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -190,11 +198,19 @@ def evaluate_non_spacetime(
     if ed269 is None:
         return True
 
-    uspace_class_filter = ed269.get("uSpaceClass", None)
-    uspace_class: Optional[List[str]] = _adjust_uspace_class(
-        feature.get("uSpaceClass", None)
+    return _matches_non_spacetime(
+        _adjust_uspace_class(feature.get("uSpaceClass", None)),
+        feature.get("restriction", None),
+        ed269,
     )
 
+
+def _matches_non_spacetime(
+    uspace_class: Optional[List[str]],
+    restriction: Optional[str],
+    ed269: ED269Filters,
+) -> bool:
+    uspace_class_filter = ed269.get("uSpaceClass", None)
     if uspace_class_filter is not None:
         if uspace_class is None:
             return False
@@ -202,7 +218,6 @@ def evaluate_non_spacetime(
             return False
 
     acceptable_restrictions_filter = ed269.get("acceptableRestrictions", None)
-    restriction = feature.get("restriction", None)
     if (
         acceptable_restrictions_filter is not None
         and restriction not in acceptable_restrictions_filter
@@ -251,17 +266,189 @@ def evaluate_features(
     return GeozonesCheckResultGeozone.Absent
 
 
-def evaluate_source(source: SourceRecord, filter_sets: List[GeozonesFilterSet]):
+def _geometry_lnglat(g: UASZoneAirspaceVolume) -> List[BaseGeometry]:
+    """Horizontal projection of an airspace volume in (lng, lat) coordinates.
+
+    Equivalent to flattening each shape around a reference point on it (as evaluate_position does), since that
+    flattening is an axis-aligned scaling of (lng, lat) which preserves which points are contained in the shape.
+    """
+    if g.horizontalProjection.type == HorizontalProjectionType.Circle:
+        center = g.horizontalProjection.center  # Lng / Lat
+        radius = convert_distance(
+            g.horizontalProjection.radius, g.uomDimensions, UomDimensions.M
+        )
+        m_per_deg_lat = EARTH_CIRCUMFERENCE_M / 360
+        m_per_deg_lng = m_per_deg_lat * math.cos(math.radians(center[1]))
+        return [
+            scale(
+                Point(center[0], center[1]).buffer(1),
+                xfact=radius / m_per_deg_lng,
+                yfact=radius / m_per_deg_lat,
+                origin=(center[0], center[1]),
+            )
+        ]
+    else:
+        return [
+            Polygon([(p[0], p[1]) for p in coord])  # Lng / Lat
+            for coord in g.horizontalProjection.coordinates
+        ]
+
+
+def _timestamp(t: Optional[StringBasedDateTime], default: float) -> float:
+    return default if t is None else t.datetime.timestamp()
+
+
+class CompiledFeature(object):
+    """Parts of a geozone feature needed for evaluation, computed once."""
+
+    feature: UASZoneVersion
+    uspace_class: Optional[List[str]]
+    restriction: Optional[str]
+
+    def __init__(self, feature: UASZoneVersion):
+        self.feature = feature
+        self.uspace_class = _adjust_uspace_class(feature.get("uSpaceClass", None))
+        self.restriction = feature.get("restriction", None)
+
+
+class ED269Index(object):
+    """ED-269 geozones compiled once into prepared (lng, lat) geometries indexed by an STRtree, and applicability
+    periods indexed as arrays, so filter sets can be evaluated without re-processing the source.
+    """
+
+    features: List[CompiledFeature]
+
+    _geometries: List[BaseGeometry]
+    _prepared: List[PreparedGeometry]
+    _geometry_features: List[int]
+    """Index of the feature to which each geometry belongs"""
+    _geometry_indices: Dict[int, int]
+    """Index of each geometry, by id() of the geometry"""
+    _tree: Optional[STRtree]
+
+    _period_starts: np.ndarray
+    _period_ends: np.ndarray
+    _period_features: np.ndarray
+    """Start and end timestamps of each applicability period, and the index of the feature to which it belongs"""
+
+    def __init__(self, geozone: ED269Schema):
+        self.features = []
+        self._geometries = []
+        self._geometry_features = []
+        period_starts = []
+        period_ends = []
+        period_features = []
+        for f, feature in enumerate(geozone.features):
+            self.features.append(CompiledFeature(feature))
+            for g in feature.geometry:
+                for geometry in _geometry_lnglat(g):
+                    self._geometries.append(geometry)
+                    self._geometry_features.append(f)
+            for a in feature.applicability:
+                if a.permanent == YESNO.YES:
+                    period_starts.append(-math.inf)
+                    period_ends.append(math.inf)
+                else:
+                    # Note that schedules are not taken into account (see evaluate_timing)
+                    period_starts.append(
+                        _timestamp(a.get("startDateTime", None), -math.inf)
+                    )
+                    period_ends.append(_timestamp(a.get("endDateTime", None), math.inf))
+                period_features.append(f)
+
+        self._prepared = [prep(g) for g in self._geometries]
+        self._geometry_indices = {id(g): i for i, g in enumerate(self._geometries)}
+        self._tree = STRtree(self._geometries) if self._geometries else None
+        self._period_starts = np.array(period_starts, dtype=float)
+        self._period_ends = np.array(period_ends, dtype=float)
+        self._period_features = np.array(period_features, dtype=int)
+
+    def _features_at(self, position: Position) -> Set[int]:
+        """Indices of features with a geometry containing the position"""
+        if self._tree is None:
+            return set()
+        point = Point(position.longitude, position.latitude)
+        result = set()
+        for hit in self._tree.query(point):
+            # Shapely 1.x returns the geometries themselves while Shapely 2.x returns their indices
+            i = (
+                int(hit)
+                if isinstance(hit, (int, np.integer))
+                else self._geometry_indices[id(hit)]
+            )
+            if self._prepared[i].contains(point):
+                result.add(self._geometry_features[i])
+        return result
+
+    def _features_during(
+        self,
+        after: Optional[StringBasedDateTime],
+        before: Optional[StringBasedDateTime],
+    ) -> np.ndarray:
+        """Whether each feature has an applicability period overlapping the specified time range"""
+        in_range = (self._period_starts < _timestamp(before, math.inf)) & (
+            self._period_ends > _timestamp(after, -math.inf)
+        )
+        result = np.zeros(len(self.features), dtype=bool)
+        result[self._period_features[in_range]] = True
+        return result
+
+    def matches(self, filter_set: GeozonesFilterSet) -> bool:
+        """Returns True if any feature matches the filter set (see evaluate_feature)"""
+        position = filter_set.get("position", None)
+        candidates = (
+            range(len(self.features))
+            if position is None
+            else sorted(self._features_at(position))
+        )
+        if not candidates:
+            return False
+        in_time_range = self._features_during(
+            filter_set.get("after", None), filter_set.get("before", None)
+        )
+        ed269 = filter_set.get("ed269", None)
+        for f in candidates:
+            if not in_time_range[f]:
+                continue
+            feature = self.features[f]
+            if ed269 is None or _matches_non_spacetime(
+                feature.uspace_class, feature.restriction, ed269
+            ):
+                logger.info(f"  {feature.feature.identifier}: Present")
+                return True
+        return False
+
+    def evaluate(
+        self, filter_sets: List[GeozonesFilterSet]
+    ) -> GeozonesCheckResultGeozone:
+        if len(filter_sets) == 0:
+            return GeozonesCheckResultGeozone.Present
+        for f in filter_sets:
+            if self.matches(f):
+                return GeozonesCheckResultGeozone.Present
+        return GeozonesCheckResultGeozone.Absent
+
+
+_indices: Dict[str, Tuple[SourceRecord, ED269Index]] = {}
+"""Compiled ED-269 sources in this process, along with the source record from which each was compiled"""
+
+
+def get_source_index(source_id: str, source: SourceRecord) -> ED269Index:
+    """Get the compiled index of the ED-269 geozones of a ready source, compiling it if necessary."""
     if not (
         source.state == GeozoneSourceResponseResult.Ready and "geozone_ed269" in source
     ):
         raise ValueError("Source not loaded correctly. geozone_ed269 field missing.")
 
-    if len(filter_sets) == 0:
-        return GeozonesCheckResultGeozone.Present
+    cached = _indices.get(source_id, None)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+    index = ED269Index(source.geozone_ed269)
+    _indices[source_id] = (source, index)
+    return index
 
-    features = source["geozone_ed269"]["features"]
-    for f in filter_sets:
-        if evaluate_features(features, f) == GeozonesCheckResultGeozone.Present:
-            return GeozonesCheckResultGeozone.Present
-    return GeozonesCheckResultGeozone.Absent
+
+def discard_stale_indices(source_ids: Iterable[str]) -> None:
+    """Discard the compiled indices of any sources other than those specified."""
+    for source_id in set(_indices) - set(source_ids):
+        del _indices[source_id]
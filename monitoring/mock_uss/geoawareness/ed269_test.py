@@ -1,3 +1,5 @@
+import random
+
 import pytest
 from implicitdict import StringBasedDateTime
 from s2sphere import LatLng
@@ -5,6 +7,7 @@ from uas_standards.eurocae_ed269 import (
     YESNO,
     ApplicableTimePeriod,
     CircleOrPolygonType,
+    ED269Schema,
     UASZoneAirspaceVolume,
     UASZoneVersion,
     UomDimensions,
@@ -12,11 +15,15 @@ from uas_standards.eurocae_ed269 import (
 )
 from uas_standards.interuss.automated_testing.geo_awareness.v1.api import (
     ED269Filters,
+    GeozonesCheckResultGeozone,
+    GeozonesFilterSet,
     Position,
 )
 
 from monitoring.mock_uss.geoawareness.ed269 import (
+    ED269Index,
     convert_distance,
+    evaluate_features,
     evaluate_non_spacetime,
     evaluate_position,
     evaluate_timing,
@@ -450,3 +457,82 @@ def test_evaluate_non_spacetime():
         )
         is False
     )
+
+
+def test_index_matches_feature_evaluation():
+    d1 = StringBasedDateTime("2022-02-01T00:00:00Z")
+    d2 = StringBasedDateTime("2022-02-02T00:00:00Z")
+    d3 = StringBasedDateTime("2022-02-03T00:00:00Z")
+    d4 = StringBasedDateTime("2022-02-04T00:00:00Z")
+    other_fields = {
+        "country": "CHE",
+        "type": "COMMON",
+        "zoneAuthority": [],
+    }
+    features = [
+        UASZoneVersion(
+            identifier="circle",
+            geometry=[circle1],
+            applicability=[
+                ApplicableTimePeriod(
+                    permanent=YESNO.NO, startDateTime=d1, endDateTime=d2
+                )
+            ],
+            restriction="PROHIBITED",
+            uSpaceClass="C1",
+            **other_fields,
+        ),
+        UASZoneVersion(
+            identifier="polygon",
+            geometry=[polygon1],
+            applicability=[
+                ApplicableTimePeriod(permanent=YESNO.NO, startDateTime=d3),
+            ],
+            restriction="REQ_AUTHORISATION",
+            **other_fields,
+        ),
+        UASZoneVersion(
+            identifier="both",
+            geometry=[polygon1, circle1],
+            applicability=[ApplicableTimePeriod(permanent=YESNO.YES)],
+            restriction="CONDITIONAL",
+            uSpaceClass='["C1", "C2"]',
+            **other_fields,
+        ),
+    ]
+    index = ED269Index(ED269Schema(title="T", description="D", features=features))
+
+    rng = random.Random(0)
+    times = [None, d1, d2, d3, d4]
+    ed269_filters = [
+        None,
+        ED269Filters(uSpaceClass="C1"),
+        ED269Filters(uSpaceClass="C2"),
+        ED269Filters(acceptableRestrictions=["PROHIBITED", "REQ_AUTHORISATION"]),
+    ]
+    present = 0
+    for _ in range(500):
+        filter_set = {}
+        if rng.random() < 0.9:
+            filter_set["position"] = Position(
+                uomDimensions=UomDimensions.M,
+                verticalReferenceType=VerticalReferenceType.AGL,
+                height=100,
+                longitude=rng.uniform(6.05, 6.25),
+                latitude=rng.uniform(46.14, 46.26),
+            )
+        after, before = rng.choice(times), rng.choice(times)
+        if after is not None:
+            filter_set["after"] = after
+        if before is not None:
+            filter_set["before"] = before
+        ed269 = rng.choice(ed269_filters)
+        if ed269 is not None:
+            filter_set["ed269"] = ed269
+        filter_set = GeozonesFilterSet(**filter_set)
+
+        expected = evaluate_features(features, filter_set)
+        assert index.evaluate([filter_set]) == expected
+        if expected == GeozonesCheckResultGeozone.Present:
+            present += 1
+    assert 0 < present < 500
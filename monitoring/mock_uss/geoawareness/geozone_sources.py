@@ -13,6 +13,7 @@ from monitoring.mock_uss.geoawareness.database import (
     ExistingRecordException,
     db,
 )
+from monitoring.mock_uss.geoawareness.ed269 import get_source_index
 
 
 def get_geozone_source(geozone_source_id: str):
@@ -46,6 +47,8 @@ def create_geozone_source(id, source_definition: CreateGeozoneSourceRequest):
                 source = Database.update_source_state(
                     db, id, GeozoneSourceResponseResult.Ready
                 )
+                # Compile the geozones now rather than upon the first check
+                get_source_index(id, Database.get_source(db, id))
         except ValueError as e:
             source = Database.update_source_state(
                 db,
@@ -1,6 +1,5 @@
 import datetime
 import json
-import os
 
 import flask
 
@@ -12,12 +11,21 @@ from monitoring.monitorlib.clients.mock_uss.interactions import (
     QueryDirection,
 )
 from monitoring.monitorlib.fetch import Query, QueryType, describe_flask_query
+from monitoring.monitorlib.indexed_log import BackgroundLogWriter
 
 require_config_value(KEY_INTERACTIONS_LOG_DIR)
 
-# We use dashes between hours, minutes and seconds, because colons might be problematic for Windows,
-# and the CI is unhappy about them in filenames.
-LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT = "%Y-%m-%dT%H-%M-%S.%fZ"
+# Interactions are appended to an indexed log (see monitorlib.indexed_log) with a kind of <direction>_<method>, eg
+# Incoming_GET.  Interactions are encoded and written in the background so request handling does not wait on disk I/O.
+_log = BackgroundLogWriter(
+    webapp.config[KEY_INTERACTIONS_LOG_DIR],
+    encode=lambda interaction: json.dumps(interaction).encode("utf-8"),
+)
+
+
+def flush_interactions() -> None:
+    """Wait until all interactions logged by this process have been written."""
+    _log.flush()
 
 
 def log_interaction(direction: QueryDirection, query: Query) -> None:
@@ -33,17 +41,7 @@ def log_interaction(direction: QueryDirection, query: Query) -> None:
 
 
 def log_file(code: str, content: Interaction) -> None:
-    log_path = webapp.config[KEY_INTERACTIONS_LOG_DIR]
-    n = len(os.listdir(log_path))
-    basename = "{:06d}_{}_{}.json".format(
-        n,
-        code,
-        content.interaction_time().strftime(
-            LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT
-        ),
-    )
-    with open(os.path.join(log_path, basename), "w") as f:
-        json.dump(content, f)
+    _log.append(content.interaction_time(), code, content)
 
 
 class InteractionLoggingHook(QueryHook):
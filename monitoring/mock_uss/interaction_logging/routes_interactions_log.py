@@ -1,22 +1,15 @@
-import json
 import os
-from datetime import datetime
-from typing import List, Tuple
+from typing import Iterator, Tuple
 
-from flask import Response, jsonify, request
-from implicitdict import ImplicitDict, StringBasedDateTime
+from flask import Response, request, stream_with_context
+from implicitdict import StringBasedDateTime
 from loguru import logger
 
 from monitoring.mock_uss import webapp
 from monitoring.mock_uss.auth import requires_scope
 from monitoring.mock_uss.interaction_logging.config import KEY_INTERACTIONS_LOG_DIR
-from monitoring.mock_uss.interaction_logging.logger import (
-    LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT,
-)
-from monitoring.monitorlib.clients.mock_uss.interactions import (
-    Interaction,
-    ListLogsResponse,
-)
+from monitoring.mock_uss.interaction_logging.logger import flush_interactions
+from monitoring.monitorlib import indexed_log
 from monitoring.monitorlib.scd_automated_testing.scd_injection_api import (
     SCOPE_SCD_QUALIFIER_INJECT,
 )
@@ -37,39 +30,22 @@ def interaction_logs() -> Tuple[Response, int]:
     if not os.path.exists(log_path):
         raise ValueError(f"Configured log path {log_path} does not exist")
 
-    # individual interactions are logged to a file of the form <index>_<direction>_<method>_<timestamp>.json, eg
-    # 000001_Incoming_GET_2023-08-30T20-48-21.900000Z.json
-    interactions: List[Interaction] = []
-
-    for fname in os.listdir(log_path):
-        # Parse the interaction time from the file name:
-        fname_parts = fname.split("_")
-        if len(fname_parts) != 4:
-            logger.warning(
-                f"Skipping file {fname} as it does not match the expected format"
-            )
-            continue
-        interaction_time = StringBasedDateTime(
-            datetime.strptime(
-                fname_parts[3].removesuffix(".json"),
-                LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT,
-            )
-        )
-        if interaction_time.datetime < from_time.datetime:
-            continue
-        with open(os.path.join(log_path, fname), "r") as f:
-            try:
-                obj = json.load(f)
-                interaction = ImplicitDict.parse(obj, Interaction)
-                if interaction.interaction_time() >= from_time.datetime:
-                    interactions.append(interaction)
-            except (KeyError, ValueError) as e:
-                msg = f"Error occurred in reading interaction from file {fname}: {e}"
-                raise type(e)(msg)
-
-    # Sort by interaction time
-    interactions.sort(key=lambda i: i.interaction_time())
-    return jsonify(ListLogsResponse(interactions=interactions)), 200
+    flush_interactions()
+
+    # Interactions are sorted by interaction time in the index, so the response can be streamed from the records on
+    # disk without parsing them
+    entries = indexed_log.find(log_path, from_time=from_time.datetime)
+
+    def generate_response() -> Iterator[bytes]:
+        yield b'{"interactions": ['
+        for i, content in enumerate(indexed_log.iter_contents(entries)):
+            yield content if i == 0 else b", " + content
+        yield b"]}"
+
+    return (
+        Response(stream_with_context(generate_response()), mimetype="application/json"),
+        200,
+    )
 
 
 @webapp.route("/mock_uss/interuss_logging/logs", methods=["DELETE"])
@@ -81,6 +57,9 @@ def delete_interaction_logs() -> Tuple[str, int]:
     if not os.path.exists(log_path):
         raise ValueError(f"Configured log path {log_path} does not exist")
 
+    # Make sure interactions logged before this request are not written after the log is cleared
+    flush_interactions()
+
     logger.debug(f"Number of files in {log_path}: {len(os.listdir(log_path))}")
 
     num_removed = 0
@@ -1,10 +1,9 @@
+import hashlib
 import math
-import random
-from typing import List
+from typing import List, Tuple
 
+import numpy as np
 import s2sphere
-from implicitdict import ImplicitDict
-from loguru import logger
 from s2sphere import LatLngRect
 from uas_standards.interuss.automated_testing.rid.v1 import (
     observation as observation_api,
@@ -13,88 +12,158 @@ from uas_standards.interuss.automated_testing.rid.v1 import (
 from monitoring.monitorlib import geo
 from monitoring.monitorlib.rid import RIDVersion
 
-
-class Point(object):
-    x: float
-    y: float
-
-    def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
-
-
-class Cluster(ImplicitDict):
-    x_min: float
-    x_max: float
-    y_min: float
-    y_max: float
-    points: List[Point]
-
-    def width(self):
-        return math.fabs(self.x_max - self.x_min)
-
-    def height(self):
-        return math.fabs(self.y_max - self.y_min)
-
-    def area(self):
+CELL_SIZE_MARGIN = 1.01
+"""Factor by which clustering grid cells exceed the minimum cluster dimensions, so that clusters still satisfy the
+minimums after the approximations of flattening and of computing areas."""
+
+
+class Clusters(object):
+    """Flat (x, y in meters) bounds of a set of clusters, and the extents of the points in each, as parallel arrays."""
+
+    x_min: np.ndarray
+    x_max: np.ndarray
+    y_min: np.ndarray
+    y_max: np.ndarray
+
+    u_min: np.ndarray
+    u_max: np.ndarray
+    v_min: np.ndarray
+    v_max: np.ndarray
+    """Extents of the (x=u, y=v) points in each cluster"""
+
+    counts: np.ndarray
+    """Number of points in each cluster"""
+
+    def __init__(
+        self,
+        x_min: np.ndarray,
+        x_max: np.ndarray,
+        y_min: np.ndarray,
+        y_max: np.ndarray,
+        u_min: np.ndarray,
+        u_max: np.ndarray,
+        v_min: np.ndarray,
+        v_max: np.ndarray,
+        counts: np.ndarray,
+    ):
+        # Clusters must always contain their points
+        self.x_min = np.minimum(x_min, u_min)
+        self.x_max = np.maximum(x_max, u_max)
+        self.y_min = np.minimum(y_min, v_min)
+        self.y_max = np.maximum(y_max, v_max)
+        self.u_min = u_min
+        self.u_max = u_max
+        self.v_min = v_min
+        self.v_max = v_max
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def width(self) -> np.ndarray:
+        return self.x_max - self.x_min
+
+    def height(self) -> np.ndarray:
+        return self.y_max - self.y_min
+
+    def area(self) -> np.ndarray:
         return self.width() * self.height()
 
-    def randomize(self):
-        u_min = min(p.x for p in self.points)
-        v_min = min(p.y for p in self.points)
-        u_max = max(p.x for p in self.points)
-        v_max = max(p.y for p in self.points)
-
-        x_offset = random.uniform(-u_max, u_min)
-        y_offset = random.uniform(-v_max, v_min)
-        return Cluster(
-            x_min=self.x_min + x_offset,
-            y_min=self.y_min + y_offset,
-            x_max=self.x_max + x_offset,
-            y_max=self.y_max + y_offset,
-            points=self.points,
-        )
-
-    def extend(self, rid_version: RIDVersion, view_area_sqm: float):
-        """Extend cluster size and dimensions to the minimum required"""
-
-        cluster = self
-
-        # Extend cluster width to match the minimum distance required by NET0490
-        if cluster.width() < 2 * rid_version.min_obfuscation_distance_m:
-            delta = rid_version.min_obfuscation_distance_m - cluster.width() / 2
-            cluster = Cluster(
-                x_min=cluster.x_min - delta,
-                x_max=cluster.x_max + delta,
-                y_min=cluster.y_min,
-                y_max=cluster.y_max,
-                points=cluster.points,
-            )
-
-        # Extend cluster height to match the minimum distance required by NET0490
-        if cluster.height() < 2 * rid_version.min_obfuscation_distance_m:
-            delta = rid_version.min_obfuscation_distance_m - cluster.height() / 2
-            cluster = Cluster(
-                x_min=cluster.x_min,
-                x_max=cluster.x_max,
-                y_min=cluster.y_min - delta,
-                y_max=cluster.y_max + delta,
-                points=cluster.points,
-            )
-
-        # Extend cluster to the minimum area size required by NET0480
+    def randomize(self, rng: np.random.Generator) -> None:
+        """Offset each cluster randomly while keeping all of its points inside it."""
+        x_offset = rng.uniform(self.u_max - self.x_max, self.u_min - self.x_min)
+        y_offset = rng.uniform(self.v_max - self.y_max, self.v_min - self.y_min)
+        self.x_min = self.x_min + x_offset
+        self.x_max = self.x_max + x_offset
+        self.y_min = self.y_min + y_offset
+        self.y_max = self.y_max + y_offset
+
+    def extend(self, rid_version: RIDVersion, view_area_sqm: float) -> None:
+        """Extend cluster sizes and dimensions to the minimums required"""
+
+        # Extend cluster widths and heights to match the minimum distance required by NET0490
+        min_dim = 2 * rid_version.min_obfuscation_distance_m
+        delta = np.maximum(min_dim - self.width(), 0) / 2
+        self.x_min = self.x_min - delta
+        self.x_max = self.x_max + delta
+        delta = np.maximum(min_dim - self.height(), 0) / 2
+        self.y_min = self.y_min - delta
+        self.y_max = self.y_max + delta
+
+        # Extend clusters to the minimum area size required by NET0480
         min_cluster_area = view_area_sqm * rid_version.min_cluster_size_percent / 100
-        if self.area() < min_cluster_area:
-            scale = math.sqrt(min_cluster_area / self.area()) / 2
-            cluster = Cluster(
-                x_min=self.x_min - scale * self.width(),
-                x_max=self.x_max + scale * self.width(),
-                y_min=self.y_min - scale * self.height(),
-                y_max=self.y_max + scale * self.height(),
-                points=self.points,
-            )
-
-        return cluster
+        area = self.area()
+        scale = np.where(
+            area < min_cluster_area,
+            np.sqrt(min_cluster_area / area) / 2,
+            0,
+        )
+        dx = scale * self.width()
+        dy = scale * self.height()
+        self.x_min = self.x_min - dx
+        self.x_max = self.x_max + dx
+        self.y_min = self.y_min - dy
+        self.y_max = self.y_max + dy
+
+
+def _grid_shape(
+    width: float, height: float, rid_version: RIDVersion, view_area_sqm: float
+) -> Tuple[int, int]:
+    """Determine the number of (columns, rows) of the largest grid over the view whose cells each meet the minimum
+    cluster dimensions (NET0490) and area (NET0480)."""
+    min_cluster_area = view_area_sqm * rid_version.min_cluster_size_percent / 100
+    min_side = CELL_SIZE_MARGIN * max(
+        math.sqrt(min_cluster_area), 2 * rid_version.min_obfuscation_distance_m
+    )
+    return max(1, int(width // min_side)), max(1, int(height // min_side))
+
+
+def _view_seed(view_min: s2sphere.LatLng, view_max: s2sphere.LatLng) -> int:
+    """Random seed determined by the view, so repeated requests for the same view produce the same clusters."""
+    view_key = "{:.7f},{:.7f},{:.7f},{:.7f}".format(
+        view_min.lat().degrees,
+        view_min.lng().degrees,
+        view_max.lat().degrees,
+        view_max.lng().degrees,
+    )
+    return int.from_bytes(hashlib.sha256(view_key.encode("utf-8")).digest()[0:8], "big")
+
+
+def _grid_clusters(
+    xs: np.ndarray, ys: np.ndarray, width: float, height: float, nx: int, ny: int
+) -> Clusters:
+    """Cluster the (xs, ys) points according to the cell of an nx by ny grid over the view in which they lie."""
+    cell_w = width / nx
+    cell_h = height / ny
+    ix = np.clip(np.floor(xs / cell_w), 0, nx - 1).astype(int)
+    iy = np.clip(np.floor(ys / cell_h), 0, ny - 1).astype(int)
+    cells, inverse, counts = np.unique(
+        iy * nx + ix, return_inverse=True, return_counts=True
+    )
+
+    n = len(cells)
+    u_min = np.full(n, np.inf)
+    u_max = np.full(n, -np.inf)
+    v_min = np.full(n, np.inf)
+    v_max = np.full(n, -np.inf)
+    np.minimum.at(u_min, inverse, xs)
+    np.maximum.at(u_max, inverse, xs)
+    np.minimum.at(v_min, inverse, ys)
+    np.maximum.at(v_max, inverse, ys)
+
+    x_min = (cells % nx) * cell_w
+    y_min = (cells // nx) * cell_h
+    return Clusters(
+        x_min=x_min,
+        x_max=x_min + cell_w,
+        y_min=y_min,
+        y_max=y_min + cell_h,
+        u_min=u_min,
+        u_max=u_max,
+        v_min=v_min,
+        v_max=v_max,
+        counts=counts,
+    )
 
 
 def make_clusters(
@@ -106,39 +175,25 @@ def make_clusters(
     if not flights:
         return []
 
-    # Make the initial cluster
-    points: List[Point] = [
-        Point(
-            *geo.flatten(
-                view_min,
-                s2sphere.LatLng.from_degrees(
-                    flight.most_recent_position.lat, flight.most_recent_position.lng
-                ),
-            )
-        )
-        for flight in flights
-    ]
+    xs, ys = geo.flatten_many(
+        view_min,
+        np.array([flight.most_recent_position.lat for flight in flights]),
+        np.array([flight.most_recent_position.lng for flight in flights]),
+    )
     x_max, y_max = geo.flatten(view_min, view_max)
-    clusters: List[Cluster] = [
-        Cluster(x_min=0, y_min=0, x_max=x_max, y_max=y_max, points=points)
-    ]
-
-    # TODO: subdivide cluster into many clusters
-
     view_area_sqm = geo.area_of_latlngrect(LatLngRect(view_min, view_max))
 
-    result: List[observation_api.Cluster] = []
-    for cluster in clusters:
-        cluster = cluster.extend(rid_version, view_area_sqm)
-
-        # Offset cluster
-        cluster = (
-            cluster.randomize()
-        )  # TODO: Set random seed according to view extents so a static view will have static cluster subdivisions
+    # Subdivide the view into the finest grid allowed by the minimum cluster size, with one cluster per occupied cell
+    nx, ny = _grid_shape(x_max, y_max, rid_version, view_area_sqm)
+    clusters = _grid_clusters(xs, ys, x_max, y_max, nx, ny)
+    clusters.extend(rid_version, view_area_sqm)
+    clusters.randomize(np.random.default_rng(_view_seed(view_min, view_max)))
 
+    result: List[observation_api.Cluster] = []
+    for i in range(len(clusters)):
         corners = LatLngRect(
-            geo.unflatten(view_min, (cluster.x_min, cluster.y_min)),
-            geo.unflatten(view_min, (cluster.x_max, cluster.y_max)),
+            geo.unflatten(view_min, (clusters.x_min[i], clusters.y_min[i])),
+            geo.unflatten(view_min, (clusters.x_max[i], clusters.y_max[i])),
         )
         result.append(
             observation_api.Cluster(
@@ -153,7 +208,7 @@ def make_clusters(
                     ),
                 ],
                 area_sqm=geo.area_of_latlngrect(corners),
-                number_of_flights=len(cluster.points),
+                number_of_flights=int(clusters.counts[i]),
             )
         )
 
@@ -0,0 +1,66 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+import s2sphere
+
+from monitoring.mock_uss.riddp.clustering import make_clusters
+from monitoring.monitorlib import geo
+from monitoring.monitorlib.rid import RIDVersion
+
+VIEW_MIN = s2sphere.LatLng.from_degrees(46.97, 7.47)
+VIEW_MAX = s2sphere.LatLng.from_degrees(46.99, 7.50)
+
+
+def _flights(n: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            most_recent_position=SimpleNamespace(
+                lat=rng.uniform(VIEW_MIN.lat().degrees, VIEW_MAX.lat().degrees),
+                lng=rng.uniform(VIEW_MIN.lng().degrees, VIEW_MAX.lng().degrees),
+            )
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("rid_version", [RIDVersion.f3411_19, RIDVersion.f3411_22a])
+@pytest.mark.parametrize("n_flights", [1, 2, 30, 300])
+def test_make_clusters(rid_version: RIDVersion, n_flights: int):
+    flights = _flights(n_flights, seed=n_flights)
+    clusters = make_clusters(flights, VIEW_MIN, VIEW_MAX, rid_version)
+
+    view_area = geo.area_of_latlngrect(s2sphere.LatLngRect(VIEW_MIN, VIEW_MAX))
+    min_area = view_area * rid_version.min_cluster_size_percent / 100
+    min_dim = 2 * rid_version.min_obfuscation_distance_m
+    tolerance = 1e-6
+
+    assert sum(c.number_of_flights for c in clusters) == n_flights
+    rects = []
+    for cluster in clusters:
+        lo, hi = cluster.corners
+        rect = s2sphere.LatLngRect(
+            s2sphere.LatLng.from_degrees(lo.lat, lo.lng),
+            s2sphere.LatLng.from_degrees(hi.lat, hi.lng),
+        )
+        rects.append(rect)
+        width, height = geo.flatten(rect.lo(), rect.hi())
+        assert cluster.number_of_flights > 0
+        assert cluster.area_sqm >= min_area * (1 - tolerance)
+        assert width >= min_dim * (1 - tolerance)
+        assert height >= min_dim * (1 - tolerance)
+
+    # Every flight lies within at least one cluster
+    for flight in flights:
+        p = s2sphere.LatLng.from_degrees(
+            flight.most_recent_position.lat, flight.most_recent_position.lng
+        )
+        assert any(rect.contains(p) for rect in rects)
+
+    # The same view produces the same clusters
+    assert make_clusters(flights, VIEW_MIN, VIEW_MAX, rid_version) == clusters
+
+
+def test_make_clusters_without_flights():
+    assert make_clusters([], VIEW_MIN, VIEW_MAX, RIDVersion.f3411_22a) == []
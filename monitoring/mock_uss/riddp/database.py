@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+import bisect
+import datetime
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+import arrow
+import s2sphere
 from implicitdict import ImplicitDict
 
 from monitoring.monitorlib.fetch.rid import ISA
@@ -10,6 +16,9 @@ from monitoring.monitorlib.mutate.rid import ChangedSubscription, UpdatedISA
 
 from .behavior import DisplayProviderBehavior
 
+PENDING_UPDATE_RETENTION = datetime.timedelta(minutes=1)
+"""How long to retain notifications for subscriptions not known to this mock USS."""
+
 
 class FlightInfo(ImplicitDict):
     flights_url: str
@@ -20,32 +29,39 @@ class ObservationSubscription(ImplicitDict):
 
     upsert_result: ChangedSubscription
 
-    updates: List[UpdatedISA]
+    isas: Dict[str, ISA]
+    """Current ISAs relevant to this subscription, by ISA ID, as of the latest notification for each ISA."""
+
+    @staticmethod
+    def from_upsert(
+        bounds: LatLngBoundingBox, upsert_result: ChangedSubscription
+    ) -> ObservationSubscription:
+        return ObservationSubscription(
+            bounds=bounds,
+            upsert_result=upsert_result,
+            isas={isa.id: isa for isa in upsert_result.isas},
+        )
+
+    @property
+    def id(self) -> str:
+        return self.upsert_result.subscription.id
+
+    def apply_update(self, update: UpdatedISA) -> None:
+        """Update the ISAs of this subscription according to a notification."""
+        isa = update.isa
+        if isa.v19_value is None and isa.v22a_value is None:
+            # The notification indicates the ISA was removed
+            self.isas.pop(update.isa_id, None)
+        else:
+            self.isas[update.isa_id] = isa
 
     def get_isas(self) -> List[ISA]:
-        isas = [isa for isa in self.upsert_result.isas]
-        # TODO: consider sorting updates by notification index
-        for update in self.updates:
-            current_isas = []
-            isa_already_exists = False
-            for isa in isas:
-                if update.isa_id == isa.id:
-                    isa_already_exists = True
-                    if update.isa is not None:
-                        current_isas.append(update.isa)
-                    else:
-                        pass  # Exclude this ISA since the update removed it
-                else:
-                    current_isas.append(isa)
-            if not isa_already_exists:
-                current_isas.append(update.isa)
-            isas = current_isas
-        return isas
+        return list(self.isas.values())
 
     @property
     def flights_urls(self) -> Dict[str, str]:
         """Returns map of flights URL to owning USS"""
-        return {isa.flights_url: isa.owner for isa in self.get_isas()}
+        return {isa.flights_url: isa.owner for isa in self.isas.values()}
 
 
 class Database(ImplicitDict):
@@ -55,8 +71,115 @@ class Database(ImplicitDict):
     behavior: DisplayProviderBehavior = DisplayProviderBehavior()
     subscriptions: List[ObservationSubscription]
 
+    pending_updates: Dict[str, List[UpdatedISA]]
+    """Notifications received for subscriptions not (yet) in `subscriptions`, by subscription ID.
+
+    A notification may arrive between the creation of a subscription in the DSS and its addition to this database."""
+
+    def add_subscription(self, subscription: ObservationSubscription) -> None:
+        """Add a newly-created subscription, applying any notifications already received for it."""
+        for update in self.pending_updates.pop(subscription.id, []):
+            subscription.apply_update(update)
+        self.subscriptions.append(subscription)
+
+        # Discard notifications which do not appear to be for any of our subscriptions
+        t_min = arrow.utcnow().datetime - PENDING_UPDATE_RETENTION
+        for subscription_id in list(self.pending_updates):
+            updates = [
+                u
+                for u in self.pending_updates[subscription_id]
+                if u.query.request.timestamp > t_min
+            ]
+            if updates:
+                self.pending_updates[subscription_id] = updates
+            else:
+                del self.pending_updates[subscription_id]
+
+    def apply_update(self, subscription_ids: List[str], update: UpdatedISA) -> bool:
+        """Apply a notification to each of the specified subscriptions.
+
+        Returns:
+            True if any of the subscriptions were found, False if the update was retained as pending.
+        """
+        updated = False
+        for subscription in self.subscriptions:
+            if subscription.id in subscription_ids:
+                subscription.apply_update(update)
+                updated = True
+        if not updated:
+            for subscription_id in subscription_ids:
+                self.pending_updates.setdefault(subscription_id, []).append(update)
+        return updated
+
+
+class SubscriptionIndex(object):
+    """Process-local index of observation subscriptions by the southern extent of their bounds.
+
+    The index is rebuilt only when the set of subscriptions changes.
+    """
+
+    _key: Tuple[str, ...]
+    """IDs of the indexed subscriptions, in database order."""
+
+    _lat_mins: List[float]
+    """Southern bound of each indexed subscription, in ascending order."""
+
+    _entries: List[Tuple[float, float, float, int]]
+    """(lat_max, lng_min, lng_max, position in database) of each indexed subscription, in _lat_mins order."""
+
+    def __init__(self):
+        self._key = ()
+        self._lat_mins = []
+        self._entries = []
+
+    def _refresh(self, subscriptions: List[ObservationSubscription]) -> None:
+        key = tuple(s.id for s in subscriptions)
+        if key == self._key:
+            return
+        order = sorted(
+            range(len(subscriptions)), key=lambda i: subscriptions[i].bounds.lat_min
+        )
+        self._lat_mins = [subscriptions[i].bounds.lat_min for i in order]
+        self._entries = [
+            (
+                subscriptions[i].bounds.lat_max,
+                subscriptions[i].bounds.lng_min,
+                subscriptions[i].bounds.lng_max,
+                i,
+            )
+            for i in order
+        ]
+        self._key = key
+
+    def find_containing(
+        self,
+        subscriptions: List[ObservationSubscription],
+        view: s2sphere.LatLngRect,
+        t_min_end: datetime.datetime,
+    ) -> Optional[ObservationSubscription]:
+        """Find the first of the subscriptions whose bounds contain the view and which lasts beyond t_min_end."""
+        self._refresh(subscriptions)
+        lat_lo = view.lat_lo().degrees
+        lat_hi = view.lat_hi().degrees
+        lng_lo = view.lng_lo().degrees
+        lng_hi = view.lng_hi().degrees
+        result = None
+        for lat_max, lng_min, lng_max, i in self._entries[
+            0 : bisect.bisect_right(self._lat_mins, lat_lo)
+        ]:
+            if lat_max < lat_hi or (result is not None and i > result):
+                continue
+            if not (lng_min <= lng_lo and lng_hi <= lng_max):
+                # Fall back to an exact check in case either rectangle crosses the antimeridian
+                if not subscriptions[i].bounds.to_latlngrect().contains(view):
+                    continue
+            if subscriptions[i].upsert_result.subscription.time_end <= t_min_end:
+                continue
+            result = i
+        return None if result is None else subscriptions[result]
+
 
 db = SynchronizedValue(
-    Database(flights={}, subscriptions=[]),
+    Database(flights={}, subscriptions=[], pending_updates={}),
     decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
 )
@@ -0,0 +1,169 @@
+import datetime
+import random
+from types import SimpleNamespace
+from typing import List, Optional
+
+import arrow
+import s2sphere
+
+from monitoring.mock_uss.riddp.database import (
+    PENDING_UPDATE_RETENTION,
+    Database,
+    ObservationSubscription,
+    SubscriptionIndex,
+)
+from monitoring.monitorlib.geo import LatLngBoundingBox
+
+T0 = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _rect(
+    lat_lo: float, lng_lo: float, lat_hi: float, lng_hi: float
+) -> s2sphere.LatLngRect:
+    return s2sphere.LatLngRect(
+        s2sphere.LatLng.from_degrees(lat_lo, lng_lo),
+        s2sphere.LatLng.from_degrees(lat_hi, lng_hi),
+    )
+
+
+def _isa(isa_id: str, flights_url: Optional[str]):
+    return SimpleNamespace(
+        id=isa_id,
+        v19_value={"id": isa_id} if flights_url else None,
+        v22a_value=None,
+        flights_url=flights_url,
+        owner=f"owner of {flights_url}",
+    )
+
+
+def _subscription(
+    sub_id: str,
+    lat_lo: float,
+    lng_lo: float,
+    lat_hi: float,
+    lng_hi: float,
+    time_end: datetime.datetime = T0 + datetime.timedelta(hours=1),
+    isas: Optional[list] = None,
+) -> ObservationSubscription:
+    return ObservationSubscription.from_upsert(
+        LatLngBoundingBox(
+            lat_min=lat_lo, lng_min=lng_lo, lat_max=lat_hi, lng_max=lng_hi
+        ),
+        SimpleNamespace(
+            subscription=SimpleNamespace(id=sub_id, time_end=time_end),
+            isas=isas or [],
+        ),
+    )
+
+
+def _update(isa_id: str, flights_url: Optional[str], t: datetime.datetime):
+    return SimpleNamespace(
+        isa_id=isa_id,
+        isa=_isa(isa_id, flights_url),
+        query=SimpleNamespace(request=SimpleNamespace(timestamp=t)),
+    )
+
+
+def _brute_force_containing(
+    subscriptions: List[ObservationSubscription],
+    view: s2sphere.LatLngRect,
+    t_min_end: datetime.datetime,
+) -> Optional[ObservationSubscription]:
+    for subscription in subscriptions:
+        if (
+            subscription.bounds.to_latlngrect().contains(view)
+            and subscription.upsert_result.subscription.time_end > t_min_end
+        ):
+            return subscription
+    return None
+
+
+def test_find_containing():
+    subscriptions = [
+        _subscription("small", 10, 10, 11, 11),
+        _subscription("expired", 0, 0, 20, 20, time_end=T0),
+        _subscription("large", 0, 0, 20, 20),
+        _subscription("larger", -10, -10, 30, 30),
+    ]
+    index = SubscriptionIndex()
+
+    assert (
+        index.find_containing(subscriptions, _rect(10.2, 10.2, 10.8, 10.8), T0).id
+        == "small"
+    )
+    assert index.find_containing(subscriptions, _rect(5, 5, 15, 15), T0).id == "large"
+    assert index.find_containing(subscriptions, _rect(-5, 5, 15, 15), T0).id == "larger"
+    assert index.find_containing(subscriptions, _rect(-5, 5, 35, 15), T0) is None
+
+    # The index must follow changes to the subscriptions
+    subscriptions = subscriptions[1:]
+    assert (
+        index.find_containing(subscriptions, _rect(10.2, 10.2, 10.8, 10.8), T0).id
+        == "large"
+    )
+
+    rng = random.Random(12345)
+    subscriptions = []
+    for i in range(50):
+        lat = rng.uniform(0, 20)
+        lng = rng.uniform(0, 20)
+        subscriptions.append(
+            _subscription(
+                str(i),
+                lat,
+                lng,
+                lat + rng.uniform(1, 15),
+                lng + rng.uniform(1, 15),
+                time_end=T0 + datetime.timedelta(minutes=rng.randint(-10, 10)),
+            )
+        )
+    found = 0
+    for _ in range(500):
+        lat = rng.uniform(0, 30)
+        lng = rng.uniform(0, 30)
+        view = _rect(lat, lng, lat + rng.uniform(0, 3), lng + rng.uniform(0, 3))
+        expected = _brute_force_containing(subscriptions, view, T0)
+        assert index.find_containing(subscriptions, view, T0) is expected
+        found += expected is not None
+    assert found > 100
+
+
+def test_subscription_apply_update():
+    subscription = _subscription(
+        "sub", 0, 0, 1, 1, isas=[_isa("a", "https://a"), _isa("b", "https://b")]
+    )
+    assert subscription.flights_urls == {
+        "https://a": "owner of https://a",
+        "https://b": "owner of https://b",
+    }
+
+    subscription.apply_update(_update("c", "https://c", T0))
+    subscription.apply_update(_update("a", "https://a2", T0))
+    subscription.apply_update(_update("b", None, T0))
+    subscription.apply_update(_update("unknown", None, T0))
+    assert sorted(subscription.isas) == ["a", "c"]
+    assert sorted(subscription.flights_urls) == ["https://a2", "https://c"]
+
+
+def test_pending_updates():
+    db = Database(flights={}, subscriptions=[], pending_updates={})
+    db.add_subscription(_subscription("known", 0, 0, 1, 1))
+
+    now = arrow.utcnow().datetime
+    assert db.apply_update(["known"], _update("a", "https://a", now))
+    assert not db.pending_updates
+
+    # Notifications for a subscription not yet added are retained until it is added
+    assert not db.apply_update(["new"], _update("b", "https://b", now))
+    assert not db.apply_update(["new"], _update("c", "https://c", now))
+    assert not db.apply_update(["new"], _update("b", None, now))
+    old = now - PENDING_UPDATE_RETENTION - datetime.timedelta(seconds=1)
+    assert not db.apply_update(["stale"], _update("d", "https://d", old))
+    assert sorted(db.pending_updates) == ["new", "stale"]
+
+    db.add_subscription(_subscription("new", 0, 0, 1, 1))
+    assert [s.id for s in db.subscriptions] == ["known", "new"]
+    assert sorted(db.subscriptions[1].isas) == ["c"]
+    assert sorted(db.subscriptions[0].isas) == ["a"]
+    # Applied notifications are drained and stale ones are discarded
+    assert not db.pending_updates
@@ -1,3 +1,4 @@
+import time
 import uuid
 from datetime import timedelta
 from typing import Dict, List, Optional, Tuple
@@ -5,6 +6,7 @@ from typing import Dict, List, Optional, Tuple
 import arrow
 import flask
 import s2sphere
+from implicitdict import ImplicitDict
 from loguru import logger
 from uas_standards.astm.f3411.v19.api import ErrorResponse
 from uas_standards.astm.f3411.v19.constants import Scope
@@ -37,7 +39,27 @@ from monitoring.monitorlib.rid import RIDVersion
 from . import clustering, database, utm_client
 from .behavior import DisplayProviderBehavior
 from .config import KEY_RID_VERSION
-from .database import db
+from .database import SubscriptionIndex, db
+
+_subscription_index = SubscriptionIndex()
+
+
+class USSFlightsQueryDiagnostics(ImplicitDict):
+    uss: str
+    flights_url: str
+    elapsed_s: float
+    timed_out: bool
+
+
+class DisplayDataDiagnostics(ImplicitDict):
+    """Information about how a display data response was produced, included in the response alongside the standard
+    content."""
+
+    timeout_s: float
+    """Seconds Service Providers were given to respond with their flights."""
+
+    uss_queries: List[USSFlightsQueryDiagnostics]
+    """Timing of the flights query to each Service Provider."""
 
 
 def _make_flight_observation(
@@ -112,6 +134,7 @@ def _make_flight_observation(
 @requires_scope(Scope.Read)
 def riddp_display_data() -> Tuple[flask.Response, int]:
     """Implements retrieval of current display data per automated testing API."""
+    t_request = time.monotonic()
 
     if "view" not in flask.request.args:
         return (
@@ -136,69 +159,97 @@ def riddp_display_data() -> Tuple[flask.Response, int]:
             413,
         )
 
-    with db as tx:
-        # Find an existing subscription to serve this request
-        subscription: Optional[ObservationSubscription] = None
-        t_max = (
-            arrow.utcnow() + timedelta(seconds=1)
-        ).datetime  # Don't rely on subscriptions very near their expiration
-        tx.subscriptions = [
-            s for s in tx.subscriptions if s.upsert_result.subscription.time_end > t_max
-        ]
-        for existing_subscription in tx.subscriptions:
-            assert isinstance(existing_subscription, ObservationSubscription)
-            sub_rect = existing_subscription.bounds.to_latlngrect()
-            if sub_rect.contains(view):
-                subscription = existing_subscription
-                logger.debug(
-                    f"Existing subscription {subscription.upsert_result.subscription.id} indicates ISAs: {','.join(isa.id for isa in subscription.get_isas())}"
-                )
-                break
-
-        # No existing subscription suffices; create a new one
-        if subscription is None:
-            buffer_m = 1000  # meters beyond the view box triggering creation of this subscription
-            dt = timedelta(seconds=30)  # duration of new subscription
-            sub_bounds = geo.LatLngBoundingBox.from_latlng_rect(view).expand(
-                buffer_m, buffer_m, buffer_m, buffer_m
-            )
-            upsert_result = mutate.upsert_subscription(
-                area_vertices=sub_bounds.to_vertices(),
-                alt_lo=0,
-                alt_hi=100000,
-                start_time=None,
-                end_time=(arrow.utcnow() + dt).datetime,
-                uss_base_url=webapp.config[KEY_BASE_URL] + "/mock/riddp",
-                subscription_id=str(uuid.uuid4()),
-                rid_version=rid_version,
-                utm_client=utm_client,
-            )
-            if not upsert_result.success:
-                msg = f"Error establishing ISA subscription in DSS: {upsert_result.errors}"
-                logger.error(msg)
-                response = ErrorResponse(message=msg)
-                response["upsert_subscription"] = upsert_result
-                return flask.jsonify(response), 412
-            logger.debug(
-                f"New subscription indicated ISAs: {','.join(isa.id for isa in upsert_result.isas)}"
-            )
-            subscription = ObservationSubscription(
-                bounds=sub_bounds, upsert_result=upsert_result, updates=[]
-            )
-            tx.subscriptions.append(subscription)
+    # Find an existing subscription to serve this request
+    t_max = (
+        arrow.utcnow() + timedelta(seconds=1)
+    ).datetime  # Don't rely on subscriptions very near their expiration
+    subscription: Optional[ObservationSubscription] = (
+        _subscription_index.find_containing(db.value.subscriptions, view, t_max)
+    )
+    if subscription is not None:
+        logger.debug(
+            f"Existing subscription {subscription.id} indicates ISAs: {','.join(subscription.isas)}"
+        )
+    else:
+        # No existing subscription suffices; create a new one (without holding the database lock while doing so)
+        buffer_m = (
+            1000  # meters beyond the view box triggering creation of this subscription
+        )
+        dt = timedelta(seconds=30)  # duration of new subscription
+        sub_bounds = geo.LatLngBoundingBox.from_latlng_rect(view).expand(
+            buffer_m, buffer_m, buffer_m, buffer_m
+        )
+        upsert_result = mutate.upsert_subscription(
+            area_vertices=sub_bounds.to_vertices(),
+            alt_lo=0,
+            alt_hi=100000,
+            start_time=None,
+            end_time=(arrow.utcnow() + dt).datetime,
+            uss_base_url=webapp.config[KEY_BASE_URL] + "/mock/riddp",
+            subscription_id=str(uuid.uuid4()),
+            rid_version=rid_version,
+            utm_client=utm_client,
+        )
+        if not upsert_result.success:
+            msg = f"Error establishing ISA subscription in DSS: {upsert_result.errors}"
+            logger.error(msg)
+            response = ErrorResponse(message=msg)
+            response["upsert_subscription"] = upsert_result
+            return flask.jsonify(response), 412
+        logger.debug(
+            f"New subscription indicated ISAs: {','.join(isa.id for isa in upsert_result.isas)}"
+        )
+        subscription = ObservationSubscription.from_upsert(sub_bounds, upsert_result)
+        with db as tx:
+            tx.subscriptions = [
+                s
+                for s in tx.subscriptions
+                if s.upsert_result.subscription.time_end > t_max
+            ]
+            tx.add_subscription(subscription)
 
-    # Fetch flights from each unique flights URL
+    # Fetch flights from each unique flights URL concurrently
     validated_flights: List[Flight] = []
     tx = db.value
     flight_info: Dict[str, database.FlightInfo] = {k: v for k, v in tx.flights.items()}
     behavior: DisplayProviderBehavior = tx.behavior
 
-    for flights_url, uss in subscription.flights_urls.items():
-        if uss in behavior.do_not_display_flights_from:
+    flights_urls = {
+        flights_url: uss
+        for flights_url, uss in subscription.flights_urls.items()
+        if uss not in behavior.do_not_display_flights_from
+    }
+    # Give Service Providers whatever remains of this request's time budget, but never less than the time within
+    # which they must usually respond themselves
+    timeout_s = max(
+        rid_version.dp_data_resp_percentile99_s - (time.monotonic() - t_request),
+        rid_version.sp_data_resp_percentile95_s,
+    )
+    uss_queries = fetch.uss_flights_concurrently(
+        list(flights_urls), view, True, rid_version, utm_client, timeout_s
+    )
+    diagnostics = DisplayDataDiagnostics(
+        timeout_s=timeout_s,
+        uss_queries=[
+            USSFlightsQueryDiagnostics(
+                uss=flights_urls[q.flights_url],
+                flights_url=q.flights_url,
+                elapsed_s=q.elapsed_s,
+                timed_out=q.timed_out,
+            )
+            for q in uss_queries
+        ],
+    )
+
+    for uss_query in uss_queries:
+        flights_url = uss_query.flights_url
+        uss = flights_urls[flights_url]
+        if uss_query.timed_out:
+            logger.warning(
+                f"Omitting flights from {flights_url} from {uss} because it did not respond within {timeout_s:.2f}s"
+            )
             continue
-        flights_response = fetch.uss_flights(
-            flights_url, view, True, rid_version, utm_client
-        )
+        flights_response = uss_query.fetched
         if not flights_response.success:
             msg = (
                 f"Error querying {flights_url} from {uss}: {flights_response.errors[0]}"
@@ -206,6 +257,7 @@ def riddp_display_data() -> Tuple[flask.Response, int]:
             logger.error(msg)
             response = ErrorResponse(message=msg)
             response["fetched_uss_flights"] = flights_response
+            response["diagnostics"] = diagnostics
             return flask.jsonify(response), 412
         for flight in flights_response.flights:
             flight_errors = flight.errors()
@@ -218,6 +270,7 @@ def riddp_display_data() -> Tuple[flask.Response, int]:
                 response = ErrorResponse(message=msg)
                 response["flight_validation_errors"] = flight_errors
                 response["fetched_uss_flights"] = flights_response
+                response["diagnostics"] = diagnostics
                 return flask.jsonify(response), 412
             validated_flights.append(flight)
             flight_info[flight.id] = database.FlightInfo(flights_url=flights_url)
@@ -239,6 +292,7 @@ def riddp_display_data() -> Tuple[flask.Response, int]:
         # Construct clusters response
         clusters = clustering.make_clusters(flights, view.lo(), view.hi(), rid_version)
         response = observation_api.GetDisplayDataResponse(clusters=clusters)
+    response["diagnostics"] = diagnostics
     return flask.jsonify(response), 200
 
 
@@ -39,21 +39,17 @@ def riddp_notify_isa_v19(id: str):
 
     subscription_ids = [s.subscription_id for s in put_params.subscriptions]
     if subscription_ids:
+        query = describe_flask_query(flask.request, flask.jsonify(None), 0)
         with db as tx:
-            updated = False
-
-            for subscription in tx.subscriptions:
-                if subscription.upsert_result.subscription.id in subscription_ids:
-                    query = describe_flask_query(flask.request, flask.jsonify(None), 0)
-                    subscription.updates.append(UpdatedISA(v19_query=query))
-                    logger.debug(
-                        f"Updated subscription {subscription.upsert_result.subscription.id} with ISA {id}"
-                    )
-                    updated = True
-            if not updated:
-                logger.warning(
-                    f"Update for ISA {id} specified non-existent subscriptions {','.join(subscription_ids)}"
-                )
+            updated = tx.apply_update(subscription_ids, UpdatedISA(v19_query=query))
+        if updated:
+            logger.debug(
+                f"Updated subscriptions {','.join(subscription_ids)} with ISA {id}"
+            )
+        else:
+            logger.warning(
+                f"Update for ISA {id} specified subscriptions {','.join(subscription_ids)} not (yet) known to this mock USS"
+            )
 
     return (
         flask.jsonify(None),
@@ -1,9 +1,12 @@
 import json
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 from implicitdict import ImplicitDict
 
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.multiprocessing import (
+    SynchronizedKeyedValues,
+    SynchronizedValue,
+)
 from monitoring.monitorlib.rid_automated_testing import injection_api
 
 from .behavior import ServiceProviderBehavior
@@ -30,7 +33,6 @@ class TestRecord(ImplicitDict):
 class Database(ImplicitDict):
     """Simple pseudo-database structure tracking the state of the mock system"""
 
-    tests: Dict[str, TestRecord] = {}
     behavior: ServiceProviderBehavior = ServiceProviderBehavior()
     notifications: ServiceProviderUserNotifications = ServiceProviderUserNotifications()
 
@@ -39,3 +41,15 @@ db = SynchronizedValue(
     Database(),
     decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
 )
+
+tests = SynchronizedKeyedValues(
+    capacity_bytes=160e6,
+    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), TestRecord),
+)
+"""Injected tests, by test ID"""
+
+tests_generation = SynchronizedValue(
+    {"generation": 0},
+    capacity_bytes=100,
+)
+"""Incremented whenever a test is created, changed, or deleted in `tests`"""
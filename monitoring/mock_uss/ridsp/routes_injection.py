@@ -25,8 +25,8 @@ from monitoring.monitorlib.mutate import rid as mutate
 from monitoring.monitorlib.rid import RIDVersion
 from monitoring.monitorlib.rid_automated_testing import injection_api
 
-from . import database
-from .database import db
+from . import database, telemetry
+from .database import db, tests, tests_generation
 
 require_config_value(KEY_BASE_URL)
 require_config_value(KEY_RID_VERSION)
@@ -111,8 +111,12 @@ def ridsp_create_test(test_id: str) -> Tuple[str, int]:
             response["query"] = notification.query
             return flask.jsonify(response), 412
 
+    with tests.transact(test_id) as tx:
+        tx.value = record
+    with tests_generation as tx:
+        tx["generation"] += 1
+    telemetry.refresh_index()
     with db as tx:
-        tx.tests[test_id] = record
         tx.notifications.create_notifications_if_needed(record)
 
     return flask.jsonify(
@@ -126,7 +130,7 @@ def ridsp_delete_test(test_id: str, version: str) -> Tuple[str, int]:
     """Implements test deletion in RID automated testing injection API."""
     logger.info(f"Delete test {test_id}")
     rid_version = webapp.config[KEY_RID_VERSION]
-    record = db.value.tests.get(test_id, None)
+    record = tests.get(test_id, None)
 
     if record is None:
         return 'Test "{}" not found'.format(test_id), 404
@@ -164,8 +168,10 @@ def ridsp_delete_test(test_id: str, version: str) -> Tuple[str, int]:
             )
             result["query"] = notification.query
 
-    with db as tx:
-        del tx.tests[test_id]
+    tests.pop(test_id)
+    with tests_generation as tx:
+        tx["generation"] += 1
+    telemetry.refresh_index()
     return flask.jsonify(result)
 
 
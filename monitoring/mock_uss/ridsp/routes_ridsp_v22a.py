@@ -32,10 +32,11 @@ from monitoring.mock_uss import webapp
 from monitoring.mock_uss.auth import requires_scope
 from monitoring.monitorlib import geo
 from monitoring.monitorlib.rid import RIDVersion
-from monitoring.monitorlib.rid_automated_testing.injection_api import TestFlight
 from monitoring.monitorlib.rid_v2 import make_time
 
+from . import telemetry
 from .database import db
+from .telemetry import IndexedFlight, indexed_flights
 
 
 def _make_position(p: injection.RIDAircraftPosition) -> RIDAircraftPosition:
@@ -104,16 +105,17 @@ def _make_details(p: injection.RIDFlightDetails) -> RIDFlightDetails:
 
 
 def _get_report(
-    flight: TestFlight,
+    indexed_flight: IndexedFlight,
     t_request: datetime.datetime,
     view: s2sphere.LatLngRect,
     recent_positions_duration: float,
 ) -> Optional[RIDFlight]:
-    details = flight.get_details(t_request)
+    flight = indexed_flight.flight
+    details = indexed_flight.get_details(t_request)
     if not details:
         return None
 
-    recent_states = flight.select_relevant_states(
+    recent_states = indexed_flight.select_relevant_states(
         view,
         t_request - timedelta(seconds=NetMaxNearRealTimeDataPeriodSeconds),
         t_request,
@@ -122,7 +124,6 @@ def _get_report(
         # No recent telemetry applicable to view
         return None
 
-    recent_states.sort(key=lambda p: p.timestamp)
     result = RIDFlight(
         id=details.id,
         aircraft_type=flight.get_aircraft_type(RIDVersion.f3411_22a),
@@ -211,16 +212,16 @@ def ridsp_flights_v22a():
 
     now = arrow.utcnow().datetime
     flights = []
-    tx = db.value
-    for test_id, record in tx.tests.items():
-        for flight in record.flights:
-            reported_flight = _get_report(flight, now, view, recent_positions_duration)
-            if reported_flight is not None:
-                # TODO: Implement Service Provider behaviors for F3411-22a
-                # reported_flight = behavior.adjust_reported_flight(
-                #     flight, reported_flight, tx.behavior
-                # )
-                flights.append(reported_flight)
+    for indexed_flight in indexed_flights():
+        reported_flight = _get_report(
+            indexed_flight, now, view, recent_positions_duration
+        )
+        if reported_flight is not None:
+            # TODO: Implement Service Provider behaviors for F3411-22a
+            # reported_flight = behavior.adjust_reported_flight(
+            #     flight, reported_flight, db.value.behavior
+            # )
+            flights.append(reported_flight)
     return (
         flask.jsonify(GetFlightsResponse(timestamp=make_time(now), flights=flights)),
         200,
@@ -230,18 +231,12 @@ def ridsp_flights_v22a():
 @rid_v22a_operation(OperationID.GetFlightDetails)
 @requires_scope(Scope.DisplayProvider)
 def ridsp_flight_details_v22a(id: str):
-    now = arrow.utcnow().datetime
-    tx = db.value
-    for test_id, record in tx.tests.items():
-        for flight in record.flights:
-            details = flight.get_details(now)
-            if details and details.id == id:
-                return (
-                    flask.jsonify(
-                        GetFlightDetailsResponse(details=_make_details(details))
-                    ),
-                    200,
-                )
+    details = telemetry.get_details(id, arrow.utcnow().datetime)
+    if details:
+        return (
+            flask.jsonify(GetFlightDetailsResponse(details=_make_details(details))),
+            200,
+        )
     return (
         flask.jsonify(ErrorResponse(message="Flight {} not found".format(id))),
         404,
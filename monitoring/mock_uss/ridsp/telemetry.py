@@ -0,0 +1,103 @@
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+from uas_standards.interuss.automated_testing.rid.v1.injection import (
+    RIDFlightDetails,
+)
+
+from monitoring.monitorlib.rid_automated_testing.injection_api import IndexedFlight
+
+from .database import tests, tests_generation
+
+
+class InjectedFlightIndex(object):
+    """Process-local index of all currently-injected flights.
+
+    Flights are only (re-)indexed when their test is created; indexes of deleted
+    tests are discarded.  Injected tests are only scanned for changes when the
+    shared tests generation has changed since the last refresh.
+    """
+
+    _generation: Optional[int]
+    """Tests generation (see database.tests_generation) as of the last refresh."""
+
+    _tests: Dict[str, Tuple[str, List[IndexedFlight]]]
+    """Indexed flights for each test ID, along with the test version they were indexed from."""
+
+    flights: List[IndexedFlight]
+    """All indexed flights, in test order."""
+
+    _flights_by_id: Dict[str, List[IndexedFlight]]
+    """Indexed flights which may be reported with each flight ID."""
+
+    def __init__(self):
+        self._generation = None
+        self._tests = {}
+        self.flights = []
+        self._flights_by_id = {}
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the currently-injected tests."""
+        generation = tests_generation.value["generation"]
+        if generation == self._generation:
+            return
+        # Read the generation before the tests so a concurrent change is picked up by the next refresh
+        self._generation = generation
+
+        changed = False
+        test_ids = set()
+        for test_id, record in tests.items():
+            test_ids.add(test_id)
+            indexed = self._tests.get(test_id, None)
+            if indexed is None or indexed[0] != record.version:
+                self._tests[test_id] = (
+                    record.version,
+                    [IndexedFlight(f) for f in record.flights],
+                )
+                changed = True
+        for test_id in list(self._tests):
+            if test_id not in test_ids:
+                self._tests.pop(test_id, None)
+                changed = True
+        if not changed:
+            return
+
+        flights = []
+        flights_by_id = {}
+        for _, test_flights in self._tests.values():
+            for flight in test_flights:
+                flights.append(flight)
+                for flight_id in flight.details_ids:
+                    flights_by_id.setdefault(flight_id, []).append(flight)
+        self.flights = flights
+        self._flights_by_id = flights_by_id
+
+    def get_details(
+        self, flight_id: str, t_now: datetime.datetime
+    ) -> Optional[RIDFlightDetails]:
+        """Retrieve the details of the flight currently reported with the specified ID, if any."""
+        for flight in self._flights_by_id.get(flight_id, []):
+            details = flight.get_details(t_now)
+            if details and details.id == flight_id:
+                return details
+        return None
+
+
+_index = InjectedFlightIndex()
+
+
+def refresh_index() -> None:
+    """Index changes to injected tests now rather than upon the next search."""
+    _index.refresh()
+
+
+def indexed_flights() -> List[IndexedFlight]:
+    """Retrieve all currently-injected flights, indexed for telemetry searches."""
+    _index.refresh()
+    return _index.flights
+
+
+def get_details(flight_id: str, t_now: datetime.datetime) -> Optional[RIDFlightDetails]:
+    """Retrieve the details of the injected flight currently reported with the specified ID, if any."""
+    _index.refresh()
+    return _index.get_details(flight_id, t_now)
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from monitoring.mock_uss.ridsp import telemetry
+
+
+class _Tests(object):
+    def __init__(self):
+        self.records = {}
+        self.scans = 0
+
+    def items(self):
+        self.scans += 1
+        return list(self.records.items())
+
+
+def test_index_only_rescans_tests_when_generation_changes(monkeypatch):
+    tests = _Tests()
+    generation = SimpleNamespace(value={"generation": 0})
+    monkeypatch.setattr(telemetry, "tests", tests)
+    monkeypatch.setattr(telemetry, "tests_generation", generation)
+    monkeypatch.setattr(
+        telemetry, "IndexedFlight", lambda f: SimpleNamespace(details_ids={f})
+    )
+    index = telemetry.InjectedFlightIndex()
+
+    index.refresh()
+    assert tests.scans == 1 and index.flights == []
+
+    tests.records["t1"] = SimpleNamespace(version="v1", flights=["f1", "f2"])
+    index.refresh()
+    assert tests.scans == 1 and index.flights == []
+
+    generation.value["generation"] += 1
+    for _ in range(3):
+        index.refresh()
+    assert tests.scans == 2
+    assert [f.details_ids for f in index.flights] == [{"f1"}, {"f2"}]
+
+    del tests.records["t1"]
+    generation.value["generation"] += 1
+    index.refresh()
+    assert tests.scans == 3 and index.flights == []
@@ -31,7 +31,11 @@ from monitoring.mock_uss.f3548v21.flight_planning import (
     share_op_intent,
     validate_request,
 )
-from monitoring.mock_uss.flights.database import FlightRecord, db
+from monitoring.mock_uss.flights.database import (
+    FlightRecord,
+    cached_operations,
+    flights,
+)
 from monitoring.mock_uss.flights.planning import (
     delete_flight_record,
     lock_flight,
@@ -193,8 +197,8 @@ def inject_flight(
         # Store flight in database
         step_name = "storing flight in database"
         log("Storing flight in database")
-        with db as tx:
-            tx.flights[flight_id] = record
+        with flights.transact(flight_id) as tx:
+            tx.value = record
 
         step_name = "returning final successful result"
         log("Complete.")
@@ -387,7 +391,7 @@ def clear_area(extent: Volume4D) -> ClearAreaResponse:
         op_intent_ids = {oi.id for oi in op_intent_refs}
 
         # Try to remove all relevant flights normally
-        for flight_id, flight in db.value.flights.items():
+        for flight_id, flight in flights.items():
             # TODO: Check for intersection with flight's area rather than just relying on DSS query
             if flight.op_intent.reference.id not in op_intent_ids:
                 continue
@@ -430,10 +434,8 @@ def clear_area(extent: Volume4D) -> ClearAreaResponse:
                 }
 
         # Clear the op intent cache for every op intent removed
-        with db as tx:
-            for op_intent_id in op_intents_removed:
-                if op_intent_id in tx.cached_operations:
-                    del tx.cached_operations[op_intent_id]
+        for op_intent_id in op_intents_removed:
+            cached_operations.pop(op_intent_id)
 
     except (ValueError, ConnectionError) as e:
         msg = f"{e.__class__.__name__} while {step_name}: {str(e)}"
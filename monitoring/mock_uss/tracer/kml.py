@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-import glob
-import os
-import re
+import json
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Protocol, Type
 
-import yaml
 from implicitdict import ImplicitDict, StringBasedDateTime
 from loguru import logger
 from lxml import etree
@@ -25,6 +22,8 @@ from monitoring.mock_uss.tracer.log_types import (
     PollOperationalIntents,
     TracerLogEntry,
 )
+from monitoring.mock_uss.tracer.tracerlog import Logger, log_title
+from monitoring.monitorlib import indexed_log
 from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
 from monitoring.monitorlib.infrastructure import get_token_claims
 from monitoring.monitorlib.kml.f3548v21 import f3548v21_styles
@@ -309,7 +308,12 @@ def _get_style(type: VolumeType, state: str, future: bool) -> str:
         raise NotImplementedError()
 
 
-def render_historical_kml(log_folder: str) -> str:
+def render_historical_kml(
+    tracer_logger: Logger,
+    from_time: Optional[datetime] = None,
+    to_time: Optional[datetime] = None,
+) -> str:
+    """Render the volumes described in tracer log entries recorded within the specified time range."""
     logger.debug("Rendering historical KML...")
 
     # Performance metrics
@@ -319,49 +323,32 @@ def render_historical_kml(log_folder: str) -> str:
     generation_time = Stopwatch()
     rendering_time = Stopwatch()
 
-    historical_volume_collections: List[HistoricalVolumesCollection] = []
-    log_files = glob.glob(os.path.join(log_folder, "*.yaml"))
-    log_files.sort()
-    for log_file in log_files:
-        if "nochange_queries" in log_file:
-            continue  # This is a known case where we don't want to print a warning
-
-        # See if this is actually a log entry
-        filename = os.path.split(log_file)[-1]
-        m = re.match(r"^(\d{6})_(\d\d)(\d\d)(\d\d)_(\d{6})_([^.]+)\.yaml$", filename)
-        if not m:
-            # File name does not match log entry format
-            logger.warning(f"File name {filename} does not match log entry format")
-            continue
+    # Only load log entries we can render
+    kinds = {
+        log_entry_type.__name__ for log_entry_type in _historical_volumes_renderers
+    }
+    with loading_time:
+        entries = tracer_logger.list_logs(from_time, to_time, kinds)
+        records = indexed_log.iter_records(entries)
 
-        # Determine type of log entry
-        prefix_code = m.group(6)
-        log_entry_type = TracerLogEntry.entry_type_from_prefix(prefix_code)
-        if not log_entry_type:
-            # Can't determine a log entry type from the prefix
-            logger.warning(
-                f"Cannot determine log entry type from prefix_code `{prefix_code}`"
-            )
-            continue
+    historical_volume_collections: List[HistoricalVolumesCollection] = []
+    while True:
+        with loading_time:
+            record = next(records, None)
+            if record is None:
+                break
+            entry, raw = record
+        log_entry_type = TracerLogEntry.entry_type(entry.kind)
 
-        # See if we can render volumes of log entry
-        if log_entry_type not in _historical_volumes_renderers:
-            # We don't have an historical volume renderer for this log entry type
+        # Render log entry into historical volume collections
+        try:
+            with parsing_time:
+                log_entry = ImplicitDict.parse(json.loads(raw), log_entry_type)
+        except ValueError as e:
             logger.warning(
-                f"No historical volume renderer for {log_entry_type.__name__} in {log_file}"
+                f"Skipping {log_title(entry)} because of parse error: {str(e)}"
             )
             continue
-
-        # Render log entry into historical volume collections
-        with open(log_file, "r") as f:
-            try:
-                with loading_time:
-                    content = yaml.load(f, Loader=yaml.CLoader)
-                with parsing_time:
-                    log_entry = ImplicitDict.parse(content, log_entry_type)
-            except ValueError as e:
-                logger.warning(f"Skipping {filename} because of parse error: {str(e)}")
-                continue
         with processing_time:
             historical_volume_collections.extend(
                 _historical_volumes_renderers[log_entry_type].renderer(
@@ -1,6 +1,7 @@
 import datetime
 import glob
 import io
+import json
 import os
 import zipfile
 
@@ -18,6 +19,7 @@ from monitoring.mock_uss.tracer.database import db
 from monitoring.mock_uss.tracer.kml import render_historical_kml
 from monitoring.mock_uss.tracer.log_types import PollFlights, TracerLogEntry
 from monitoring.mock_uss.tracer.observation_areas import ObservationArea
+from monitoring.mock_uss.tracer.tracerlog import NOCHANGE_LOG_NAME, log_title
 from monitoring.mock_uss.ui import auth as ui_auth
 from monitoring.monitorlib import fetch, geo, infrastructure
 
@@ -26,20 +28,21 @@ from monitoring.monitorlib import fetch, geo, infrastructure
 @ui_auth.login_required
 def tracer_list_logs():
     logger.debug(f"Handling tracer_list_logs from {os.getpid()}")
-    logs = [
-        log
-        for log in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if log.endswith(".yaml")
-    ]
+    entries = list(reversed(context.tracer_logger.list_logs()))
+    logs = [NOCHANGE_LOG_NAME] + [e.key for e in entries]
+    titles = {NOCHANGE_LOG_NAME: NOCHANGE_LOG_NAME}
+    titles.update({e.key: log_title(e) for e in entries})
+    kml_path = os.path.join(context.tracer_logger.log_path, "kml")
+    existing_kmls = set(os.listdir(kml_path)) if os.path.exists(kml_path) else set()
     kmls = {}
     for log in logs:
-        kml = os.path.join("kml", log[0:-5] + ".kml")
-        if os.path.exists(os.path.join(context.tracer_logger.log_path, kml)):
-            kmls[log] = kml
+        if log + ".kml" in existing_kmls:
+            kmls[log] = os.path.join("kml", log + ".kml")
     response = flask.make_response(
         flask.render_template(
             "tracer/logs.html",
             logs=logs,
+            titles=titles,
             kmls=kmls,
             current_user=flask_login.current_user,
         )
@@ -52,16 +55,17 @@ def tracer_list_logs():
 @webapp.route("/tracer/logs.zip")
 @ui_auth.login_required(role="admin")
 def tracer_download_logs():
-    logs = [
-        log
-        for log in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if log.endswith(".yaml")
-    ]
+    entries = list(reversed(context.tracer_logger.list_logs()))
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-        for log in logs:
-            with open(os.path.join(context.tracer_logger.log_path, log), "r") as f:
-                zip_file.writestr(log, f.read())
+        nochange = list(context.tracer_logger.nochange_logs())
+        if nochange:
+            zip_file.writestr(
+                f"{NOCHANGE_LOG_NAME}.yaml",
+                yaml.dump_all(nochange, explicit_start=True),
+            )
+        for entry, content in context.tracer_logger.iter_logs(entries):
+            zip_file.writestr(f"{log_title(entry)}.yaml", yaml.dump(content, indent=2))
     zip_name = (
         f"logs_{datetime.datetime.now(datetime.UTC).isoformat().split('.')[0]}.zip"
     )
@@ -78,14 +82,8 @@ def tracer_clear_logs():
     if db.value.observation_areas:
         return "Logs cannot be cleared while any observation areas exist", 400
 
-    files = [
-        f
-        for f in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if f.endswith(".yaml") or f.endswith(".kml")
-    ]
-    for f in files:
-        os.remove(os.path.join(context.tracer_logger.log_path, f))
-    return f"{len(files)} log files cleared successfully", 200
+    n = context.tracer_logger.clear()
+    return f"{n} log files cleared successfully", 200
 
 
 def _redact_and_augment_log(obj):
@@ -112,15 +110,18 @@ def _redact_and_augment_log(obj):
 @ui_auth.login_required
 def tracer_logs(log):
     logger.debug(f"Handling tracer_logs from {os.getpid()}")
-    logfile = os.path.join(context.tracer_logger.log_path, log)
-    if not os.path.exists(logfile):
-        flask.abort(404)
-    with open(logfile, "r") as f:
-        objs = [obj for obj in yaml.full_load_all(f)]
-    if len(objs) == 1:
-        obj = objs[0]
+    if log == NOCHANGE_LOG_NAME:
+        title = NOCHANGE_LOG_NAME
+        obj = {"entries": list(context.tracer_logger.nochange_logs())}
     else:
-        obj = {"entries": objs}
+        entry = context.tracer_logger.get_log(log)
+        if entry is None:
+            flask.abort(404)
+        title = log_title(entry)
+        try:
+            obj = json.loads(entry.read())
+        except FileNotFoundError:
+            flask.abort(404)
 
     object_type_name = obj.get("object_type", None)
     object_type = TracerLogEntry.entry_type(object_type_name)
@@ -131,7 +132,7 @@ def tracer_logs(log):
     return flask.render_template(
         "tracer/log.html",
         log=_redact_and_augment_log(obj),
-        title=logfile,
+        title=title,
         username=flask_login.current_user.username,
     )
 
@@ -170,9 +171,17 @@ def tracer_kmls(kml):
 @webapp.route("/tracer/kml/historical.kml")
 @ui_auth.login_required
 def tracer_kml_historical():
+    """Render volumes from the tracer logs, optionally limited to logs recorded between from_time and to_time."""
+    try:
+        from_time = flask.request.args.get("from_time", None)
+        from_time = StringBasedDateTime(from_time).datetime if from_time else None
+        to_time = flask.request.args.get("to_time", None)
+        to_time = StringBasedDateTime(to_time).datetime if to_time else None
+    except ValueError as e:
+        flask.abort(400, f"Invalid time range: {str(e)}")
     kml_name = f"historical_{datetime.datetime.now(datetime.UTC).isoformat().split('.')[0]}.kml"
     return flask.Response(
-        render_historical_kml(context.tracer_logger.log_path),
+        render_historical_kml(context.tracer_logger, from_time, to_time),
         mimetype="application/vnd.google-earth.kml+xml",
         headers={"Content-Disposition": f"attachment;filename={kml_name}"},
     )
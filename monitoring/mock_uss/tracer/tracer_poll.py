@@ -1,10 +1,13 @@
 import datetime
 import json
 import sys
-from typing import Dict, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
 
 import arrow
 from implicitdict import ImplicitDict, StringBasedDateTime
+from loguru import logger as console_logger
 
 from monitoring.mock_uss import webapp
 from monitoring.mock_uss.tracer import context, diff, tracerlog
@@ -25,14 +28,21 @@ from monitoring.mock_uss.tracer.observation_areas import (
     ObservationAreaID,
 )
 from monitoring.monitorlib import fetch, versioning
+from monitoring.monitorlib.errors import stacktrace_string
 from monitoring.monitorlib.fetch.rid import FetchedISAs
 from monitoring.monitorlib.fetch.scd import FetchedEntities
 from monitoring.monitorlib.geo import get_latlngrect_vertices, make_latlng_rect
 from monitoring.monitorlib.infrastructure import UTMClientSession
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.multiprocessing import (
+    SynchronizedKeyedValues,
+    SynchronizedValue,
+)
 
 TASK_POLL_OBSERVATION_AREAS = "tracer poll observation areas"
 
+MAX_CONCURRENT_POLLS = 16
+"""Maximum number of polls (of one kind of information in one observation area) to perform at the same time."""
+
 
 class PollingStatus(ImplicitDict):
     started: bool = False
@@ -45,22 +55,66 @@ polling_status = SynchronizedValue(
 )
 
 
-class PollingValues(ImplicitDict):
-    need_line_break: bool = False
-    last_isa_result: Optional[FetchedISAs] = None
-    last_ops_result: Optional[FetchedEntities] = None
-    last_constraints_result: Optional[FetchedEntities] = None
-
+last_isa_results = SynchronizedKeyedValues(
+    capacity_bytes=160e6,
+    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), FetchedISAs),
+)
+"""Most recent distinct result of polling ISAs, keyed by poller (see _poller_key)."""
 
-polling_values = SynchronizedValue(
-    PollingValues(),
-    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), PollingValues),
+last_entity_results = SynchronizedKeyedValues(
+    capacity_bytes=160e6,
+    decoder=lambda b: ImplicitDict.parse(
+        json.loads(b.decode("utf-8")), FetchedEntities
+    ),
 )
+"""Most recent distinct result of polling operational intents or constraints, keyed by poller (see _poller_key)."""
+
+_console_lock = threading.Lock()
+_need_line_break = False
+
+_poll_executor: Optional[ThreadPoolExecutor] = None
+_polls_in_progress: Dict[str, Future] = {}
+
+
+def _poller_key(area: ObservationArea, kind: str) -> str:
+    return f"{area.id}/{kind}"
 
 
 def print_no_newline(s):
-    sys.stdout.write(s)
-    sys.stdout.flush()
+    global _need_line_break
+    with _console_lock:
+        sys.stdout.write(s)
+        sys.stdout.flush()
+        _need_line_break = True
+
+
+def _print_change(s):
+    global _need_line_break
+    with _console_lock:
+        if _need_line_break:
+            print()
+        print(s)
+        _need_line_break = False
+
+
+def _update_last_result(
+    results: SynchronizedKeyedValues, key: str, result
+) -> Tuple[bool, Optional[ImplicitDict]]:
+    """Record result as the most recent result of the specified poller if its content changed.
+
+    Only one poll per poller is in progress at a time, so the previous result can be read without a transaction; it is
+    only re-encoded when it changes.
+
+    Returns:
+        * Whether result was different from the previous result
+        * Previous result, if any
+    """
+    last_result = results.get(key)
+    if last_result is None or result.has_different_content_than(last_result):
+        with results.transact(key) as tx:
+            tx.value = result
+        return True, last_result
+    return False, last_result
 
 
 def _log_poll_start(logger):
@@ -81,25 +135,72 @@ def _log_poll_start(logger):
         )
 
 
+def _run_poller(key: str, poll: Callable[[], None]) -> None:
+    try:
+        poll()
+    except Exception as e:
+        console_logger.error(f"Error polling {key}: {str(e)}\n{stacktrace_string(e)}")
+
+
 @webapp.periodic_task(TASK_POLL_OBSERVATION_AREAS)
 def poll_observation_areas() -> None:
+    """Start polling each kind of information in each observation area, without waiting for polls to complete.
+
+    Each poller runs independently, so a slow DSS or USS only delays polling of the information that depends on it.  A
+    poller which has not yet completed its previous poll is not started again.
+    """
+    global _poll_executor
     logger = context.tracer_logger
     _log_poll_start(logger)
     observation_areas: Dict[ObservationAreaID, ObservationArea] = (
         db.value.observation_areas
     )
+
+    pollers: Dict[str, Callable[[], None]] = {}
     for observation_area in observation_areas.values():
         if observation_area.f3411 is not None and observation_area.f3411.poll:
-            poll_isas(observation_area, logger)
+            pollers[_poller_key(observation_area, "isas")] = (
+                lambda area=observation_area: poll_isas(area, logger)
+            )
         if observation_area.f3548 is not None and observation_area.f3548.poll:
             scd_client = context.get_client(
                 observation_area.f3548.auth_spec,
                 observation_area.f3548.dss_base_url,
             )
             if observation_area.f3548.monitor_op_intents:
-                poll_ops(observation_area, scd_client, logger)
+                pollers[_poller_key(observation_area, "ops")] = (
+                    lambda area=observation_area, client=scd_client: poll_ops(
+                        area, client, logger
+                    )
+                )
             if observation_area.f3548.monitor_constraints:
-                poll_constraints(observation_area, scd_client, logger)
+                pollers[_poller_key(observation_area, "constraints")] = (
+                    lambda area=observation_area, client=scd_client: poll_constraints(
+                        area, client, logger
+                    )
+                )
+
+    # Forget the state of pollers for observation areas that no longer exist
+    for results in (last_isa_results, last_entity_results):
+        for key in results.keys():
+            if key not in pollers:
+                results.pop(key)
+    for key in list(_polls_in_progress):
+        if key not in pollers and _polls_in_progress[key].done():
+            del _polls_in_progress[key]
+
+    if _poll_executor is None:
+        _poll_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_POLLS, thread_name_prefix="tracer_poll"
+        )
+    for key, poll in pollers.items():
+        in_progress = _polls_in_progress.get(key, None)
+        if in_progress is not None and not in_progress.done():
+            console_logger.debug(
+                f"Not starting new poll of {key} because the previous poll has not completed"
+            )
+            continue
+        _polls_in_progress[key] = _poll_executor.submit(_run_poller, key, poll)
 
 
 def poll_isas(area: ObservationArea, logger: tracerlog.Logger) -> None:
@@ -116,27 +217,14 @@ def poll_isas(area: ObservationArea, logger: tracerlog.Logger) -> None:
     )
     t1 = datetime.datetime.now(datetime.UTC)
 
-    log_new = False
-    last_result = None
-    with polling_values as tx:
-        assert isinstance(tx, PollingValues)
-        if tx.last_isa_result is None or result.has_different_content_than(
-            tx.last_isa_result
-        ):
-            last_result = tx.last_isa_result
-            log_new = True
-            tx.need_line_break = False
-            tx.last_isa_result = result
-        else:
-            tx.need_line_break = True
-        need_line_break = tx.need_line_break
+    log_new, last_result = _update_last_result(
+        last_isa_results, _poller_key(area, "isas"), result
+    )
 
     log_entry = PollISAs(poll=result, recorded_at=StringBasedDateTime(arrow.utcnow()))
     if log_new:
         logger.log_new(log_entry)
-        if need_line_break:
-            print()
-        print(diff.isa_diff_text(last_result, result))
+        _print_change(diff.isa_diff_text(last_result, result))
     else:
         logger.log_same(t0, t1, log_entry.prefix_code())
         print_no_newline(".")
@@ -147,41 +235,28 @@ def poll_ops(
 ) -> None:
     box = make_latlng_rect(area.area.volume)
     t0 = datetime.datetime.now(datetime.UTC)
-    if "operational_intents" not in context.scd_cache:
-        context.scd_cache["operational_intents"]: Dict[
-            str, fetch.scd.FetchedEntity
-        ] = {}
+    operation_cache: Dict[str, fetch.scd.FetchedEntity] = context.scd_cache.setdefault(
+        "operational_intents", {}
+    )
     result = fetch.scd.operations(
         scd_client,
         box,
         area.area.time_start.datetime,
         area.area.time_end.datetime,
-        operation_cache=context.scd_cache["operational_intents"],
+        operation_cache=operation_cache,
     )
     t1 = datetime.datetime.now(datetime.UTC)
 
-    log_new = False
-    last_result = None
-    with polling_values as tx:
-        if tx.last_ops_result is None or result.has_different_content_than(
-            tx.last_ops_result
-        ):
-            last_result = tx.last_ops_result
-            log_new = True
-            tx.need_line_break = False
-            tx.last_ops_result = result
-        else:
-            tx.need_line_break = True
-        need_line_break = tx.need_line_break
+    log_new, last_result = _update_last_result(
+        last_entity_results, _poller_key(area, "ops"), result
+    )
 
     log_entry = PollOperationalIntents(
         poll=result, recorded_at=StringBasedDateTime(arrow.utcnow())
     )
     if log_new:
         logger.log_new(log_entry)
-        if need_line_break:
-            print()
-        print(diff.entity_diff_text(last_result, result))
+        _print_change(diff.entity_diff_text(last_result, result))
     else:
         logger.log_same(t0, t1, log_entry.prefix_code())
         print_no_newline(".")
@@ -192,37 +267,28 @@ def poll_constraints(
 ) -> None:
     box = make_latlng_rect(area.area.volume)
     t0 = datetime.datetime.now(datetime.UTC)
-    if "constraints" not in context.scd_cache:
-        context.scd_cache["constraints"]: Dict[str, fetch.scd.FetchedEntity] = {}
+    constraint_cache: Dict[str, fetch.scd.FetchedEntity] = context.scd_cache.setdefault(
+        "constraints", {}
+    )
     result = fetch.scd.constraints(
         scd_client,
         box,
         area.area.time_start.datetime,
         area.area.time_end.datetime,
-        constraint_cache=context.scd_cache["constraints"],
+        constraint_cache=constraint_cache,
     )
     t1 = datetime.datetime.now(datetime.UTC)
 
-    log_new = False
-    last_result = None
-    with polling_values as tx:
-        if result.has_different_content_than(tx.last_constraints_result):
-            last_result = tx.last_constraints_result
-            log_new = True
-            tx.need_line_break = False
-            tx.last_constraints_result = result
-        else:
-            tx.need_line_break = True
-        need_line_break = tx.need_line_break
+    log_new, last_result = _update_last_result(
+        last_entity_results, _poller_key(area, "constraints"), result
+    )
 
     log_entry = PollConstraints(
         poll=result, recorded_at=StringBasedDateTime(arrow.utcnow())
     )
     if log_new:
         logger.log_new(log_entry)
-        if need_line_break:
-            print()
-        print(diff.entity_diff_text(last_result, result))
+        _print_change(diff.entity_diff_text(last_result, result))
     else:
         logger.log_same(t0, t1, log_entry.prefix_code())
         print_no_newline(".")
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+from implicitdict import ImplicitDict
+
+from monitoring.mock_uss.tracer import tracer_poll
+from monitoring.monitorlib.multiprocessing import SynchronizedKeyedValues
+
+
+class _Result(ImplicitDict):
+    content: str
+    retrieved_at: str = ""
+
+    def has_different_content_than(self, other) -> bool:
+        return self.content != other.content
+
+
+def test_update_last_result():
+    results = SynchronizedKeyedValues(
+        capacity_bytes=10000,
+        decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), _Result),
+    )
+
+    changed, last = tracer_poll._update_last_result(
+        results, "a/isas", _Result(content="x", retrieved_at="t0")
+    )
+    assert changed and last is None
+
+    changed, last = tracer_poll._update_last_result(
+        results, "a/isas", _Result(content="x", retrieved_at="t1")
+    )
+    assert not changed and last.retrieved_at == "t0"
+    assert results.get("a/isas").retrieved_at == "t0"
+
+    changed, last = tracer_poll._update_last_result(
+        results, "a/isas", _Result(content="y", retrieved_at="t2")
+    )
+    assert changed and last.content == "x"
+    assert results.get("a/isas").content == "y"
+    assert results.get("b/isas") is None
+
+
+def test_poll_observation_areas_skips_pollers_in_progress(monkeypatch):
+    areas = {
+        area_id: SimpleNamespace(
+            id=area_id, f3411=SimpleNamespace(poll=True), f3548=None
+        )
+        for area_id in ("slow", "fast")
+    }
+    monkeypatch.setattr(
+        tracer_poll,
+        "db",
+        SimpleNamespace(value=SimpleNamespace(observation_areas=areas)),
+    )
+    monkeypatch.setattr(tracer_poll, "_log_poll_start", lambda logger: None)
+    monkeypatch.setattr(tracer_poll, "_polls_in_progress", {})
+
+    release = threading.Event()
+    polls = {"slow": 0, "fast": 0}
+
+    def poll_isas(area, logger):
+        polls[area.id] += 1
+        if area.id == "slow":
+            release.wait(5)
+        else:
+            raise ValueError("Poll failures must not affect other pollers")
+
+    monkeypatch.setattr(tracer_poll, "poll_isas", poll_isas)
+
+    for _ in range(3):
+        tracer_poll.poll_observation_areas()
+        deadline = time.monotonic() + 5
+        while (
+            not tracer_poll._polls_in_progress["fast/isas"].done()
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+    release.set()
+    tracer_poll._polls_in_progress["slow/isas"].result(timeout=5)
+
+    assert polls == {"slow": 1, "fast": 3}
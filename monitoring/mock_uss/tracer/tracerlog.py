@@ -1,54 +1,77 @@
 import datetime
 import json
 import os
+from typing import Iterator, List, Optional, Set, Tuple
 
 import yaml
 
 from monitoring.mock_uss.tracer.log_types import TracerLogEntry
-from monitoring.monitorlib import infrastructure
+from monitoring.monitorlib import indexed_log, infrastructure
+
+NOCHANGE_KIND = "nochange"
+"""Kind of the records noting that a poll found no changes."""
+
+NOCHANGE_LOG_NAME = "nochange_queries"
+"""Name of the log consisting of all records noting that a poll found no changes."""
+
+
+def log_title(entry: indexed_log.IndexEntry) -> str:
+    """Human-readable title of a tracer log entry."""
+    entry_type = TracerLogEntry.entry_type(entry.kind)
+    prefix_code = entry_type.prefix_code() if entry_type else entry.kind
+    return "{}_{}".format(entry.time.strftime("%Y%m%d_%H%M%S_%f"), prefix_code)
 
 
 class Logger(object):
+    """Records tracer log entries in an indexed log (see monitorlib.indexed_log) where the kind of each record is the
+    name of its TracerLogEntry type.
+
+    Each log entry is identified by the key of its record in the indexed log.
+    """
+
     def __init__(
         self, log_path: str, kml_session: infrastructure.KMLGenerationSession = None
     ):
         self.log_path = log_path
         os.makedirs(self.log_path, exist_ok=True)
         self.kml_session = kml_session
+        self._log = indexed_log.IndexedLogWriter(self.log_path)
 
     def log_same(self, t0: datetime.datetime, t1: datetime.datetime, code: str) -> None:
-        with open(
-            os.path.join(self.log_path, "000000_nochange_queries.yaml"), "a"
-        ) as f:
-            body = {"t0": t0.isoformat(), "t1": t1.isoformat(), "code": code}
-            f.write(yaml.dump(body, explicit_start=True))
+        body = {"t0": t0.isoformat(), "t1": t1.isoformat(), "code": code}
+        self._log.append(t1, NOCHANGE_KIND, json.dumps(body).encode("utf-8"))
 
     def log_new(self, content: TracerLogEntry) -> str:
-        n = len(os.listdir(self.log_path))
-        basename = "{:06d}_{}_{}".format(
-            n, datetime.datetime.now().strftime("%H%M%S_%f"), content.prefix_code()
+        entry = self._log.append(
+            content.recorded_at.datetime,
+            type(content).__name__,
+            json.dumps(content).encode("utf-8"),
         )
-        logname = "{}.yaml".format(basename)
-        fullname = os.path.join(self.log_path, logname)
-
-        dump = json.loads(json.dumps(content))
-        dump["object_type"] = type(content).__name__
-        with open(fullname, "w") as f:
-            f.write(yaml.dump(dump, indent=2))
+        logname = entry.key
 
         if self.kml_session:
-            kml_server_filename = os.path.join(self.kml_session.kml_folder, logname)
+            kml_server_filename = os.path.join(
+                self.kml_session.kml_folder, f"{log_title(entry)}.yaml"
+            )
             try:
-                with open(fullname, "r") as f:
-                    resp = self.kml_session.post(
-                        "/realtime_kml",
-                        data={"path": self.kml_session.kml_folder},
-                        files=[("files[]", f)],
-                    )
+                dump = json.loads(entry.read())
+                resp = self.kml_session.post(
+                    "/realtime_kml",
+                    data={"path": self.kml_session.kml_folder},
+                    files=[
+                        (
+                            "files[]",
+                            (
+                                os.path.basename(kml_server_filename),
+                                yaml.dump(dump, indent=2),
+                            ),
+                        )
+                    ],
+                )
                 resp.raise_for_status()
                 kml_path = os.path.join(self.log_path, "kml")
                 os.makedirs(kml_path, exist_ok=True)
-                with open(os.path.join(kml_path, "{}.kml".format(basename)), "w") as f:
+                with open(os.path.join(kml_path, "{}.kml".format(logname)), "w") as f:
                     f.write(resp.content.decode("utf-8"))
             except IOError as e:
                 print(
@@ -56,3 +79,43 @@ class Logger(object):
                 )
 
         return logname
+
+    def list_logs(
+        self,
+        from_time: Optional[datetime.datetime] = None,
+        to_time: Optional[datetime.datetime] = None,
+        kinds: Optional[Set[str]] = None,
+    ) -> List[indexed_log.IndexEntry]:
+        """List log entries (excluding records of polls with no changes) in time order."""
+        return [
+            e
+            for e in indexed_log.find(self.log_path, from_time, to_time, kinds)
+            if e.kind != NOCHANGE_KIND
+        ]
+
+    def get_log(self, logname: str) -> Optional[indexed_log.IndexEntry]:
+        return indexed_log.get(self.log_path, logname)
+
+    def nochange_logs(self) -> Iterator[dict]:
+        """Records of polls with no changes, in time order."""
+        entries = indexed_log.find(self.log_path, kinds={NOCHANGE_KIND})
+        for content in indexed_log.iter_contents(entries):
+            yield json.loads(content)
+
+    def iter_logs(
+        self, entries: List[indexed_log.IndexEntry]
+    ) -> Iterator[Tuple[indexed_log.IndexEntry, dict]]:
+        """Read the content of each of the specified log entries."""
+        for entry, content in indexed_log.iter_records(entries):
+            yield entry, json.loads(content)
+
+    def clear(self) -> int:
+        """Remove all log entries and their KMLs, returning the number of files removed."""
+        n = indexed_log.clear(self.log_path)
+        kml_path = os.path.join(self.log_path, "kml")
+        if os.path.exists(kml_path):
+            for f in os.listdir(kml_path):
+                if f.endswith(".kml"):
+                    os.remove(os.path.join(kml_path, f))
+                    n += 1
+        return n
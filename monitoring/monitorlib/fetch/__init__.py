@@ -1,9 +1,12 @@
+import asyncio
 import datetime
+import http.cookiejar
 import json
 import os
+import threading
 import traceback
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Type, TypeVar, Union
 from urllib.parse import urlparse
@@ -11,6 +14,7 @@ from urllib.parse import urlparse
 import flask
 import jwt
 import requests
+import requests.adapters
 import urllib3
 import yaml
 from implicitdict import ImplicitDict, StringBasedDateTime
@@ -39,10 +43,124 @@ class Settings:
     fake_netlocs: tuple[str] = ("testdummy.interuss.org",)
     """Network locations well-known to be fake and for which a request should fail immediately without being attempted."""
 
+    default_session_pool_maxsize: int = 10
+    """Maximum number of connections to keep open to each host queried without a client session (see DefaultSessions)."""
+
+    default_session_keep_alive: bool = True
+    """Whether connections to hosts queried without a client session are kept alive to be reused by later queries."""
+
+    max_concurrent_queries_per_host: int = 4
+    """Maximum number of queries to the same host that query_and_describe_many may have in progress at once."""
+
+    @property
+    def default_session_stats(self) -> "DefaultSessionStats":
+        """Statistics regarding the connections used by queries made without a client session in this process."""
+        return default_sessions.stats()
+
+
+@dataclass
+class DefaultSessionStats:
+    hosts: int
+    """Number of hosts for which a default session exists."""
+
+    requests: int
+    """Number of requests sent using default sessions."""
+
+    new_connections: int
+    """Number of connections established (and therefore TCP and TLS handshakes performed) by default sessions."""
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests sent on a connection that was already established."""
+        if self.requests == 0:
+            return 0
+        return max(0.0, 1 - self.new_connections / self.requests)
+
+
+class _NoCookiePolicy(http.cookiejar.DefaultCookiePolicy):
+    """Cookie policy that neither stores nor sends any cookie."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class DefaultSessions(object):
+    """Process-wide `requests` Sessions, one per host, used for queries made without a client session.
+
+    Reusing a Session for a host allows its connections to be kept alive and reused by later queries to that host rather
+    than establishing a new connection (with TCP and TLS handshakes) for every query.  Since each query without a
+    client session would otherwise use a fresh Session, these Sessions do not retain cookies between queries.
+    """
+
+    _lock: threading.Lock
+    _sessions: Dict[str, requests.Session]
+    _pid: int
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._pid = os.getpid()
+
+    def get(self, url: str) -> requests.Session:
+        """Retrieve the Session to use to query the specified URL."""
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Connections opened by a parent process must not be shared with it
+                self._sessions = {}
+                self._pid = os.getpid()
+            session = self._sessions.get(host, None)
+            if session is None:
+                session = requests.Session()
+                session.cookies.set_policy(_NoCookiePolicy())
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.default_session_pool_maxsize,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if not settings.default_session_keep_alive:
+                    session.headers["Connection"] = "close"
+                self._sessions[host] = session
+        return session
+
+    def stats(self) -> DefaultSessionStats:
+        n_requests = 0
+        n_connections = 0
+        with self._lock:
+            sessions = list(self._sessions.values()) if os.getpid() == self._pid else []
+        for session in sessions:
+            adapters = {id(a): a for a in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        n_requests += pool.num_requests
+                        n_connections += pool.num_connections
+        return DefaultSessionStats(
+            hosts=len(sessions), requests=n_requests, new_connections=n_connections
+        )
+
+    def close(self) -> None:
+        """Close all default Sessions; later queries will create new Sessions according to current settings."""
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = {}
+        for session in sessions.values():
+            session.close()
+
 
 settings = Settings()
 """Singleton settings for queries made with this tool"""
 
+default_sessions = DefaultSessions()
+"""Singleton Sessions used for queries made with this tool without a client session"""
+
 
 class RequestDescription(ImplicitDict):
     method: str
@@ -589,7 +707,7 @@ def query_and_describe(
     result rather than raising an exception.
 
     Args:
-        client: UTMClientSession to use, or None to use a default `requests` Session.
+        client: UTMClientSession to use, or None to use the default `requests` Session for the URL's host.
         verb: HTTP verb to perform at the specified URL.
         url: URL to query.
         query_type: If specified, the known type of query that this is.
@@ -602,7 +720,7 @@ def query_and_describe(
     """
     if client is None:
         utm_session = False
-        client = requests.session()
+        client = default_sessions.get(url)
     else:
         utm_session = True
     req_kwargs = kwargs.copy()
@@ -706,6 +824,70 @@ def query_and_describe(
     return result
 
 
+@dataclass
+class QuerySpec:
+    """Arguments to query_and_describe describing a query to be performed later (see query_and_describe_many)."""
+
+    client: Optional[infrastructure.UTMClientSession]
+    verb: str
+    url: str
+    query_type: Optional[QueryType] = None
+    participant_id: Optional[str] = None
+    expect_failure: bool = False
+    kwargs: dict = field(default_factory=dict)
+    """Keyword arguments to apply to the <session>.request method when invoking it."""
+
+    @property
+    def host(self) -> str:
+        url = self.url
+        if url.startswith("/") and isinstance(
+            self.client, infrastructure.UTMClientSession
+        ):
+            url = self.client.get_prefix_url() + url
+        return urlparse(url).netloc
+
+    def perform(self) -> Query:
+        return query_and_describe(
+            self.client,
+            self.verb,
+            self.url,
+            query_type=self.query_type,
+            participant_id=self.participant_id,
+            expect_failure=self.expect_failure,
+            **self.kwargs,
+        )
+
+
+async def query_and_describe_many(
+    specs: List[QuerySpec], max_concurrent_per_host: Optional[int] = None
+) -> List[Query]:
+    """Perform multiple queries concurrently and describe the results of each attempt.
+
+    Each query is performed with query_and_describe (in a worker thread), so timings, retries, and failures are captured
+    in the same way as for a single query.
+
+    Args:
+        specs: Queries to perform.
+        max_concurrent_per_host: Maximum number of queries to the same host to have in progress at once; defaults to
+            settings.max_concurrent_queries_per_host.
+
+    Returns:
+        Query objects describing each request and response/result, in the same order as `specs`.
+    """
+    if max_concurrent_per_host is None:
+        max_concurrent_per_host = settings.max_concurrent_queries_per_host
+    limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def perform(spec: QuerySpec) -> Query:
+        host = spec.host
+        if host not in limits:
+            limits[host] = asyncio.Semaphore(max_concurrent_per_host)
+        async with limits[host]:
+            return await asyncio.to_thread(spec.perform)
+
+    return list(await asyncio.gather(*(perform(spec) for spec in specs)))
+
+
 def describe_flask_query(
     req: flask.Request, res: flask.Response, elapsed_s: float
 ) -> Query:
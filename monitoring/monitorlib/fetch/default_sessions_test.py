@@ -0,0 +1,64 @@
+import http.server
+import threading
+
+import pytest
+
+from monitoring.monitorlib.fetch import DefaultSessions
+
+
+class _CookieHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = (self.headers.get("Cookie") or "").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _CookieHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_are_shared_per_host():
+    sessions = DefaultSessions()
+    a = sessions.get("https://a.example.com/flights")
+    assert sessions.get("https://a.example.com/other?x=1") is a
+    assert sessions.get("http://a.example.com/flights") is not a
+    assert sessions.get("https://b.example.com/flights") is not a
+    assert sessions.stats().hosts == 3
+
+    sessions.close()
+    assert sessions.get("https://a.example.com/flights") is not a
+
+
+def test_connections_are_reused_without_cookies(server_url):
+    sessions = DefaultSessions()
+    assert sessions.stats().requests == 0
+    assert sessions.stats().reuse_ratio == 0
+
+    session = sessions.get(server_url)
+    for _ in range(4):
+        resp = session.get(f"{server_url}/path")
+        assert resp.status_code == 200
+        # Cookies set by an earlier response must not be sent with later queries
+        assert resp.text == ""
+    assert len(session.cookies) == 0
+
+    stats = sessions.stats()
+    assert stats.hosts == 1
+    assert stats.requests == 4
+    assert stats.new_connections == 1
+    assert stats.reuse_ratio == 0.75
+    sessions.close()
@@ -0,0 +1,129 @@
+import asyncio
+import http.server
+import json
+import socket
+import threading
+import time
+from typing import Dict
+
+import pytest
+
+from monitoring.monitorlib.fetch import QuerySpec, query_and_describe_many
+
+
+class _DelayHandler(http.server.BaseHTTPRequestHandler):
+    """Responds to GET /delay/<seconds> after the specified delay, tracking concurrent requests per Host header."""
+
+    lock = threading.Lock()
+    in_flight: Dict[str, int] = {}
+    max_in_flight: Dict[str, int] = {}
+
+    def do_GET(self):
+        host = self.headers.get("Host")
+        with self.lock:
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(
+                self.max_in_flight.get(host, 0), self.in_flight[host]
+            )
+        try:
+            time.sleep(float(self.path.split("/")[-1]))
+            body = json.dumps({"path": self.path}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.lock:
+                self.in_flight[host] -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_port():
+    _DelayHandler.in_flight = {}
+    _DelayHandler.max_in_flight = {}
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DelayHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_results_in_order_of_specs(server_port):
+    delays = [0.3, 0.2, 0.1, 0]
+    specs = [
+        QuerySpec(None, "GET", f"http://127.0.0.1:{server_port}/delay/{d}")
+        for d in delays
+    ]
+    queries = asyncio.run(query_and_describe_many(specs, max_concurrent_per_host=4))
+
+    assert [q.request.url for q in queries] == [s.url for s in specs]
+    for d, q in zip(delays, queries):
+        assert q.status_code == 200
+        assert q.response.json == {"path": f"/delay/{d}"}
+        assert q.response.elapsed_s >= d
+    # The queries were performed concurrently rather than one after another
+    t0 = min(q.request.timestamp for q in queries)
+    t1 = max(q.response.reported.datetime for q in queries)
+    assert (t1 - t0).total_seconds() < sum(delays)
+
+
+def test_concurrency_limited_per_host(server_port):
+    hosts = [f"127.0.0.1:{server_port}", f"localhost:{server_port}"]
+    specs = [
+        QuerySpec(None, "GET", f"http://{host}/delay/0.2")
+        for host in hosts
+        for _ in range(6)
+    ]
+    queries = asyncio.run(query_and_describe_many(specs, max_concurrent_per_host=2))
+
+    assert all(q.status_code == 200 for q in queries)
+    assert _DelayHandler.max_in_flight == {host: 2 for host in hosts}
+
+
+def test_failures_and_timeouts_recorded(server_port):
+    specs = [
+        QuerySpec(
+            None,
+            "GET",
+            f"http://127.0.0.1:{server_port}/delay/1",
+            participant_id="slow_uss",
+            expect_failure=True,
+            kwargs={"timeout": (1, 0.1)},
+        ),
+        QuerySpec(
+            None,
+            "GET",
+            f"http://127.0.0.1:{_unused_port()}/delay/0",
+            expect_failure=True,
+        ),
+        QuerySpec(None, "GET", f"http://127.0.0.1:{server_port}/delay/0"),
+    ]
+    timed_out, refused, ok = asyncio.run(query_and_describe_many(specs))
+
+    assert timed_out.status_code == 999
+    assert timed_out.participant_id == "slow_uss"
+    # Timeouts are retried, and each attempt is described
+    assert "attempt 1" in timed_out.response.failure
+    assert "attempt 2" in timed_out.response.failure
+    assert "failed with timeout" in timed_out.response.failure
+    assert timed_out.response.elapsed_s < 1
+
+    assert refused.status_code == 999
+    assert "non-retryable ConnectionError" in refused.response.failure
+    assert "attempt 2" not in refused.response.failure
+
+    assert ok.status_code == 200
+    assert "failure" not in ok.response
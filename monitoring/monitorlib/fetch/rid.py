@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import datetime
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import s2sphere
 import yaml
@@ -1168,35 +1171,36 @@ class FetchedUSSFlights(RIDQuery):
             )
 
 
-def uss_flights(
+def _uss_flights_spec(
     flights_url: str,
     area: s2sphere.LatLngRect,
     include_recent_positions: bool,
     rid_version: RIDVersion,
     session: UTMClientSession,
     participant_id: Optional[str] = None,
-) -> FetchedUSSFlights:
+) -> fetch.QuerySpec:
     if rid_version == RIDVersion.f3411_19:
-        query = fetch.query_and_describe(
+        return fetch.QuerySpec(
             session,
             "GET",
             flights_url,
-            params={
-                "view": "{},{},{},{}".format(
-                    area.lat_lo().degrees,
-                    area.lng_lo().degrees,
-                    area.lat_hi().degrees,
-                    area.lng_hi().degrees,
-                ),
-                "include_recent_positions": (
-                    "true" if include_recent_positions else "false"
-                ),
-            },
-            scope=v19.constants.Scope.Read,
             query_type=QueryType.F3411v19USSSearchFlights,
             participant_id=participant_id,
+            kwargs={
+                "params": {
+                    "view": "{},{},{},{}".format(
+                        area.lat_lo().degrees,
+                        area.lng_lo().degrees,
+                        area.lat_hi().degrees,
+                        area.lng_hi().degrees,
+                    ),
+                    "include_recent_positions": (
+                        "true" if include_recent_positions else "false"
+                    ),
+                },
+                "scope": v19.constants.Scope.Read,
+            },
         )
-        return FetchedUSSFlights(v19_query=query)
     elif rid_version == RIDVersion.f3411_22a:
         params = {
             "view": "{},{},{},{}".format(
@@ -1208,22 +1212,119 @@ def uss_flights(
         }
         if include_recent_positions:
             params["recent_positions_duration"] = "60"
-        query = fetch.query_and_describe(
+        return fetch.QuerySpec(
             session,
             "GET",
             flights_url,
-            params=params,
-            scope=v22a.constants.Scope.DisplayProvider,
             query_type=QueryType.F3411v22aUSSSearchFlights,
             participant_id=participant_id,
+            kwargs={
+                "params": params,
+                "scope": v22a.constants.Scope.DisplayProvider,
+            },
         )
-        return FetchedUSSFlights(v22a_query=query)
     else:
         raise NotImplementedError(
             f"Cannot query USS for flights using RID version {rid_version}"
         )
 
 
+def _fetched_uss_flights(rid_version: RIDVersion, query: Query) -> FetchedUSSFlights:
+    if rid_version == RIDVersion.f3411_19:
+        return FetchedUSSFlights(v19_query=query)
+    else:
+        return FetchedUSSFlights(v22a_query=query)
+
+
+def uss_flights(
+    flights_url: str,
+    area: s2sphere.LatLngRect,
+    include_recent_positions: bool,
+    rid_version: RIDVersion,
+    session: UTMClientSession,
+    participant_id: Optional[str] = None,
+) -> FetchedUSSFlights:
+    spec = _uss_flights_spec(
+        flights_url,
+        area,
+        include_recent_positions,
+        rid_version,
+        session,
+        participant_id,
+    )
+    return _fetched_uss_flights(rid_version, spec.perform())
+
+
+class TimedUSSFlights(ImplicitDict):
+    """Outcome of querying one USS's flights URL as part of uss_flights_concurrently."""
+
+    flights_url: str
+
+    elapsed_s: float
+    """Seconds from the start of the concurrent queries until this USS responded, or until the deadline if it did
+    not respond in time."""
+
+    fetched: Optional[FetchedUSSFlights] = None
+    """Flights fetched from the USS, or None if the USS did not respond before the deadline."""
+
+    @property
+    def timed_out(self) -> bool:
+        return self.fetched is None
+
+
+def uss_flights_concurrently(
+    flights_urls: List[str],
+    area: s2sphere.LatLngRect,
+    include_recent_positions: bool,
+    rid_version: RIDVersion,
+    session: UTMClientSession,
+    timeout_s: float,
+) -> List[TimedUSSFlights]:
+    """Query multiple USSs for their flights in an area concurrently, waiting at most timeout_s for them to respond.
+
+    Queries still in progress at the deadline are abandoned rather than awaited, so one slow USS does not delay the
+    results from the others.
+
+    Returns:
+        Outcome of the query to each flights URL, in the same order as `flights_urls`.
+    """
+    if not flights_urls:
+        return []
+    t0 = time.monotonic()
+    completed_at: Dict[str, float] = {}
+
+    def fetch_flights(flights_url: str) -> FetchedUSSFlights:
+        result = uss_flights(
+            flights_url, area, include_recent_positions, rid_version, session
+        )
+        completed_at[flights_url] = time.monotonic()
+        return result
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(flights_urls))
+    try:
+        futures = [executor.submit(fetch_flights, url) for url in flights_urls]
+        concurrent.futures.wait(futures, timeout=timeout_s)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    t_deadline = time.monotonic()
+
+    results: List[TimedUSSFlights] = []
+    for flights_url, future in zip(flights_urls, futures):
+        if future.done() and not future.cancelled():
+            results.append(
+                TimedUSSFlights(
+                    flights_url=flights_url,
+                    elapsed_s=completed_at[flights_url] - t0,
+                    fetched=future.result(),
+                )
+            )
+        else:
+            results.append(
+                TimedUSSFlights(flights_url=flights_url, elapsed_s=t_deadline - t0)
+            )
+    return results
+
+
 class FetchedUSSFlightDetails(RIDQuery):
     """Version-independent representation of the details of a flight reported by a USS."""
 
@@ -1295,17 +1396,17 @@ class FetchedUSSFlightDetails(RIDQuery):
             )
 
 
-def flight_details(
+def _flight_details_spec(
     flights_url: str,
     flight_id: str,
     enhanced_details: bool,
     rid_version: RIDVersion,
     session: UTMClientSession,
     participant_id: Optional[str] = None,
-) -> FetchedUSSFlightDetails:
+) -> fetch.QuerySpec:
     url = f"{flights_url}/{flight_id}/details"
     if rid_version == RIDVersion.f3411_19:
-        kwargs = {"participant_id": participant_id}
+        kwargs = {}
         if enhanced_details:
             kwargs["params"] = {"enhanced": "true"}
             kwargs["scope"] = (
@@ -1313,30 +1414,57 @@ def flight_details(
             )
         else:
             kwargs["scope"] = v19.constants.Scope.Read
-        query = fetch.query_and_describe(
+        return fetch.QuerySpec(
             session,
             "GET",
             url,
             query_type=QueryType.F3411v19USSGetFlightDetails,
-            **kwargs,
+            participant_id=participant_id,
+            kwargs=kwargs,
         )
-        return FetchedUSSFlightDetails(v19_query=query)
     elif rid_version == RIDVersion.f3411_22a:
-        query = fetch.query_and_describe(
+        return fetch.QuerySpec(
             session,
             "GET",
             url,
             query_type=QueryType.F3411v22aUSSGetFlightDetails,
-            scope=v22a.constants.Scope.DisplayProvider,
             participant_id=participant_id,
+            kwargs={"scope": v22a.constants.Scope.DisplayProvider},
         )
-        return FetchedUSSFlightDetails(v22a_query=query)
     else:
         raise NotImplementedError(
             f"Cannot query USS for flight details using RID version {rid_version}"
         )
 
 
+def _fetched_flight_details(
+    rid_version: RIDVersion, query: Query
+) -> FetchedUSSFlightDetails:
+    if rid_version == RIDVersion.f3411_19:
+        return FetchedUSSFlightDetails(v19_query=query)
+    else:
+        return FetchedUSSFlightDetails(v22a_query=query)
+
+
+def flight_details(
+    flights_url: str,
+    flight_id: str,
+    enhanced_details: bool,
+    rid_version: RIDVersion,
+    session: UTMClientSession,
+    participant_id: Optional[str] = None,
+) -> FetchedUSSFlightDetails:
+    spec = _flight_details_spec(
+        flights_url,
+        flight_id,
+        enhanced_details,
+        rid_version,
+        session,
+        participant_id,
+    )
+    return _fetched_flight_details(rid_version, spec.perform())
+
+
 class FetchedFlights(ImplicitDict):
     dss_isa_query: FetchedISAs
     uss_flight_queries: Dict[str, FetchedUSSFlights]
@@ -1372,18 +1500,15 @@ class FetchedFlights(ImplicitDict):
         return not self.errors
 
 
-def all_flights(
+def _isas_in_area(
     area: s2sphere.LatLngRect,
-    include_recent_positions: bool,
-    get_details: bool,
     rid_version: RIDVersion,
     session: UTMClientSession,
-    dss_base_url: str = "",
-    enhanced_details: bool = False,
-    dss_participant_id: Optional[str] = None,
-) -> FetchedFlights:
+    dss_base_url: str,
+    dss_participant_id: Optional[str],
+) -> FetchedISAs:
     t = datetime.datetime.now(datetime.UTC)
-    isa_list = isas(
+    return isas(
         geo.get_latlngrect_vertices(area),
         t,
         t,
@@ -1393,32 +1518,105 @@ def all_flights(
         participant_id=dss_participant_id,
     )
 
+
+def _flights_to_detail(
+    uss_flight_queries: Dict[str, FetchedUSSFlights],
+) -> List[Tuple[str, str]]:
+    """Flights URL and flight ID of each flight successfully obtained from a USS, in order."""
+    return [
+        (flights_url, flight.id)
+        for flights_url, flights_for_url in uss_flight_queries.items()
+        if flights_for_url.success
+        for flight in flights_for_url.flights
+    ]
+
+
+def all_flights(
+    area: s2sphere.LatLngRect,
+    include_recent_positions: bool,
+    get_details: bool,
+    rid_version: RIDVersion,
+    session: UTMClientSession,
+    dss_base_url: str = "",
+    enhanced_details: bool = False,
+    dss_participant_id: Optional[str] = None,
+) -> FetchedFlights:
+    isa_list = _isas_in_area(
+        area, rid_version, session, dss_base_url, dss_participant_id
+    )
+
     uss_flight_queries: Dict[str, FetchedUSSFlights] = {}
     uss_flight_details_queries: Dict[str, FetchedUSSFlightDetails] = {}
     for flights_url in isa_list.flights_urls:
-        flights_for_url = uss_flights(
-            flights_url,
-            area,
-            include_recent_positions,
-            rid_version,
-            session,
-            # Note that we have no clue at this point which participant the flights_url is for,
-            # this can only be determined later by comparing injected and observed flights.
-            participant_id=None,
+        # Note that we have no clue at this point which participant the flights_url is for,
+        # this can only be determined later by comparing injected and observed flights.
+        spec = _uss_flights_spec(
+            flights_url, area, include_recent_positions, rid_version, session
         )
+        flights_for_url = _fetched_uss_flights(rid_version, spec.perform())
         uss_flight_queries[flights_url] = flights_for_url
 
-        if get_details and flights_for_url.success:
-            for flight in flights_for_url.flights:
-                details = flight_details(
-                    flights_url,
-                    flight.id,
-                    enhanced_details,
-                    rid_version,
-                    session,
-                    participant_id=None,
+        if get_details:
+            for _, flight_id in _flights_to_detail({flights_url: flights_for_url}):
+                spec = _flight_details_spec(
+                    flights_url, flight_id, enhanced_details, rid_version, session
+                )
+                uss_flight_details_queries[flight_id] = _fetched_flight_details(
+                    rid_version, spec.perform()
+                )
+
+    return FetchedFlights(
+        dss_isa_query=isa_list,
+        uss_flight_queries=uss_flight_queries,
+        uss_flight_details_queries=uss_flight_details_queries,
+    )
+
+
+async def all_flights_async(
+    area: s2sphere.LatLngRect,
+    include_recent_positions: bool,
+    get_details: bool,
+    rid_version: RIDVersion,
+    session: UTMClientSession,
+    dss_base_url: str = "",
+    enhanced_details: bool = False,
+    dss_participant_id: Optional[str] = None,
+) -> FetchedFlights:
+    """Equivalent to all_flights, but the flights of all USSs (and then the details of all flights) are fetched
+    concurrently with fetch.query_and_describe_many."""
+    isa_list = await asyncio.to_thread(
+        _isas_in_area, area, rid_version, session, dss_base_url, dss_participant_id
+    )
+
+    flights_urls = list(isa_list.flights_urls)
+    queries = await fetch.query_and_describe_many(
+        [
+            _uss_flights_spec(
+                flights_url, area, include_recent_positions, rid_version, session
+            )
+            for flights_url in flights_urls
+        ]
+    )
+    uss_flight_queries: Dict[str, FetchedUSSFlights] = {
+        flights_url: _fetched_uss_flights(rid_version, query)
+        for flights_url, query in zip(flights_urls, queries)
+    }
+
+    uss_flight_details_queries: Dict[str, FetchedUSSFlightDetails] = {}
+    if get_details:
+        to_detail = _flights_to_detail(uss_flight_queries)
+        queries = await fetch.query_and_describe_many(
+            [
+                _flight_details_spec(
+                    flights_url, flight_id, enhanced_details, rid_version, session
                 )
-                uss_flight_details_queries[flight.id] = details
+                for flights_url, flight_id in to_detail
+            ]
+        )
+        for (_, flight_id), query in zip(to_detail, queries):
+            uss_flight_details_queries[flight_id] = _fetched_flight_details(
+                rid_version, query
+            )
 
     return FetchedFlights(
         dss_isa_query=isa_list,
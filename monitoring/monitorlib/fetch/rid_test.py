@@ -0,0 +1,34 @@
+import time
+
+import s2sphere
+
+from monitoring.monitorlib.fetch import rid
+from monitoring.monitorlib.rid import RIDVersion
+
+
+def test_uss_flights_concurrently_returns_partial_results(monkeypatch):
+    delays = {"https://a/flights": 0.05, "https://b/flights": 2, "https://c/flights": 0}
+
+    def fake_uss_flights(
+        flights_url, area, include_recent_positions, rid_version, session
+    ):
+        time.sleep(delays[flights_url])
+        return rid.FetchedUSSFlights(v19_query={"flights_url": flights_url})
+
+    monkeypatch.setattr(rid, "uss_flights", fake_uss_flights)
+    area = s2sphere.LatLngRect.from_point_pair(
+        s2sphere.LatLng.from_degrees(0, 0), s2sphere.LatLng.from_degrees(1, 1)
+    )
+
+    t0 = time.monotonic()
+    results = rid.uss_flights_concurrently(
+        list(delays), area, True, RIDVersion.f3411_19, None, timeout_s=0.5
+    )
+    assert time.monotonic() - t0 < 1.5
+
+    assert [r.flights_url for r in results] == list(delays)
+    assert [r.timed_out for r in results] == [False, True, False]
+    assert results[0].fetched.v19_query["flights_url"] == "https://a/flights"
+    assert results[0].elapsed_s < 0.5
+    assert results[1].elapsed_s >= 0.5
+    assert results[2].elapsed_s < results[0].elapsed_s
@@ -1,5 +1,6 @@
+import asyncio
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import s2sphere
 import yaml
@@ -186,26 +187,39 @@ class FetchedEntity(fetch.Query):
 yaml.add_representer(FetchedEntity, Representer.represent_dict)
 
 
-def _full_entity(
+def _full_entity_spec(
     uss_resource_name: str,
     uss_base_url: str,
     entity_id: str,
     utm_client: infrastructure.UTMClientSession,
-) -> FetchedEntity:
+) -> fetch.QuerySpec:
     uss_entity_url = uss_base_url + "/uss/v1/{}s/{}".format(
         uss_resource_name, entity_id
     )
-
-    # Query the USS for Entity details
     scope = scd.SCOPE_CP if "constraint" in uss_resource_name else scd.SCOPE_SC
-    entity = FetchedEntity(
-        fetch.query_and_describe(utm_client, "GET", uss_entity_url, scope=scope)
-    )
+    return fetch.QuerySpec(utm_client, "GET", uss_entity_url, kwargs={"scope": scope})
+
+
+def _fetched_entity(
+    uss_resource_name: str, entity_id: str, query: fetch.Query
+) -> FetchedEntity:
+    entity = FetchedEntity(query)
     entity.id_requested = entity_id
     entity.entity_type = uss_resource_name
     return entity
 
 
+def _full_entity(
+    uss_resource_name: str,
+    uss_base_url: str,
+    entity_id: str,
+    utm_client: infrastructure.UTMClientSession,
+) -> FetchedEntity:
+    # Query the USS for Entity details
+    spec = _full_entity_spec(uss_resource_name, uss_base_url, entity_id, utm_client)
+    return _fetched_entity(uss_resource_name, entity_id, spec.perform())
+
+
 def operational_intent(
     uss_base_url: str, entity_id: str, utm_client: infrastructure.UTMClientSession
 ) -> FetchedEntity:
@@ -283,6 +297,60 @@ class CachedEntity(ImplicitDict):
         return self.uss_query
 
 
+def _entities_to_fetch(
+    uss_resource_name: str,
+    utm_client: infrastructure.UTMClientSession,
+    fetched_references: FetchedEntityReferences,
+    entity_cache: Dict[str, CachedEntity],
+) -> Tuple[Dict[str, FetchedEntity], List[Tuple[str, fetch.QuerySpec]]]:
+    """Determine which referenced entities are already cached and which must be retrieved from their USSs.
+
+    Returns:
+        * Cached entities, by ID
+        * ID of each entity to retrieve along with the query to retrieve it, in order of reference
+    """
+    cached_queries: Dict[str, FetchedEntity] = {}
+    to_fetch: List[Tuple[str, fetch.QuerySpec]] = []
+    for entity_id, entity_ref in fetched_references.references_by_id.items():
+        if (
+            entity_id in entity_cache
+            and entity_cache[entity_id].reference == entity_ref
+            and entity_cache[entity_id].uss_success
+        ):
+            # Entity reference data in DSS is identical to the cached reference; do
+            # not re-retrieve Entity details from USS
+            cached_queries[entity_id] = entity_cache[entity_id].fetched_entity
+            continue
+
+        to_fetch.append(
+            (
+                entity_id,
+                _full_entity_spec(
+                    uss_resource_name,
+                    entity_ref["uss_base_url"],
+                    entity_id,
+                    utm_client,
+                ),
+            )
+        )
+    return cached_queries, to_fetch
+
+
+def _record_fetched_entity(
+    uss_resource_name: str,
+    fetched_references: FetchedEntityReferences,
+    entity_cache: Dict[str, CachedEntity],
+    entity_id: str,
+    query: fetch.Query,
+) -> FetchedEntity:
+    fetched_entity = _fetched_entity(uss_resource_name, entity_id, query)
+    entity_cache[entity_id] = CachedEntity(
+        reference=fetched_references.references_by_id[entity_id],
+        uss_query=fetched_entity,
+    )
+    return fetched_entity
+
+
 def _entities(
     dss_resource_name: str,
     uss_resource_name: str,
@@ -303,23 +371,59 @@ def _entities(
     if fetched_references.success:
         if entity_cache is None:
             entity_cache = {}
-        for entity_id, entity_ref in fetched_references.references_by_id.items():
-            if (
-                entity_id in entity_cache
-                and entity_cache[entity_id].reference == entity_ref
-                and entity_cache[entity_id].uss_success
-            ):
-                # Entity reference data in DSS is identical to the cached reference; do
-                # not re-retrieve Entity details from USS
-                cached_queries[entity_id] = entity_cache[entity_id].fetched_entity
-                continue
-
-            fetched_entity = _full_entity(
-                uss_resource_name, entity_ref["uss_base_url"], entity_id, utm_client
+        cached_queries, to_fetch = _entities_to_fetch(
+            uss_resource_name, utm_client, fetched_references, entity_cache
+        )
+        for entity_id, spec in to_fetch:
+            uss_queries[entity_id] = _record_fetched_entity(
+                uss_resource_name,
+                fetched_references,
+                entity_cache,
+                entity_id,
+                spec.perform(),
             )
-            uss_queries[entity_id] = fetched_entity
-            entity_cache[entity_id] = CachedEntity(
-                reference=entity_ref, uss_query=fetched_entity
+
+    return FetchedEntities(
+        dss_query=fetched_references,
+        uss_queries=uss_queries,
+        cached_uss_queries=cached_queries,
+    )
+
+
+async def _entities_async(
+    dss_resource_name: str,
+    uss_resource_name: str,
+    utm_client: infrastructure.UTMClientSession,
+    area: s2sphere.LatLngRect,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    alt_min_m: float = 0,
+    alt_max_m: float = 3048,
+    entity_cache: Optional[Dict[str, CachedEntity]] = None,
+) -> FetchedEntities:
+    fetched_references = await asyncio.to_thread(
+        _entity_references,
+        dss_resource_name,
+        utm_client,
+        area,
+        start_time,
+        end_time,
+        alt_min_m,
+        alt_max_m,
+    )
+
+    uss_queries: Dict[str, FetchedEntity] = {}
+    cached_queries: Dict[str, FetchedEntity] = {}
+    if fetched_references.success:
+        if entity_cache is None:
+            entity_cache = {}
+        cached_queries, to_fetch = _entities_to_fetch(
+            uss_resource_name, utm_client, fetched_references, entity_cache
+        )
+        queries = await fetch.query_and_describe_many([spec for _, spec in to_fetch])
+        for (entity_id, _), query in zip(to_fetch, queries):
+            uss_queries[entity_id] = _record_fetched_entity(
+                uss_resource_name, fetched_references, entity_cache, entity_id, query
             )
 
     return FetchedEntities(
@@ -373,6 +477,52 @@ def constraints(
     )
 
 
+async def operations_async(
+    utm_client: infrastructure.UTMClientSession,
+    area: s2sphere.LatLngRect,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    alt_min_m: float = 0,
+    alt_max_m: float = 3048,
+    operation_cache: Optional[Dict[str, FetchedEntity]] = None,
+) -> FetchedEntities:
+    """Equivalent to operations, but the details of all operational intents are fetched concurrently."""
+    return await _entities_async(
+        "operational_intent_references",
+        "operational_intent",
+        utm_client,
+        area,
+        start_time,
+        end_time,
+        alt_min_m,
+        alt_max_m,
+        operation_cache,
+    )
+
+
+async def constraints_async(
+    utm_client: infrastructure.UTMClientSession,
+    area: s2sphere.LatLngRect,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    alt_min_m: float = 0,
+    alt_max_m: float = 3048,
+    constraint_cache: Optional[Dict[str, FetchedEntity]] = None,
+) -> FetchedEntities:
+    """Equivalent to constraints, but the details of all constraints are fetched concurrently."""
+    return await _entities_async(
+        "constraint_references",
+        "constraint",
+        utm_client,
+        area,
+        start_time,
+        end_time,
+        alt_min_m,
+        alt_max_m,
+        constraint_cache,
+    )
+
+
 class FetchedSubscription(fetch.Query):
     @property
     def success(self) -> bool:
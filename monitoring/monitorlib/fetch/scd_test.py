@@ -0,0 +1,112 @@
+import asyncio
+import datetime
+import http.server
+import json
+import threading
+from typing import Dict, List
+
+import pytest
+import s2sphere
+
+from monitoring.monitorlib.auth import NoAuth
+from monitoring.monitorlib.fetch import scd
+from monitoring.monitorlib.infrastructure import UTMClientSession
+
+
+class _DSSAndUSSHandler(http.server.BaseHTTPRequestHandler):
+    """Acts as both a DSS returning the references in `versions` and the USS managing those operational intents."""
+
+    versions: Dict[str, int] = {}
+    uss_requests: List[str] = []
+
+    def _respond(self, content: dict) -> None:
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reference(self, op_id: str) -> dict:
+        host, port = self.server.server_address
+        return {
+            "id": op_id,
+            "manager": "uss1",
+            "uss_base_url": f"http://{host}:{port}",
+            "version": self.versions[op_id],
+        }
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(
+            {
+                "operational_intent_references": [
+                    self._reference(op_id) for op_id in self.versions
+                ]
+            }
+        )
+
+    def do_GET(self):
+        op_id = self.path.split("/")[-1]
+        self.uss_requests.append(op_id)
+        self._respond(
+            {
+                "operational_intent": {
+                    "reference": self._reference(op_id),
+                    "details": {"priority": 0},
+                }
+            }
+        )
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def utm_client():
+    _DSSAndUSSHandler.versions = {"op1": 1, "op2": 1, "op3": 1}
+    _DSSAndUSSHandler.uss_requests = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DSSAndUSSHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield UTMClientSession(f"http://127.0.0.1:{server.server_address[1]}", NoAuth())
+    server.shutdown()
+    server.server_close()
+
+
+def test_operations_async_shares_cache_with_operations(utm_client):
+    area = s2sphere.LatLngRect.from_point_pair(
+        s2sphere.LatLng.from_degrees(0, 0), s2sphere.LatLng.from_degrees(1, 1)
+    )
+    t0 = datetime.datetime.now(datetime.UTC)
+    t1 = t0 + datetime.timedelta(minutes=10)
+    cache = {}
+
+    fetched = asyncio.run(
+        scd.operations_async(utm_client, area, t0, t1, operation_cache=cache)
+    )
+    assert fetched.success
+    assert list(fetched.new_entities_by_id) == ["op1", "op2", "op3"]
+    assert not fetched.cached_entities_by_id
+    for op_id, entity in fetched.new_entities_by_id.items():
+        assert entity.success
+        assert entity.id_requested == op_id
+        assert entity.entity_type == "operational_intent"
+    assert sorted(_DSSAndUSSHandler.uss_requests) == ["op1", "op2", "op3"]
+    assert sorted(cache) == ["op1", "op2", "op3"]
+
+    # Only the operational intent whose reference changed is retrieved again, whichever variant is used
+    _DSSAndUSSHandler.versions["op2"] = 2
+    _DSSAndUSSHandler.uss_requests = []
+    fetched = scd.operations(utm_client, area, t0, t1, operation_cache=cache)
+    assert list(fetched.new_entities_by_id) == ["op2"]
+    assert sorted(fetched.cached_entities_by_id) == ["op1", "op3"]
+    assert _DSSAndUSSHandler.uss_requests == ["op2"]
+
+    _DSSAndUSSHandler.uss_requests = []
+    fetched = asyncio.run(
+        scd.operations_async(utm_client, area, t0, t1, operation_cache=cache)
+    )
+    assert not fetched.new_entities_by_id
+    assert sorted(fetched.cached_entities_by_id) == ["op1", "op2", "op3"]
+    assert _DSSAndUSSHandler.uss_requests == []
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import math
 import os
 from enum import Enum
@@ -8,6 +9,7 @@ from typing import List, Optional, Tuple, Union
 import numpy as np
 import s2sphere
 import shapely.geometry
+import shapely.prepared
 from implicitdict import ImplicitDict
 from s2sphere import LatLng
 from scipy.interpolate import RectBivariateSpline as Spline
@@ -37,6 +39,9 @@ METERS_PER_FOOT = 0.3048
 DISTANCE_TOLERANCE_M = 0.01
 COORD_TOLERANCE_DEG = 360 / EARTH_CIRCUMFERENCE_M * DISTANCE_TOLERANCE_M
 
+FOOTPRINT_CACHE_SIZE = 4096
+"""Maximum number of projected volume footprints to memoize."""
+
 
 class DistanceUnits(str, Enum):
     M = "M"
@@ -253,53 +258,66 @@ class Volume3D(ImplicitDict):
             )
         return self.altitude_upper.value
 
-    def intersects_vol3(self, vol3_2: Volume3D) -> bool:
-        vol3_1 = self
-        if vol3_1.altitude_upper.value < vol3_2.altitude_lower.value:
-            return False
-        if vol3_1.altitude_lower.value > vol3_2.altitude_upper.value:
-            return False
-
-        if vol3_1.outline_circle:
-            circle = vol3_1.outline_circle
+    def outline_key(self) -> tuple:
+        """Hashable description of this volume's 2D outline, used to memoize its projected footprints."""
+        if self.outline_circle:
+            circle = self.outline_circle
             if circle.radius.units != "M":
                 raise NotImplementedError(
                     "Unsupported circle radius units: {}".format(circle.radius.units)
                 )
-            ref = s2sphere.LatLng.from_degrees(circle.center.lat, circle.center.lng)
-            footprint1 = shapely.geometry.Point(0, 0).buffer(
-                vol3_1.outline_circle.radius.value
-            )
-        elif vol3_1.outline_polygon:
-            p = vol3_1.outline_polygon.vertices[0]
-            ref = s2sphere.LatLng.from_degrees(p.lat, p.lng)
-            footprint1 = shapely.geometry.Polygon(
-                flatten(ref, s2sphere.LatLng.from_degrees(v.lat, v.lng))
-                for v in vol3_1.outline_polygon.vertices
+            return "circle", circle.center.lat, circle.center.lng, circle.radius.value
+        elif self.outline_polygon:
+            return "polygon", tuple(
+                (v.lat, v.lng) for v in self.outline_polygon.vertices
             )
         else:
             raise ValueError("Neither outline_circle nor outline_polygon specified")
 
-        if vol3_2.outline_circle:
-            circle = vol3_2.outline_circle
-            if circle.radius.units != "M":
-                raise NotImplementedError(
-                    "Unsupported circle radius units: {}".format(circle.radius.units)
-                )
-            xy = flatten(
-                ref, s2sphere.LatLng.from_degrees(circle.center.lat, circle.center.lng)
-            )
-            footprint2 = shapely.geometry.Point(*xy).buffer(circle.radius.value)
-        elif vol3_2.outline_polygon:
-            footprint2 = shapely.geometry.Polygon(
-                flatten(ref, s2sphere.LatLng.from_degrees(v.lat, v.lng))
-                for v in vol3_2.outline_polygon.vertices
-            )
-        else:
-            raise ValueError("Neither outline_circle nor outline_polygon specified")
+    def projected_footprint(
+        self, reference: Optional[Tuple[float, float]] = None
+    ) -> shapely.geometry.base.BaseGeometry:
+        """Footprint of this volume locally flattened (see `flatten`) to meters from a reference point.
+
+        :param reference: (lat, lng) degrees of the reference point; defaults to this volume's own reference point (center of circle or first polygon vertex)
+        :return: Memoized shapely footprint; must not be modified
+        """
+        outline = self.outline_key()
+        if reference is None:
+            reference = _outline_reference(outline)
+        return _projected_footprint(outline, reference)
+
+    def _altitudes_overlap(self, vol3_2: Volume3D) -> bool:
+        if self.altitude_upper.value < vol3_2.altitude_lower.value:
+            return False
+        if self.altitude_lower.value > vol3_2.altitude_upper.value:
+            return False
+        return True
 
+    def intersects_vol3(self, vol3_2: Volume3D) -> bool:
+        if not self._altitudes_overlap(vol3_2):
+            return False
+        outline = self.outline_key()
+        reference = _outline_reference(outline)
+        footprint1 = _projected_footprint(outline, reference)
+        footprint2 = vol3_2.projected_footprint(reference)
         return footprint1.intersects(footprint2)
 
+    def intersects_many(self, vol3s: List[Volume3D]) -> List[bool]:
+        """Determine whether this volume intersects each of the specified volumes.
+
+        Equivalent to calling intersects_vol3 for each volume, but this volume's footprint is projected and prepared
+        only once for all evaluations.
+        """
+        outline = self.outline_key()
+        reference = _outline_reference(outline)
+        footprint1 = _prepared_footprint(outline, reference)
+        return [
+            self._altitudes_overlap(vol3_2)
+            and footprint1.intersects(vol3_2.projected_footprint(reference))
+            for vol3_2 in vol3s
+        ]
+
     def transform(self, transformation: Transformation):
         if (
             "relative_translation" in transformation
@@ -532,6 +550,66 @@ def flatten(reference: s2sphere.LatLng, point: s2sphere.LatLng) -> Tuple[float,
     )
 
 
+def _outline_reference(outline: tuple) -> Tuple[float, float]:
+    """Reference (lat, lng) point from which a volume with the specified Volume3D.outline_key is flattened."""
+    if outline[0] == "circle":
+        return outline[1], outline[2]
+    else:
+        return outline[1][0]
+
+
+@functools.lru_cache(maxsize=FOOTPRINT_CACHE_SIZE)
+def _projected_footprint(
+    outline: tuple, reference: Tuple[float, float]
+) -> shapely.geometry.base.BaseGeometry:
+    """Shapely footprint of a volume with the specified Volume3D.outline_key, flattened like `flatten`."""
+    ref_lat, ref_lng = reference
+    x_scale = EARTH_CIRCUMFERENCE_KM * math.cos(math.radians(ref_lat)) * 1000 / 360
+    y_scale = EARTH_CIRCUMFERENCE_KM * 1000 / 360
+    if outline[0] == "circle":
+        _, lat, lng, radius_m = outline
+        return shapely.geometry.Point(
+            (lng - ref_lng) * x_scale, (lat - ref_lat) * y_scale
+        ).buffer(radius_m)
+    else:
+        latlngs = np.array(outline[1], dtype=float)
+        return shapely.geometry.Polygon(
+            np.column_stack(
+                (
+                    (latlngs[:, 1] - ref_lng) * x_scale,
+                    (latlngs[:, 0] - ref_lat) * y_scale,
+                )
+            )
+        )
+
+
+@functools.lru_cache(maxsize=FOOTPRINT_CACHE_SIZE)
+def _prepared_footprint(
+    outline: tuple, reference: Tuple[float, float]
+) -> shapely.prepared.PreparedGeometry:
+    return shapely.prepared.prep(_projected_footprint(outline, reference))
+
+
+def flatten_many(
+    reference: s2sphere.LatLng, lats: np.ndarray, lngs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Locally flatten arrays of lat-lng points (degrees) to arrays of dx and dy in meters from reference.
+
+    Vectorized equivalent of `flatten`.
+    """
+    return (
+        (np.asarray(lngs, dtype=float) - reference.lng().degrees)
+        * EARTH_CIRCUMFERENCE_KM
+        * math.cos(reference.lat().radians)
+        * 1000
+        / 360,
+        (np.asarray(lats, dtype=float) - reference.lat().degrees)
+        * EARTH_CIRCUMFERENCE_KM
+        * 1000
+        / 360,
+    )
+
+
 def unflatten(
     reference: s2sphere.LatLng, point: Tuple[float, float]
 ) -> s2sphere.LatLng:
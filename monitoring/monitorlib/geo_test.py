@@ -3,6 +3,12 @@ from typing import List, Tuple
 from s2sphere import LatLng
 
 from monitoring.monitorlib.geo import (
+    Altitude,
+    Circle,
+    Polygon,
+    Volume3D,
+    flatten,
+    flatten_many,
     generate_area_in_vicinity,
     generate_slight_overlap_area,
 )
@@ -66,3 +72,57 @@ def test_generate_area_in_vicinity():
         generate_area_in_vicinity(_points([(-1, -1), (0, -1), (0, 0), (-1, 0)]), 2),
         _points([(-2.0, -2.0), (-2.0, -2.5), (-2.5, -2.5), (-2.5, -2.0)]),
     )
+
+
+def test_volume3d_intersects_many():
+    def vol3(outline: dict, alt0: float = 0, alt1: float = 100) -> Volume3D:
+        return Volume3D(
+            altitude_lower=Altitude.w84m(alt0),
+            altitude_upper=Altitude.w84m(alt1),
+            **outline,
+        )
+
+    square = vol3(
+        {
+            "outline_polygon": Polygon.from_coords(
+                [(46, 7), (46.01, 7), (46.01, 7.01), (46, 7.01)]
+            )
+        }
+    )
+    others = [
+        vol3({"outline_circle": Circle.from_meters(46.005, 7.005, 10)}),
+        vol3({"outline_circle": Circle.from_meters(46.005, 7.005, 10)}, 200, 300),
+        vol3({"outline_circle": Circle.from_meters(46.02, 7.005, 1200)}),
+        vol3({"outline_circle": Circle.from_meters(46.02, 7.005, 1000)}),
+        vol3(
+            {
+                "outline_polygon": Polygon.from_coords(
+                    [(46.01, 7.01), (46.02, 7.01), (46.02, 7.02)]
+                )
+            }
+        ),
+        vol3(
+            {
+                "outline_polygon": Polygon.from_coords(
+                    [(46.011, 7.01), (46.02, 7.01), (46.02, 7.02)]
+                )
+            }
+        ),
+    ]
+    expected = [True, False, True, False, True, False]
+    assert [square.intersects_vol3(v) for v in others] == expected
+    assert square.intersects_many(others) == expected
+    # Evaluating again uses memoized footprints
+    assert square.intersects_many(others) == expected
+
+
+def test_flatten_many():
+    reference = LatLng.from_degrees(46.0, 7.0)
+    points = [(46.0, 7.0), (46.01, 7.02), (45.99, 6.98)]
+    xs, ys = flatten_many(
+        reference, [lat for lat, _ in points], [lng for _, lng in points]
+    )
+    for (lat, lng), x, y in zip(points, xs, ys):
+        expected_x, expected_y = flatten(reference, LatLng.from_degrees(lat, lng))
+        assert abs(x - expected_x) < MAX_DIFFERENCE
+        assert abs(y - expected_y) < MAX_DIFFERENCE
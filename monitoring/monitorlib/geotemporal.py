@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import arrow
+import numpy as np
 import s2sphere as s2sphere
 from implicitdict import ImplicitDict, StringBasedTimeDelta
 from uas_standards.astm.f3548.v21 import api as f3548v21
@@ -394,9 +395,14 @@ class Volume4DCollection(List[Volume4D]):
 
     def intersects_vol4s(self, vol4s_2: Volume4DCollection) -> bool:
         for v1 in self:
-            for v2 in vol4s_2:
-                if v1.intersects_vol4(v2):
-                    return True
+            concurrent_vol3s = [
+                v2.volume
+                for v2 in vol4s_2
+                if v1.time_end.datetime >= v2.time_start.datetime
+                and v1.time_start.datetime <= v2.time_end.datetime
+            ]
+            if any(v1.volume.intersects_many(concurrent_vol3s)):
+                return True
         return False
 
     @staticmethod
@@ -423,6 +429,142 @@ class Volume4DCollection(List[Volume4D]):
         )
 
 
+class Volume4DIndex(object):
+    """Index of keyed 4D volumes to efficiently find the keys with volumes intersecting other volumes.
+
+    The bounds (latitude, longitude, altitude and time ranges) of all indexed volumes are kept in a NumPy array so that
+    candidates can be selected for all indexed volumes at once; only those candidates then have their footprints evaluated
+    exactly (see Volume3D.intersects_many).
+    """
+
+    BOUNDS_MARGIN = 0.01
+    """Fraction by which the lat/lng bounds of a circle are enlarged to keep the prefilter conservative with respect to
+    the local flattening used by Volume3D.intersects_vol3."""
+
+    _keys: List[Any]
+    _key_order: Dict[Any, int]
+    _volumes: List[Volume4D]
+    _bounds: List[Tuple[float, ...]]
+    _bounds_array: Optional[np.ndarray]
+
+    def __init__(self):
+        self._keys = []
+        self._key_order = {}
+        self._volumes = []
+        self._bounds = []
+        self._bounds_array = None
+
+    def __len__(self) -> int:
+        return len(self._volumes)
+
+    @staticmethod
+    def _bounds_of(vol4: Volume4D) -> Tuple[float, ...]:
+        """Computes (lat_lo, lat_hi, lng_lo, lng_hi, alt_lo, alt_hi, t_start, t_end) for the specified volume."""
+        lat_lo = math.inf
+        lat_hi = -math.inf
+        lng_lo = math.inf
+        lng_hi = -math.inf
+        vol3 = vol4.volume
+        if "outline_polygon" in vol3 and vol3.outline_polygon:
+            for v in vol3.outline_polygon.vertices:
+                lat_lo = min(lat_lo, v.lat)
+                lat_hi = max(lat_hi, v.lat)
+                lng_lo = min(lng_lo, v.lng)
+                lng_hi = max(lng_hi, v.lng)
+        if "outline_circle" in vol3 and vol3.outline_circle:
+            circle = vol3.outline_circle
+            if circle.radius.units != "M":
+                raise NotImplementedError(
+                    "Unsupported circle radius units: {}".format(circle.radius.units)
+                )
+            lat_radius = (
+                360
+                * circle.radius.value
+                * (1 + Volume4DIndex.BOUNDS_MARGIN)
+                / geo.EARTH_CIRCUMFERENCE_M
+            )
+            lng_radius = lat_radius / max(
+                math.cos(math.radians(abs(circle.center.lat) + lat_radius)), 1e-9
+            )
+            lat_lo = min(lat_lo, circle.center.lat - lat_radius)
+            lat_hi = max(lat_hi, circle.center.lat + lat_radius)
+            lng_lo = min(lng_lo, circle.center.lng - lng_radius)
+            lng_hi = max(lng_hi, circle.center.lng + lng_radius)
+        alt_lo = (
+            vol3.altitude_lower.value
+            if "altitude_lower" in vol3 and vol3.altitude_lower
+            else -math.inf
+        )
+        alt_hi = (
+            vol3.altitude_upper.value
+            if "altitude_upper" in vol3 and vol3.altitude_upper
+            else math.inf
+        )
+        t_start = (
+            vol4.time_start.datetime.timestamp()
+            if "time_start" in vol4 and vol4.time_start
+            else -math.inf
+        )
+        t_end = (
+            vol4.time_end.datetime.timestamp()
+            if "time_end" in vol4 and vol4.time_end
+            else math.inf
+        )
+        return lat_lo, lat_hi, lng_lo, lng_hi, alt_lo, alt_hi, t_start, t_end
+
+    def add(self, key: Any, volumes: Union[Volume4D, Volume4DCollection]) -> None:
+        """Adds the specified volume(s) to the index, associated with the specified key."""
+        if isinstance(volumes, Volume4D):
+            volumes = [volumes]
+        self._key_order.setdefault(key, len(self._key_order))
+        for vol4 in volumes:
+            self._keys.append(key)
+            self._volumes.append(vol4)
+            self._bounds.append(Volume4DIndex._bounds_of(vol4))
+        self._bounds_array = None
+
+    def candidates(self, vol4: Volume4D) -> List[int]:
+        """Finds the positions of indexed volumes whose bounds overlap the bounds of the specified volume."""
+        if not self._bounds:
+            return []
+        if self._bounds_array is None:
+            self._bounds_array = np.array(self._bounds, dtype=float)
+        b = self._bounds_array
+        lat_lo, lat_hi, lng_lo, lng_hi, alt_lo, alt_hi, t_start, t_end = (
+            Volume4DIndex._bounds_of(vol4)
+        )
+        mask = (
+            (b[:, 0] <= lat_hi)
+            & (b[:, 1] >= lat_lo)
+            & (b[:, 2] <= lng_hi)
+            & (b[:, 3] >= lng_lo)
+            & (b[:, 4] <= alt_hi)
+            & (b[:, 5] >= alt_lo)
+            & (b[:, 6] <= t_end)
+            & (b[:, 7] >= t_start)
+        )
+        return np.nonzero(mask)[0].tolist()
+
+    def intersecting_keys(
+        self, volumes: Union[Volume4D, Volume4DCollection]
+    ) -> List[Any]:
+        """Finds the keys having at least one indexed volume intersecting any of the specified volumes.
+
+        Keys are returned in the order they were first added to the index.
+        """
+        if isinstance(volumes, Volume4D):
+            volumes = [volumes]
+        found = set()
+        for vol4 in volumes:
+            # Candidates already overlap in time and altitude; evaluate their footprints together
+            positions = [i for i in self.candidates(vol4) if self._keys[i] not in found]
+            hits = vol4.volume.intersects_many(
+                [self._volumes[i].volume for i in positions]
+            )
+            found.update(self._keys[i] for i, hit in zip(positions, hits) if hit)
+        return sorted(found, key=lambda k: self._key_order[k])
+
+
 class Volume4DTemplateCollection(List[Volume4DTemplate]):
     pass
 
@@ -0,0 +1,58 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from monitoring.monitorlib.geo import Circle, LatLngPoint, Polygon
+from monitoring.monitorlib.geotemporal import (
+    Volume4D,
+    Volume4DCollection,
+    Volume4DIndex,
+)
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _random_volume(rng: random.Random) -> Volume4D:
+    lat = 46 + rng.uniform(0, 0.05)
+    lng = 7 + rng.uniform(0, 0.05)
+    t0 = T0 + timedelta(minutes=rng.uniform(0, 60))
+    alt0 = rng.uniform(0, 200)
+    kwargs = {
+        "t0": t0,
+        "t1": t0 + timedelta(minutes=rng.uniform(1, 20)),
+        "alt0": alt0,
+        "alt1": alt0 + rng.uniform(10, 100),
+    }
+    if rng.random() < 0.5:
+        kwargs["circle"] = Circle.from_meters(lat, lng, rng.uniform(50, 500))
+    else:
+        size = rng.uniform(0.001, 0.01)
+        kwargs["polygon"] = Polygon(
+            vertices=[
+                LatLngPoint(lat=lat, lng=lng),
+                LatLngPoint(lat=lat + size, lng=lng),
+                LatLngPoint(lat=lat + size, lng=lng + size),
+                LatLngPoint(lat=lat, lng=lng + size),
+            ]
+        )
+    return Volume4D.from_values(**kwargs)
+
+
+def test_volume4d_index_matches_exhaustive_evaluation():
+    rng = random.Random(12345)
+    collections = [
+        Volume4DCollection([_random_volume(rng) for _ in range(rng.randint(1, 3))])
+        for _ in range(100)
+    ]
+    index = Volume4DIndex()
+    for i, collection in enumerate(collections):
+        index.add(i, collection)
+    assert len(index) == sum(len(c) for c in collections)
+
+    for _ in range(20):
+        query = Volume4DCollection([_random_volume(rng) for _ in range(2)])
+        expected = [
+            i
+            for i, collection in enumerate(collections)
+            if query.intersects_vol4s(collection)
+        ]
+        assert index.intersecting_keys(query) == expected
@@ -0,0 +1,483 @@
+"""Append-only logs of timestamped records, stored in segments with a time index.
+
+Each writer (typically one per process) appends records to its own segments, so concurrent writers never need to
+coordinate.  A segment consists of a data file holding one record per line and an index file holding one fixed-width
+line per record with the record's time, kind, and location in the data file.  The index also holds the running maximum
+of record times in the segment so readers can binary-search for the first record at or after a given time even though
+records may be appended slightly out of time order.
+"""
+
+import atexit
+import datetime
+import os
+import queue
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+DATA_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+KIND_LENGTH = 64
+"""Maximum number of characters in the kind of a record."""
+
+_INDEX_LINE_FORMAT = "{:020d} {:020d} {:012d} {:010d} {:<" + str(KIND_LENGTH) + "}\n"
+INDEX_LINE_BYTES = 20 + 1 + 20 + 1 + 12 + 1 + 10 + 1 + KIND_LENGTH + 1
+
+_SEGMENT_NAME = re.compile(r"^\w+$")
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+def _to_us(t: datetime.datetime) -> int:
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=datetime.UTC)
+    return (t - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+@dataclass
+class IndexEntry(object):
+    """Location and summary of a record in an indexed log."""
+
+    time_us: int
+    """Time of the record, in microseconds since the Unix epoch."""
+
+    kind: str
+    data_path: str
+    offset: int
+    length: int
+
+    @property
+    def time(self) -> datetime.datetime:
+        return _EPOCH + datetime.timedelta(microseconds=self.time_us)
+
+    @property
+    def key(self) -> str:
+        """Identifier of this record within its log; see get."""
+        segment = os.path.basename(self.data_path)[0 : -len(DATA_SUFFIX)]
+        return f"{segment}.{self.offset}"
+
+    def read(self) -> bytes:
+        """Read the content of this record (without its trailing newline)."""
+        with open(self.data_path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+
+class IndexedLogWriter(object):
+    """Appends records to the segments of an indexed log in a directory; safe to use from multiple threads.
+
+    A new segment is started when the current one is full, when the current segment was deleted by another party (for
+    instance, when the log is cleared), and in a forked child process.
+    """
+
+    def __init__(self, path: str, records_per_segment: int = 1000):
+        self.path = path
+        self.records_per_segment = records_per_segment
+        self.records_written = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._writer_id = None
+        self._segment = 0
+        self._data_fd = None
+        self._index_fd = None
+        self._segment_records = 0
+        self._segment_bytes = 0
+        self._segment_max_us = 0
+
+    def _close_segment(self) -> None:
+        for fd in (self._data_fd, self._index_fd):
+            if fd is not None:
+                os.close(fd)
+        self._data_fd = None
+        self._index_fd = None
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        if self._pid != os.getpid():
+            # Never share segments with the process we were forked from
+            self._pid = os.getpid()
+            self._writer_id = "{}_{}".format(
+                datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%S%f"),
+                self._pid,
+            )
+            self._segment = 0
+        self._segment += 1
+        base = os.path.join(self.path, f"{self._writer_id}_{self._segment:06d}")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        self._data_path = base + DATA_SUFFIX
+        self._data_fd = os.open(self._data_path, flags, 0o644)
+        self._index_fd = os.open(base + INDEX_SUFFIX, flags, 0o644)
+        self._segment_records = 0
+        self._segment_bytes = 0
+        self._segment_max_us = 0
+
+    def _segment_usable(self) -> bool:
+        return (
+            self._pid == os.getpid()
+            and self._index_fd is not None
+            and self._segment_records < self.records_per_segment
+            and os.fstat(self._index_fd).st_nlink > 0
+        )
+
+    def append(self, t: datetime.datetime, kind: str, content: bytes) -> IndexEntry:
+        return self.append_many([(t, kind, content)])[0]
+
+    def append_many(
+        self, records: Iterable[Tuple[datetime.datetime, str, bytes]]
+    ) -> List[IndexEntry]:
+        """Append records of (time, kind, content); content must not contain newlines.
+
+        Returns:
+            Entries describing where each record was written.
+        """
+        records = list(records)
+        entries = []
+        if not records:
+            return entries
+        for _, kind, _ in records:
+            if len(kind) > KIND_LENGTH or not kind.isascii() or "\n" in kind:
+                raise ValueError(f"Invalid indexed log record kind '{kind}'")
+        with self._lock:
+            i = 0
+            while i < len(records):
+                if not self._segment_usable():
+                    self._open_segment()
+                n = min(
+                    len(records) - i,
+                    self.records_per_segment - self._segment_records,
+                )
+                data = []
+                index = []
+                for t, kind, content in records[i : i + n]:
+                    t_us = max(_to_us(t), 0)
+                    self._segment_max_us = max(self._segment_max_us, t_us)
+                    index.append(
+                        _INDEX_LINE_FORMAT.format(
+                            t_us,
+                            self._segment_max_us,
+                            self._segment_bytes,
+                            len(content),
+                            kind,
+                        )
+                    )
+                    entries.append(
+                        IndexEntry(
+                            time_us=t_us,
+                            kind=kind,
+                            data_path=self._data_path,
+                            offset=self._segment_bytes,
+                            length=len(content),
+                        )
+                    )
+                    data.append(content)
+                    data.append(b"\n")
+                    self._segment_bytes += len(content) + 1
+                # Write data before the index so readers never see index entries for missing data
+                os.write(self._data_fd, b"".join(data))
+                os.write(self._index_fd, "".join(index).encode("ascii"))
+                self._segment_records += n
+                self.records_written += n
+                i += n
+        return entries
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                self._close_segment()
+
+
+class BackgroundLogWriter(object):
+    """Appends records to an indexed log from a background thread so that callers do not wait for encoding or disk I/O.
+
+    Records are accumulated in a bounded queue and written in batches by a worker thread started lazily in each
+    process.  When the queue is full, callers wait up to block_timeout_s for space (counted in backpressure_count) and
+    the record is dropped if space does not become available (counted in dropped_count).  Queued records are flushed
+    when the process exits.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        encode: Callable[[Any], bytes],
+        max_queue_size: int = 10000,
+        max_batch_size: int = 500,
+        block_timeout_s: float = 0.1,
+        records_per_segment: int = 1000,
+    ):
+        """
+        Args:
+            path: Directory containing the indexed log.
+            encode: Function converting each queued content object to the bytes to store (without newlines).
+            max_queue_size: Maximum number of records waiting to be written.
+            max_batch_size: Maximum number of records written at once.
+            block_timeout_s: Maximum time to wait for space in a full queue before dropping a record.
+            records_per_segment: Number of records in each segment of the log.
+        """
+        self._writer = IndexedLogWriter(path, records_per_segment=records_per_segment)
+        self._encode = encode
+        self._max_queue_size = max_queue_size
+        self._max_batch_size = max_batch_size
+        self._block_timeout_s = block_timeout_s
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self.enqueued_count = 0
+        self.backpressure_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+    def _ensure_worker(self) -> queue.Queue:
+        if self._pid == os.getpid():
+            return self._queue
+        with self._lock:
+            if self._pid != os.getpid():
+                # Threads and queued records are not inherited by forked processes
+                self._queue = queue.Queue(maxsize=self._max_queue_size)
+                self._thread = threading.Thread(
+                    target=self._work,
+                    args=(self._queue,),
+                    name="BackgroundLogWriter",
+                    daemon=True,
+                )
+                self._thread.start()
+                if self._pid is None:
+                    atexit.register(self.close)
+                self._pid = os.getpid()
+        return self._queue
+
+    def append(self, t: datetime.datetime, kind: str, content: Any) -> bool:
+        """Queue a record to be encoded and appended to the log.
+
+        Returns:
+            True if the record was queued, False if it was dropped because the queue remained full.
+        """
+        q = self._ensure_worker()
+        record = (t, kind, content)
+        try:
+            q.put_nowait(record)
+        except queue.Full:
+            self.backpressure_count += 1
+            try:
+                q.put(record, timeout=self._block_timeout_s)
+            except queue.Full:
+                self.dropped_count += 1
+                logger.warning(
+                    "Dropped {} record in {} because the write queue was full ({} records dropped in total)",
+                    kind,
+                    self._writer.path,
+                    self.dropped_count,
+                )
+                return False
+        self.enqueued_count += 1
+        return True
+
+    def _work(self, q: queue.Queue) -> None:
+        while True:
+            batch = [q.get()]
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            records = []
+            for record in batch:
+                if record is None:
+                    continue
+                t, kind, content = record
+                try:
+                    records.append((t, kind, self._encode(content)))
+                except Exception as e:
+                    self.failed_count += 1
+                    logger.error(f"Could not encode {kind} record: {str(e)}")
+            try:
+                self._writer.append_many(records)
+            except Exception as e:
+                self.failed_count += len(records)
+                logger.error(
+                    f"Could not write {len(records)} records to {self._writer.path}: {str(e)}"
+                )
+            for _ in batch:
+                q.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Wait until all records queued by this process have been written."""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self, timeout_s: float = 10) -> None:
+        """Write all queued records and stop the worker thread of this process."""
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                return
+            self._queue.put(None)
+            self._thread.join(timeout=timeout_s)
+        self._writer.close()
+
+
+def _parse_index_line(line: bytes, data_path: str) -> Tuple[int, IndexEntry]:
+    fields = line.decode("ascii").split(" ", 4)
+    return int(fields[1]), IndexEntry(
+        time_us=int(fields[0]),
+        kind=fields[4].rstrip(),
+        data_path=data_path,
+        offset=int(fields[2]),
+        length=int(fields[3]),
+    )
+
+
+def _read_index_line(f, i: int, data_path: str) -> Tuple[int, IndexEntry]:
+    f.seek(i * INDEX_LINE_BYTES)
+    return _parse_index_line(f.read(INDEX_LINE_BYTES), data_path)
+
+
+def _segment_entries(
+    index_path: str, from_us: Optional[int]
+) -> Iterable[Tuple[int, IndexEntry]]:
+    data_path = index_path[0 : -len(INDEX_SUFFIX)] + DATA_SUFFIX
+    try:
+        f = open(index_path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        # Ignore any partially-written trailing line
+        n = os.fstat(f.fileno()).st_size // INDEX_LINE_BYTES
+        if n == 0:
+            return
+        lo = 0
+        if from_us is not None:
+            if _read_index_line(f, n - 1, data_path)[0] < from_us:
+                # No record in this segment is recent enough
+                return
+            # Find the first record whose running maximum time reaches from_us; all earlier records are too old
+            hi = n - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if _read_index_line(f, mid, data_path)[0] < from_us:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        f.seek(lo * INDEX_LINE_BYTES)
+        content = f.read((n - lo) * INDEX_LINE_BYTES)
+    for i in range(0, len(content), INDEX_LINE_BYTES):
+        yield _parse_index_line(content[i : i + INDEX_LINE_BYTES], data_path)
+
+
+def find(
+    path: str,
+    from_time: Optional[datetime.datetime] = None,
+    to_time: Optional[datetime.datetime] = None,
+    kinds: Optional[Set[str]] = None,
+) -> List[IndexEntry]:
+    """Find the records in the indexed log in a directory within a time range, in time order.
+
+    Args:
+        path: Directory containing the indexed log.
+        from_time: If specified, only find records at or after this time.
+        to_time: If specified, only find records at or before this time.
+        kinds: If specified, only find records of these kinds.
+
+    Returns:
+        Entries describing each matching record; use IndexEntry.read to retrieve content.
+    """
+    from_us = None if from_time is None else _to_us(from_time)
+    to_us = None if to_time is None else _to_us(to_time)
+    result = []
+    for name in sorted(os.listdir(path)):
+        if not name.endswith(INDEX_SUFFIX):
+            continue
+        for _, entry in _segment_entries(os.path.join(path, name), from_us):
+            if from_us is not None and entry.time_us < from_us:
+                continue
+            if to_us is not None and entry.time_us > to_us:
+                continue
+            if kinds is not None and entry.kind not in kinds:
+                continue
+            result.append(entry)
+    result.sort(key=lambda e: e.time_us)
+    return result
+
+
+def get(path: str, key: str) -> Optional[IndexEntry]:
+    """Retrieve the record with the specified key (see IndexEntry.key) in the indexed log in a directory, if any."""
+    segment, _, offset = key.partition(".")
+    if not _SEGMENT_NAME.match(segment) or not offset.isdigit():
+        return None
+    index_path = os.path.join(path, segment + INDEX_SUFFIX)
+    data_path = os.path.join(path, segment + DATA_SUFFIX)
+    offset = int(offset)
+    try:
+        f = open(index_path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        # Offsets increase monotonically within a segment
+        lo = 0
+        hi = os.fstat(f.fileno()).st_size // INDEX_LINE_BYTES
+        while lo < hi:
+            mid = (lo + hi) // 2
+            _, entry = _read_index_line(f, mid, data_path)
+            if entry.offset < offset:
+                lo = mid + 1
+            elif entry.offset > offset:
+                hi = mid
+            else:
+                return entry
+    return None
+
+
+def clear(path: str) -> int:
+    """Remove all segments of the indexed log in a directory, returning the number of files removed.
+
+    Writers start new segments when they next append.
+    """
+    n = 0
+    for name in os.listdir(path):
+        if name.endswith(DATA_SUFFIX) or name.endswith(INDEX_SUFFIX):
+            try:
+                os.remove(os.path.join(path, name))
+                n += 1
+            except FileNotFoundError:
+                pass
+    return n
+
+
+def iter_contents(entries: Iterable[IndexEntry]) -> Iterator[bytes]:
+    """Read the content of each of the entries in turn, opening each data file only once.
+
+    Entries in segments which no longer exist are skipped.
+    """
+    for _, content in iter_records(entries):
+        yield content
+
+
+def iter_records(entries: Iterable[IndexEntry]) -> Iterator[Tuple[IndexEntry, bytes]]:
+    """Read the content of each of the entries in turn, yielding each entry along with its content.
+
+    Entries in segments which no longer exist are skipped.
+    """
+    files = {}
+    try:
+        for entry in entries:
+            if entry.data_path not in files:
+                try:
+                    files[entry.data_path] = open(entry.data_path, "rb")
+                except FileNotFoundError:
+                    # The segment was removed after the entry was found
+                    files[entry.data_path] = None
+            f = files[entry.data_path]
+            if f is None:
+                continue
+            f.seek(entry.offset)
+            yield entry, f.read(entry.length)
+    finally:
+        for f in files.values():
+            if f is not None:
+                f.close()
@@ -0,0 +1,117 @@
+import datetime
+import os
+import threading
+
+from monitoring.monitorlib.indexed_log import (
+    INDEX_LINE_BYTES,
+    BackgroundLogWriter,
+    IndexedLogWriter,
+    clear,
+    find,
+    get,
+    iter_contents,
+)
+
+T0 = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+
+def _t(s: float) -> datetime.datetime:
+    return T0 + datetime.timedelta(seconds=s)
+
+
+def test_find_records_in_time_order(tmp_path):
+    path = str(tmp_path)
+    writer1 = IndexedLogWriter(path, records_per_segment=3)
+    writer2 = IndexedLogWriter(path, records_per_segment=3)
+    # Records are appended slightly out of time order
+    times1 = [0, 2, 1, 5, 4, 8, 7, 9]
+    times2 = [3, 6, 10]
+    writer1.append_many((_t(s), "odd" if s % 2 else "even", b"%d" % s) for s in times1)
+    for s in times2:
+        writer2.append(_t(s), "odd" if s % 2 else "even", b"%d" % s)
+    assert writer1.records_written == len(times1)
+    assert len([n for n in os.listdir(path) if n.endswith(".idx")]) == 3 + 1
+
+    entries = find(path)
+    assert [e.time for e in entries] == [_t(s) for s in range(11)]
+    assert list(iter_contents(entries)) == [b"%d" % s for s in range(11)]
+
+    entries = find(path, from_time=_t(4.5))
+    assert [e.read() for e in entries] == [b"5", b"6", b"7", b"8", b"9", b"10"]
+
+    entries = find(path, from_time=_t(2), to_time=_t(8), kinds={"odd"})
+    assert list(iter_contents(entries)) == [b"3", b"5", b"7"]
+
+    assert find(path, from_time=_t(11)) == []
+
+
+def test_writer_recovers_from_cleared_log(tmp_path):
+    path = str(tmp_path)
+    writer = IndexedLogWriter(path)
+    writer.append(_t(0), "a", b"first")
+    for name in os.listdir(path):
+        os.remove(os.path.join(path, name))
+    writer.append(_t(1), "a", b"second")
+    assert [e.read() for e in find(path)] == [b"second"]
+
+
+def test_partial_index_line_ignored(tmp_path):
+    path = str(tmp_path)
+    writer = IndexedLogWriter(path)
+    writer.append(_t(0), "a", b"complete")
+    (index_name,) = [n for n in os.listdir(path) if n.endswith(".idx")]
+    with open(os.path.join(path, index_name), "ab") as f:
+        f.write(b"0" * (INDEX_LINE_BYTES // 2))
+    assert [e.read() for e in find(path)] == [b"complete"]
+
+
+def test_background_writer_batches_and_drops(tmp_path):
+    path = str(tmp_path)
+    blocked = threading.Event()
+    release = threading.Event()
+
+    def encode(content: int) -> bytes:
+        if content == 0:
+            blocked.set()
+            release.wait(timeout=5)
+        return b"%d" % content
+
+    writer = BackgroundLogWriter(
+        path, encode=encode, max_queue_size=2, block_timeout_s=0.01
+    )
+    assert writer.append(_t(0), "n", 0)
+    assert blocked.wait(timeout=5)
+    # The worker is stuck encoding the first record, so the queue fills up
+    results = [writer.append(_t(s), "n", s) for s in range(1, 5)]
+    assert results == [True, True, False, False]
+    assert writer.backpressure_count == 2
+    assert writer.dropped_count == 2
+
+    release.set()
+    writer.flush()
+    assert [int(c) for c in iter_contents(find(path))] == [0, 1, 2]
+
+    writer.append(_t(3), "n", 3)
+    writer.close()
+    assert [int(c) for c in iter_contents(find(path))] == [0, 1, 2, 3]
+
+
+def test_get_and_clear(tmp_path):
+    path = str(tmp_path)
+    writer = IndexedLogWriter(path, records_per_segment=2)
+    written = writer.append_many((_t(s), "n", b"%d" % s) for s in range(5))
+
+    for e in written:
+        found = get(path, e.key)
+        assert found == e
+        assert found.read() == b"%d" % e.time.second
+    assert get(path, written[1].key + "1") is None
+    assert get(path, "../" + written[1].key) is None
+
+    assert clear(path) == 6
+    assert find(path) == []
+    assert get(path, written[0].key) is None
+
+    # The writer starts a new segment after the log is cleared
+    writer.append(_t(5), "n", b"5")
+    assert list(iter_contents(find(path))) == [b"5"]
@@ -1,9 +1,10 @@
 import asyncio
 import datetime
 import functools
+import threading
 import urllib.parse
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import jwt
 import requests
@@ -20,6 +21,7 @@ ALL_SCOPES = [
 
 EPOCH = datetime.datetime.fromtimestamp(0, datetime.UTC)
 TOKEN_REFRESH_MARGIN = datetime.timedelta(seconds=15)
+TOKEN_BACKGROUND_REFRESH_MARGIN = datetime.timedelta(seconds=60)
 CLIENT_TIMEOUT = 10  # seconds
 
 
@@ -27,34 +29,171 @@ AuthSpec = str
 """Specification for means by which to obtain access tokens."""
 
 
+class _TokenIssuance(object):
+    """A single in-flight request for a token, shared by all callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.token: Optional[str] = None
+        self.error: Optional[Exception] = None
+
+
 class AuthAdapter(object):
-    """Base class for an adapter that add JWTs to requests."""
+    """Base class for an adapter that add JWTs to requests.
+
+    Tokens are cached per audience and scope set along with their expiration time
+    (so a token is only decoded once, when it is issued).  A token close to
+    expiration is refreshed in the background while the cached token is still
+    served, and a token that is missing or about to expire is issued only once
+    regardless of how many threads (or coroutines) request it concurrently.
+    """
 
     def __init__(self):
-        self._tokens = {}
+        self._tokens: Dict[str, Dict[str, str]] = {}
+        self._token_expirations: Dict[Tuple[str, str], datetime.datetime] = {}
+        self._issuances: Dict[Tuple[str, str], _TokenIssuance] = {}
+        self._tokens_lock = threading.Lock()
 
     def issue_token(self, intended_audience: str, scopes: List[str]) -> str:
         """Subclasses must return a bearer token for the given audience."""
 
         raise NotImplementedError()
 
-    def get_headers(self, url: str, scopes: List[str] = None) -> Dict[str, str]:
+    def _cached_token(
+        self, intended_audience: str, scope_string: str
+    ) -> Tuple[Optional[str], bool]:
+        """Retrieve the cached token, if usable, and whether it should be refreshed.
+
+        Must be called while holding self._tokens_lock.
+        """
+        expires = self._token_expirations.get((intended_audience, scope_string))
+        if expires is None:
+            return None, True
+        now = datetime.datetime.now(datetime.UTC)
+        if now > expires - TOKEN_REFRESH_MARGIN:
+            return None, True
+        token = self._tokens[intended_audience][scope_string]
+        return token, now > expires - TOKEN_BACKGROUND_REFRESH_MARGIN
+
+    def _issue_and_cache(
+        self,
+        intended_audience: str,
+        scopes: List[str],
+        scope_string: str,
+        issuance: _TokenIssuance,
+    ) -> None:
+        key = (intended_audience, scope_string)
+        try:
+            token = self.issue_token(intended_audience, scopes)
+            payload = jwt.decode(token, options={"verify_signature": False})
+            expires = EPOCH + datetime.timedelta(seconds=payload["exp"])
+            with self._tokens_lock:
+                self._tokens.setdefault(intended_audience, {})[scope_string] = token
+                self._token_expirations[key] = expires
+            issuance.token = token
+        except Exception as e:
+            issuance.error = e
+        finally:
+            with self._tokens_lock:
+                if self._issuances.get(key) is issuance:
+                    del self._issuances[key]
+            issuance.done.set()
+
+    def _start_issuance(
+        self, intended_audience: str, scopes: List[str], scope_string: str
+    ) -> Tuple[_TokenIssuance, bool]:
+        """Retrieve the in-flight issuance for the token, creating one if necessary.
+
+        Must be called while holding self._tokens_lock.
+
+        Returns:
+            * Issuance for the requested token
+            * True if the caller created the issuance and is responsible for performing it
+        """
+        key = (intended_audience, scope_string)
+        issuance = self._issuances.get(key)
+        if issuance is not None:
+            return issuance, False
+        issuance = _TokenIssuance()
+        self._issuances[key] = issuance
+        return issuance, True
+
+    def _get_token(
+        self, intended_audience: str, scopes: List[str], scope_string: str
+    ) -> Tuple[Optional[str], Optional[_TokenIssuance], bool]:
+        """Retrieve a usable cached token or the issuance that will provide one.
+
+        Schedules a background refresh when the cached token is near expiration.
+
+        Returns:
+            * Cached token, if usable
+            * Issuance to wait on if no usable token is cached
+            * True if the caller is responsible for performing the issuance
+        """
+        with self._tokens_lock:
+            token, refresh = self._cached_token(intended_audience, scope_string)
+            if not refresh:
+                return token, None, False
+            issuance, owner = self._start_issuance(
+                intended_audience, scopes, scope_string
+            )
+        if token is not None:
+            if owner:
+                threading.Thread(
+                    target=self._issue_and_cache,
+                    args=(intended_audience, scopes, scope_string, issuance),
+                    daemon=True,
+                ).start()
+            return token, None, False
+        return None, issuance, owner
+
+    @staticmethod
+    def _normalize_request(url: str, scopes: Optional[List[str]]):
         if scopes is None:
             scopes = ALL_SCOPES
         scopes = [s.value if isinstance(s, Enum) else s for s in scopes]
         intended_audience = urllib.parse.urlparse(url).hostname
-        scope_string = " ".join(scopes)
-        if intended_audience not in self._tokens:
-            self._tokens[intended_audience] = {}
-        if scope_string not in self._tokens[intended_audience]:
-            token = self.issue_token(intended_audience, scopes)
-        else:
-            token = self._tokens[intended_audience][scope_string]
-        payload = jwt.decode(token, options={"verify_signature": False})
-        expires = EPOCH + datetime.timedelta(seconds=payload["exp"])
-        if datetime.datetime.now(datetime.UTC) > expires - TOKEN_REFRESH_MARGIN:
-            token = self.issue_token(intended_audience, scopes)
-        self._tokens[intended_audience][scope_string] = token
+        return intended_audience, scopes, " ".join(scopes)
+
+    @staticmethod
+    def _issued_token(issuance: _TokenIssuance) -> str:
+        if issuance.error is not None:
+            raise issuance.error
+        return issuance.token
+
+    def get_headers(self, url: str, scopes: List[str] = None) -> Dict[str, str]:
+        intended_audience, scopes, scope_string = self._normalize_request(url, scopes)
+        token, issuance, owner = self._get_token(
+            intended_audience, scopes, scope_string
+        )
+        if token is None:
+            if owner:
+                self._issue_and_cache(intended_audience, scopes, scope_string, issuance)
+            else:
+                issuance.done.wait()
+            token = self._issued_token(issuance)
+        return {"Authorization": "Bearer " + token}
+
+    async def get_headers_async(
+        self, url: str, scopes: List[str] = None
+    ) -> Dict[str, str]:
+        """Like get_headers, but any token issuance does not block the event loop."""
+        intended_audience, scopes, scope_string = self._normalize_request(url, scopes)
+        token, issuance, owner = self._get_token(
+            intended_audience, scopes, scope_string
+        )
+        if token is None:
+            if owner:
+                await asyncio.to_thread(
+                    self._issue_and_cache,
+                    intended_audience,
+                    scopes,
+                    scope_string,
+                    issuance,
+                )
+            else:
+                await asyncio.to_thread(issuance.done.wait)
+            token = self._issued_token(issuance)
         return {"Authorization": "Bearer " + token}
 
     def add_headers(self, request: requests.PreparedRequest, scopes: List[str]):
@@ -63,11 +202,16 @@ class AuthAdapter(object):
 
     def get_sub(self) -> Optional[str]:
         """Retrieve `sub` claim from one of the existing tokens"""
-        for _, tokens_by_scope in self._tokens.items():
-            for token in tokens_by_scope.values():
-                payload = jwt.decode(token, options={"verify_signature": False})
-                if "sub" in payload:
-                    return payload["sub"]
+        with self._tokens_lock:
+            tokens = [
+                token
+                for tokens_by_scope in self._tokens.values()
+                for token in tokens_by_scope.values()
+            ]
+        for token in tokens:
+            payload = jwt.decode(token, options={"verify_signature": False})
+            if "sub" in payload:
+                return payload["sub"]
         return None
 
 
@@ -166,7 +310,7 @@ class AsyncUTMTestSession:
         loop = asyncio.get_event_loop()
         loop.run_until_complete(self._client.close())
 
-    def adjust_request_kwargs(self, url, method, kwargs):
+    async def adjust_request_kwargs(self, url, method, kwargs):
         if self.auth_adapter:
             scopes = None
             if "scopes" in kwargs:
@@ -182,7 +326,8 @@ class AsyncUTMTestSession:
                     "All tests must specify auth scope for all session requests.  Either specify as an argument for each individual HTTP call, or decorate the test with @default_scope."
                 )
             headers = {}
-            for k, v in self.auth_adapter.get_headers(url, scopes).items():
+            auth_headers = await self.auth_adapter.get_headers_async(url, scopes)
+            for k, v in auth_headers.items():
                 headers[k] = v
             kwargs["headers"] = headers
             if method == "PUT" and kwargs.get("data"):
@@ -196,7 +341,7 @@ class AsyncUTMTestSession:
         """Returns (status, headers, json)"""
         url = self._prefix_url + url
         if "auth" not in kwargs:
-            kwargs = self.adjust_request_kwargs(url, "PUT", kwargs)
+            kwargs = await self.adjust_request_kwargs(url, "PUT", kwargs)
         async with self._client.put(url, **kwargs) as response:
             return (
                 response.status,
@@ -208,7 +353,7 @@ class AsyncUTMTestSession:
         """Returns (status, headers, json)"""
         url = self._prefix_url + url
         if "auth" not in kwargs:
-            kwargs = self.adjust_request_kwargs(url, "GET", kwargs)
+            kwargs = await self.adjust_request_kwargs(url, "GET", kwargs)
         async with self._client.get(url, **kwargs) as response:
             return (
                 response.status,
@@ -220,7 +365,7 @@ class AsyncUTMTestSession:
         """Returns (status, headers, json)"""
         url = self._prefix_url + url
         if "auth" not in kwargs:
-            kwargs = self.adjust_request_kwargs(url, "POST", kwargs)
+            kwargs = await self.adjust_request_kwargs(url, "POST", kwargs)
         async with self._client.post(url, **kwargs) as response:
             return (
                 response.status,
@@ -232,7 +377,7 @@ class AsyncUTMTestSession:
         """Returns (status, headers, json)"""
         url = self._prefix_url + url
         if "auth" not in kwargs:
-            kwargs = self.adjust_request_kwargs(url, "DELETE", kwargs)
+            kwargs = await self.adjust_request_kwargs(url, "DELETE", kwargs)
         async with self._client.delete(url, **kwargs) as response:
             return (
                 response.status,
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import jwt
+
+from monitoring.monitorlib import infrastructure
+
+
+class _CountingAuth(infrastructure.AuthAdapter):
+    def __init__(self, expiration_s: int = 3600, delay_s: float = 0):
+        super().__init__()
+        self.issued = 0
+        self._expiration_s = expiration_s
+        self._delay_s = delay_s
+        self._count_lock = threading.Lock()
+
+    def issue_token(self, intended_audience: str, scopes: List[str]) -> str:
+        with self._count_lock:
+            self.issued += 1
+            jti = self.issued
+        time.sleep(self._delay_s)
+        claims = {
+            "sub": "uss_counting",
+            "aud": intended_audience,
+            "scope": " ".join(scopes),
+            "exp": int(time.time()) + self._expiration_s,
+            "jti": str(jti),
+        }
+        return jwt.encode(claims, "secret", algorithm="HS256")
+
+
+def test_tokens_are_cached_per_audience_and_scope():
+    adapter = _CountingAuth()
+    h1 = adapter.get_headers("https://a.example.com/foo", ["scope1"])
+    h2 = adapter.get_headers("https://a.example.com/bar", ["scope1"])
+    assert h1 == h2
+    assert adapter.issued == 1
+
+    adapter.get_headers("https://a.example.com/foo", ["scope2"])
+    adapter.get_headers("https://b.example.com/foo", ["scope1"])
+    assert adapter.issued == 3
+    assert adapter.get_sub() == "uss_counting"
+
+
+def test_concurrent_callers_share_issuance():
+    adapter = _CountingAuth(delay_s=0.2)
+    results = []
+
+    def get():
+        results.append(adapter.get_headers("https://a.example.com", ["scope1"]))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert adapter.issued == 1
+    assert len(results) == 8
+    assert all(r == results[0] for r in results)
+
+    async def get_many():
+        return await asyncio.gather(
+            *[
+                adapter.get_headers_async("https://b.example.com", ["scope1"])
+                for _ in range(8)
+            ]
+        )
+
+    async_results = asyncio.run(get_many())
+    assert adapter.issued == 2
+    assert all(r == async_results[0] for r in async_results)
+
+
+def test_token_near_expiration_refreshed_in_background():
+    expiration_s = int(infrastructure.TOKEN_BACKGROUND_REFRESH_MARGIN.total_seconds())
+    adapter = _CountingAuth(expiration_s=expiration_s)
+    h1 = adapter.get_headers("https://a.example.com", ["scope1"])
+    assert adapter.issued == 1
+
+    # Cached token is still served while the refresh happens in the background
+    h2 = adapter.get_headers("https://a.example.com", ["scope1"])
+    assert h2 == h1
+    for _ in range(100):
+        if adapter.issued == 2 and not adapter._issuances:
+            break
+        time.sleep(0.01)
+    assert adapter.issued == 2
+    assert adapter.get_headers("https://a.example.com", ["scope1"]) != h1
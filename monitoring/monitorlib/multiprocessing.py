@@ -1,7 +1,10 @@
 import json
 import multiprocessing
 import multiprocessing.shared_memory
-from typing import Any, Callable, Optional
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class SynchronizedValue(object):
@@ -105,3 +108,290 @@ class SynchronizedValue(object):
                 self._set_value(self._current_value)
         finally:
             self._lock.__exit__(exc_type, exc_val, exc_tb)
+
+
+class KeyedTransaction(object):
+    """Transaction on a single key of a SynchronizedKeyedValues.
+
+    .value is the value for the key when the transaction started (None if the key did not exist), and it may be mutated
+    or replaced.  Assigning .value creates the key if it did not exist, and .delete() removes the key when the
+    transaction is committed.
+    """
+
+    key: str
+    _value: Any
+    _exists: bool
+
+    def __init__(self, key: str, value: Any, exists: bool):
+        self.key = key
+        self._value = value
+        self._exists = exists
+
+    @property
+    def exists(self) -> bool:
+        return self._exists
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+        self._exists = True
+
+    def delete(self) -> None:
+        self._value = None
+        self._exists = False
+
+
+class SynchronizedKeyedValues(object):
+    """Represents a collection of keyed values synchronized across multiple processes.
+
+    Unlike SynchronizedValue, each value is stored as a separate record in shared memory, so a transaction only encodes
+    and decodes the value for the key it concerns.  Keys are distributed among shards, and each shard has its own lock,
+    so transactions on keys in different shards do not block each other.  Every record carries a version; each process
+    keeps the values it has decoded and only decodes a record again when its version changes.  Example:
+
+    db = SynchronizedKeyedValues()
+    with db.transact('foo') as tx:
+        assert tx.value is None
+        tx.value = {'bar': 'baz'}
+    print(json.dumps(db.get('foo')))
+        >  {"bar":"baz"}
+
+    Values obtained outside a transaction (get, items, values) may be shared with other readers in the same process and
+    must not be mutated; use transact to change a value.
+
+    A transaction may also wait until the value for its key satisfies a condition (for instance, that the value is not
+    marked as being used by another process); waiters are woken up as soon as a change is committed in their shard.
+    """
+
+    WAIT_SLICE_S = 0.01
+    """Maximum number of seconds to block while waiting for a change before letting other greenlets/threads in this
+    process run (the change may need to be made by one of them)."""
+
+    _locks: List[multiprocessing.RLock]
+    _conditions: List[multiprocessing.Condition]
+    _indices: List[SynchronizedValue]
+    _data: List[multiprocessing.shared_memory.SharedMemory]
+    _encoder: Callable[[Any], bytes]
+    _decoder: Callable[[bytes], Any]
+    _cache: Dict[str, Tuple[int, Any]]
+
+    def __init__(
+        self,
+        capacity_bytes: int = 10e6,
+        shard_count: int = 16,
+        index_capacity_bytes: int = 1e6,
+        encoder: Optional[Callable[[Any], bytes]] = None,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+    ):
+        """Creates an empty collection of keyed values synchronized across multiple processes.
+
+        :param capacity_bytes: Maximum number of bytes required to represent all values, distributed evenly among shards
+        :param shard_count: Number of independently-locked shards among which keys are distributed
+        :param index_capacity_bytes: Maximum number of bytes required to represent the keys and record locations, distributed evenly among shards
+        :param encoder: Function that converts a single value into bytes
+        :param decoder: Function that converts bytes into a single value
+        """
+        self._locks = [multiprocessing.RLock() for _ in range(shard_count)]
+        self._conditions = [multiprocessing.Condition(lock) for lock in self._locks]
+        self._indices = [
+            SynchronizedValue(
+                {"next_version": 1, "data_end": 0, "records": {}},
+                capacity_bytes=index_capacity_bytes / shard_count,
+            )
+            for _ in range(shard_count)
+        ]
+        self._data = [
+            multiprocessing.shared_memory.SharedMemory(
+                create=True, size=int(capacity_bytes / shard_count)
+            )
+            for _ in range(shard_count)
+        ]
+        self._encoder = (
+            encoder
+            if encoder is not None
+            else lambda obj: json.dumps(obj).encode("utf-8")
+        )
+        self._decoder = (
+            decoder if decoder is not None else lambda b: json.loads(b.decode("utf-8"))
+        )
+        self._cache = {}
+
+    def _shard_of(self, key: str) -> int:
+        # Python's built-in hash is salted per interpreter, so use a stable hash instead
+        return zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+    def _read_record(self, shard: int, record: List[int]) -> bytes:
+        _, offset, length = record
+        return bytes(self._data[shard].buf[offset : offset + length])
+
+    def _decode_record(self, shard: int, key: str, record: List[int]) -> Any:
+        version = record[0]
+        cached = self._cache.get(key, None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = self._decoder(self._read_record(shard, record))
+        self._cache[key] = (version, value)
+        return value
+
+    def _write_record(self, shard: int, index: dict, key: str, content: bytes):
+        records = index["records"]
+        data = self._data[shard]
+        live_len = len(content) + sum(
+            record[2] for k, record in records.items() if k != key
+        )
+        if live_len > data.size:
+            raise RuntimeError(
+                "Tried to write {} bytes into a SynchronizedKeyedValues shard with only {} bytes of capacity".format(
+                    live_len, data.size
+                )
+            )
+        new_end = index["data_end"] + len(content)
+        if new_end > data.size or new_end - live_len > live_len:
+            # Compact the data in this shard by dropping superseded records, either because there is no room left or
+            # because superseded records would outweigh live ones; the latter keeps the touched (and therefore
+            # resident) portion of the shard within twice the size of its live records.
+            live = {
+                k: self._read_record(shard, record)
+                for k, record in records.items()
+                if k != key
+            }
+            offset = 0
+            for k, b in live.items():
+                data.buf[offset : offset + len(b)] = b
+                records[k] = [records[k][0], offset, len(b)]
+                offset += len(b)
+            index["data_end"] = offset
+        offset = index["data_end"]
+        data.buf[offset : offset + len(content)] = content
+        records[key] = [index["next_version"], offset, len(content)]
+        index["next_version"] += 1
+        index["data_end"] = offset + len(content)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        shard = self._shard_of(key)
+        with self._locks[shard]:
+            record = self._indices[shard].value["records"].get(key, None)
+            if record is None:
+                self._cache.pop(key, None)
+                return default
+            return self._decode_record(shard, key, record)
+
+    def __contains__(self, key: str) -> bool:
+        shard = self._shard_of(key)
+        with self._locks[shard]:
+            return key in self._indices[shard].value["records"]
+
+    def keys(self) -> List[str]:
+        result = []
+        for shard in range(len(self._locks)):
+            with self._locks[shard]:
+                result.extend(self._indices[shard].value["records"])
+        return result
+
+    def items(self) -> List[Tuple[str, Any]]:
+        result = []
+        for shard in range(len(self._locks)):
+            with self._locks[shard]:
+                records = self._indices[shard].value["records"]
+                for key in [
+                    k
+                    for k in self._cache
+                    if k not in records and self._shard_of(k) == shard
+                ]:
+                    del self._cache[key]
+                result.extend(
+                    (key, self._decode_record(shard, key, record))
+                    for key, record in records.items()
+                )
+        return result
+
+    def values(self) -> List[Any]:
+        return [v for _, v in self.items()]
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def _peek(self, shard: int, key: str) -> KeyedTransaction:
+        record = self._indices[shard].value["records"].get(key, None)
+        if record is None:
+            return KeyedTransaction(key, None, False)
+        return KeyedTransaction(key, self._decode_record(shard, key, record), True)
+
+    @contextmanager
+    def transact(
+        self,
+        key: str,
+        wait_until: Optional[Callable[[KeyedTransaction], bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[KeyedTransaction]:
+        """Creates a transaction on the value for the specified key.
+
+        The value (None if the key does not exist) is decoded afresh for the transaction and committed when the `with`
+        block is exited without an exception.  Only transactions on keys in the same shard are blocked meanwhile.
+        Example:
+
+        with db.transact('foo') as tx:
+            if tx.exists:
+                tx.value['bar'] = 'baz'
+
+        :param key: Key of the value to transact on
+        :param wait_until: If specified, do not start the transaction until this function returns True for the current state of the key (this function must not mutate its argument)
+        :param timeout: Maximum number of seconds to wait for wait_until to be satisfied; wait indefinitely if None
+        :raises TimeoutError: When wait_until was not satisfied within timeout
+        """
+        shard = self._shard_of(key)
+        lock = self._locks[shard]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        lock.acquire()
+        try:
+            while wait_until is not None and not wait_until(self._peek(shard, key)):
+                wait_s = self.WAIT_SLICE_S
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"Condition for key {key} was not satisfied within {timeout} seconds"
+                        )
+                    wait_s = min(wait_s, remaining)
+                if not self._conditions[shard].wait(wait_s):
+                    # The change we are waiting for may need to be made by another greenlet/thread in this process, so
+                    # release the lock and let it run
+                    lock.release()
+                    try:
+                        time.sleep(0)
+                    finally:
+                        lock.acquire()
+
+            with self._indices[shard] as index:
+                record = index["records"].get(key, None)
+                if record is None:
+                    old_content = None
+                    tx = KeyedTransaction(key, None, False)
+                else:
+                    old_content = self._read_record(shard, record)
+                    tx = KeyedTransaction(key, self._decoder(old_content), True)
+                yield tx
+                if tx.exists:
+                    content = self._encoder(tx.value)
+                    if content != old_content:
+                        self._write_record(shard, index, key, content)
+                        self._conditions[shard].notify_all()
+                elif record is not None:
+                    del index["records"][key]
+                    self._cache.pop(key, None)
+                    self._conditions[shard].notify_all()
+        finally:
+            lock.release()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Removes the specified key, returning its value or `default` if it did not exist."""
+        with self.transact(key) as tx:
+            if not tx.exists:
+                return default
+            value = tx.value
+            tx.delete()
+        return value
@@ -0,0 +1,106 @@
+import multiprocessing
+import time
+
+import pytest
+
+from monitoring.monitorlib.multiprocessing import SynchronizedKeyedValues
+
+
+def _set_in_child(db: SynchronizedKeyedValues, key: str, value: dict):
+    with db.transact(key) as tx:
+        tx.value = value
+
+
+def _release_in_child(db: SynchronizedKeyedValues, key: str, delay_s: float):
+    time.sleep(delay_s)
+    with db.transact(key) as tx:
+        tx.value["locked"] = False
+
+
+def test_keyed_values_transactions():
+    db = SynchronizedKeyedValues(capacity_bytes=16e3, shard_count=4)
+    assert db.get("foo") is None
+    assert "foo" not in db
+
+    with db.transact("foo") as tx:
+        assert not tx.exists
+        tx.value = {"bar": "baz"}
+    assert db.get("foo") == {"bar": "baz"}
+
+    with db.transact("foo") as tx:
+        assert tx.exists
+        tx.value["bar"] = "qux"
+    assert db.get("foo") == {"bar": "qux"}
+
+    try:
+        with db.transact("foo") as tx:
+            tx.value["bar"] = "discarded"
+            raise ValueError()
+    except ValueError:
+        pass
+    assert db.get("foo") == {"bar": "qux"}
+
+    assert db.pop("foo") == {"bar": "qux"}
+    assert db.pop("foo", "missing") == "missing"
+    assert len(db) == 0
+
+
+def test_keyed_values_compaction():
+    db = SynchronizedKeyedValues(capacity_bytes=400, shard_count=1)
+    for i in range(100):
+        with db.transact(f"key{i % 3}") as tx:
+            tx.value = {"i": i}
+    assert sorted(db.items()) == [
+        ("key0", {"i": 99}),
+        ("key1", {"i": 97}),
+        ("key2", {"i": 98}),
+    ]
+
+
+def test_keyed_values_overwrites_stay_compact():
+    db = SynchronizedKeyedValues(capacity_bytes=1e6, shard_count=1)
+    for i in range(1000):
+        with db.transact("key") as tx:
+            tx.value = {"i": i, "payload": "x" * (i % 50)}
+        data_end = db._indices[0].value["data_end"]
+        latest_len = db._indices[0].value["records"]["key"][2]
+        assert data_end <= 2 * latest_len
+    assert db.get("key") == {"i": 999, "payload": "x" * 49}
+
+
+def test_keyed_values_across_processes():
+    db = SynchronizedKeyedValues(capacity_bytes=16e3, shard_count=4)
+    with db.transact("foo") as tx:
+        tx.value = {"v": 1}
+    assert db.get("foo") == {"v": 1}
+
+    ctx = multiprocessing.get_context("fork")
+    p = ctx.Process(target=_set_in_child, args=(db, "foo", {"v": 2}))
+    p.start()
+    p.join()
+    assert db.get("foo") == {"v": 2}
+    assert db.keys() == ["foo"]
+
+
+def test_keyed_values_wait_until():
+    db = SynchronizedKeyedValues(capacity_bytes=16e3, shard_count=4)
+    with db.transact("foo") as tx:
+        tx.value = {"locked": True}
+
+    def unlocked(tx) -> bool:
+        return tx.exists and not tx.value["locked"]
+
+    with pytest.raises(TimeoutError):
+        with db.transact("foo", wait_until=unlocked, timeout=0.1):
+            pass
+
+    ctx = multiprocessing.get_context("fork")
+    p = ctx.Process(target=_release_in_child, args=(db, "foo", 0.2))
+    p.start()
+    t0 = time.monotonic()
+    with db.transact("foo", wait_until=unlocked, timeout=5) as tx:
+        assert not tx.value["locked"]
+        tx.value["locked"] = True
+    assert time.monotonic() - t0 < 1
+    p.join()
+    assert db.get("foo") == {"locked": True}
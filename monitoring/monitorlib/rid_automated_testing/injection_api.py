@@ -1,7 +1,9 @@
+import bisect
 import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
 import arrow
+import numpy as np
 import s2sphere
 from uas_standards.astm.f3411.v22a.api import UASID
 from uas_standards.interuss.automated_testing.rid.v1 import injection
@@ -226,6 +228,100 @@ class TestFlight(injection.TestFlight):
         return (len(self.telemetry) - 1) / (end - start).seconds
 
 
+class IndexedFlight(object):
+    """Injected test flight with its telemetry stored in time-sorted columns for fast searches."""
+
+    flight: TestFlight
+    """Original injected flight."""
+
+    states: List[RIDAircraftState]
+    """Telemetry of the flight, sorted by timestamp."""
+
+    timestamps: List[float]
+    """POSIX timestamp of each entry in `states`."""
+
+    lats: np.ndarray
+    """Latitude (radians) of each entry in `states`."""
+
+    lngs: np.ndarray
+    """Longitude (radians) of each entry in `states`."""
+
+    alts: np.ndarray
+    """Altitude of each entry in `states`."""
+
+    details_times: List[float]
+    """POSIX timestamp at which each entry in `details` becomes effective, in increasing order."""
+
+    details: List[RIDFlightDetails]
+    """Details of the flight, in the order they become effective."""
+
+    details_ids: Set[str]
+    """IDs this flight may be reported with, per any of its details."""
+
+    def __init__(self, flight: TestFlight):
+        self.flight = flight
+        self.states = sorted(flight.telemetry, key=lambda s: s.timestamp.datetime)
+        self.timestamps = [s.timestamp.datetime.timestamp() for s in self.states]
+        self.lats = np.radians([s.position.lat for s in self.states])
+        self.lngs = np.radians([s.position.lng for s in self.states])
+        self.alts = np.array([s.position.alt for s in self.states], dtype=float)
+
+        responses = sorted(
+            (
+                (arrow.get(r.effective_after).datetime.timestamp(), i, r.details)
+                for i, r in enumerate(flight.details_responses)
+            ),
+            key=lambda r: r[0:2],
+        )
+        self.details_times = []
+        self.details = []
+        for t, _, details in responses:
+            if self.details_times and self.details_times[-1] == t:
+                # Like TestFlight.get_details, the first response at a given time prevails
+                continue
+            self.details_times.append(t)
+            self.details.append(details)
+        self.details_ids = {d.id for d in self.details if "id" in d and d.id}
+
+    def get_details(self, t_now: datetime.datetime) -> Optional[RIDFlightDetails]:
+        """Equivalent to TestFlight.get_details, in logarithmic time."""
+        i = bisect.bisect_right(self.details_times, t_now.timestamp())
+        return self.details[i - 1] if i > 0 else None
+
+    def select_relevant_states(
+        self, view: s2sphere.LatLngRect, t0: datetime.datetime, t1: datetime.datetime
+    ) -> List[RIDAircraftState]:
+        """Select the telemetry between t0 and t1 (inclusive) that is relevant to the view.
+
+        Relevant telemetry is within the view, or immediately adjacent (in time) to
+        telemetry within the view so that the flight path can be drawn in and out of
+        the view.  The result is sorted by timestamp.
+        """
+        i0 = bisect.bisect_left(self.timestamps, t0.timestamp())
+        i1 = bisect.bisect_right(self.timestamps, t1.timestamp())
+        if i0 >= i1:
+            return []
+
+        inside = _contains(view, self.lats[i0:i1], self.lngs[i0:i1])
+        relevant = inside.copy()
+        relevant[:-1] |= inside[1:]  # Last point outside before entering view
+        relevant[1:] |= inside[:-1]  # First point outside after leaving view
+        return [self.states[i0 + i] for i in np.flatnonzero(relevant)]
+
+
+def _contains(view: s2sphere.LatLngRect, lats: np.ndarray, lngs: np.ndarray):
+    """Vectorized equivalent of view.contains for points in radians."""
+    if view.is_empty():
+        return np.zeros(lats.shape, dtype=bool)
+    result = (lats >= view.lat().lo()) & (lats <= view.lat().hi())
+    lng = view.lng()
+    if lng.is_full():
+        return result
+    if lng.is_inverted():
+        return result & ((lngs >= lng.lo()) | (lngs <= lng.hi()))
+    return result & (lngs >= lng.lo()) & (lngs <= lng.hi())
+
+
 class CreateTestParameters(injection.CreateTestParameters):
     def get_span(
         self,
@@ -0,0 +1,110 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import s2sphere
+from implicitdict import ImplicitDict, StringBasedDateTime
+
+from monitoring.monitorlib.rid_automated_testing.injection_api import (
+    IndexedFlight,
+    TestFlight,
+)
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _make_flight(rng: random.Random) -> TestFlight:
+    telemetry = []
+    lat = 46.5
+    lng = 7.5
+    for i in range(300):
+        lat += rng.uniform(-0.001, 0.001)
+        lng += rng.uniform(-0.001, 0.001)
+        telemetry.append(
+            {
+                "timestamp": StringBasedDateTime(T0 + timedelta(seconds=i)),
+                "timestamp_accuracy": 0,
+                "position": {"lat": lat, "lng": lng, "alt": 500},
+                "track": 0,
+                "speed": 1,
+                "speed_accuracy": "SA3mps",
+                "vertical_speed": 0,
+            }
+        )
+    rng.shuffle(telemetry)
+    return ImplicitDict.parse(
+        {"injection_id": "flight", "telemetry": telemetry, "details_responses": []},
+        TestFlight,
+    )
+
+
+def _expected_states(flight: TestFlight, view, t0, t1):
+    # TestFlight.select_relevant_states may list the same point twice when the
+    # flight briefly leaves and re-enters the view
+    flight.order_telemetry()
+    result = []
+    for state in flight.select_relevant_states(view, t0, t1):
+        if not result or result[-1] is not state:
+            result.append(state)
+    return result
+
+
+def test_select_relevant_states_matches_test_flight():
+    rng = random.Random(12345)
+    flight = _make_flight(rng)
+    indexed = IndexedFlight(flight)
+
+    for _ in range(100):
+        # Select a view and time window that contain at least one telemetry point
+        center = rng.choice(flight.telemetry)
+        t0 = center.timestamp.datetime - timedelta(seconds=rng.uniform(0, 40))
+        t1 = center.timestamp.datetime + timedelta(seconds=rng.uniform(0, 20))
+        size = rng.uniform(0, 0.005)
+        lat = center.position.lat - rng.uniform(0, size)
+        lng = center.position.lng - rng.uniform(0, size)
+        view = s2sphere.LatLngRect.from_point_pair(
+            s2sphere.LatLng.from_degrees(lat, lng),
+            s2sphere.LatLng.from_degrees(lat + size, lng + size),
+        )
+        expected = _expected_states(flight, view, t0, t1)
+        actual = indexed.select_relevant_states(view, t0, t1)
+        assert actual
+        assert [s.timestamp.datetime for s in actual] == [
+            s.timestamp.datetime for s in expected
+        ]
+
+
+def test_get_details_matches_test_flight():
+    rng = random.Random(12345)
+    flight = _make_flight(rng)
+    details_responses = []
+    for i in range(20):
+        effective_after = T0 + timedelta(seconds=rng.randint(0, 10) * 30)
+        details_responses.append(
+            {
+                "effective_after": StringBasedDateTime(effective_after),
+                "details": {
+                    "id": f"flight{i % 3}",
+                    "operator_id": f"op{i}",
+                    "uas_id": {"serial_number": "", "registration_id": ""},
+                },
+            }
+        )
+    flight = ImplicitDict.parse(
+        {
+            "injection_id": "flight",
+            "telemetry": flight.telemetry,
+            "details_responses": details_responses,
+        },
+        TestFlight,
+    )
+    indexed = IndexedFlight(flight)
+    assert indexed.details_ids == {"flight0", "flight1", "flight2"}
+
+    for s in range(-10, 320, 5):
+        t = T0 + timedelta(seconds=s)
+        expected = flight.get_details(t)
+        actual = indexed.get_details(t)
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual.operator_id == expected.operator_id
@@ -121,6 +121,16 @@ class TestSuiteActionSelectionCondition(ImplicitDict):
     """Do not select actions selected by any of these conditions, even when they are selected by one or more conditions above."""
 
 
+class ConcurrentExecutionConfiguration(ImplicitDict):
+    concurrent_action_when: List[TestSuiteActionSelectionCondition]
+    """Actions selected by ANY of these conditions are declared safe to run concurrently with adjacent sibling actions that are also selected (e.g., because they involve disjoint participants and resources).
+
+    Reports of concurrent actions are still recorded in the order the actions were declared.  When an nth_instance condition is evaluated for an action within one of these concurrent actions, matching actions within the other actions of the same concurrent group are not counted (the concurrent actions themselves are), so that the selected instances do not depend on timing."""
+
+    max_workers: int = 4
+    """Maximum number of adjacent concurrent actions to run at the same time."""
+
+
 class ExecutionConfiguration(ImplicitDict):
     include_action_when: Optional[List[TestSuiteActionSelectionCondition]] = None
     """If specified, only execute test actions if they are selected by ANY of these conditions (and not selected by any of the `skip_when` conditions)."""
@@ -134,6 +144,9 @@ class ExecutionConfiguration(ImplicitDict):
     stop_when_resource_not_created: Optional[bool] = False
     """If true, stop test execution if one of the resources cannot be created.  Otherwise, resources that cannot be created due to missing prerequisites are simply treated as omitted."""
 
+    concurrency: Optional[ConcurrentExecutionConfiguration] = None
+    """If specified, run the selected independent actions concurrently.  Otherwise, all actions are run strictly in order."""
+
 
 class TestConfiguration(ImplicitDict):
     action: TestSuiteActionDeclaration
@@ -220,10 +233,18 @@ class GloballyExpandedReportConfiguration(ImplicitDict):
     """When True, look for instances of "Authorization" keys in the report with values starting "Bearer " and redact the signature from those access tokens"""
 
 
+class ScenarioReportsConfiguration(ImplicitDict):
+    redact_access_tokens: bool = True
+    """When True, look for instances of "Authorization" keys in the report with values starting "Bearer " and redact the signature from those access tokens"""
+
+
 class ArtifactsConfiguration(ImplicitDict):
     raw_report: Optional[RawReportConfiguration] = None
     """Configuration for raw report generation"""
 
+    scenario_reports: Optional[ScenarioReportsConfiguration] = None
+    """If specified, configuration describing how each test scenario report should be appended to scenario_reports.jsonl as soon as the scenario completes (rather than only being available in the raw report at the end of the test run)"""
+
     report_html: Optional[ReportHTMLConfiguration] = None
     """If specified, configuration describing how an HTML version of the raw report should be generated"""
 
@@ -10,6 +10,7 @@ import yaml
 from implicitdict import ImplicitDict
 from loguru import logger
 
+from monitoring.monitorlib import fetch
 from monitoring.monitorlib.dicts import get_element_or_default, remove_elements
 from monitoring.monitorlib.versioning import get_code_version, get_commit_hash
 from monitoring.uss_qualifier.configurations.configuration import (
@@ -20,8 +21,10 @@ from monitoring.uss_qualifier.fileio import load_dict_with_references
 from monitoring.uss_qualifier.reports.artifacts import (
     default_output_path,
     generate_artifacts,
+    open_scenario_report_sink,
 )
 from monitoring.uss_qualifier.reports.report import TestRunReport
+from monitoring.uss_qualifier.reports.streaming import ScenarioReportSink
 from monitoring.uss_qualifier.reports.validation.report_validation import (
     validate_report,
 )
@@ -110,7 +113,9 @@ class TestDefinitionDescription(ImplicitDict):
 
 
 def execute_test_run(
-    whole_config: USSQualifierConfiguration, description: TestDefinitionDescription
+    whole_config: USSQualifierConfiguration,
+    description: TestDefinitionDescription,
+    report_sink: Optional[ScenarioReportSink] = None,
 ):
     config = whole_config.v1.test_run
 
@@ -128,7 +133,9 @@ def execute_test_run(
     )
 
     logger.info("Instantiating top-level test suite action")
-    context = ExecutionContext(config.execution if "execution" in config else None)
+    context = ExecutionContext(
+        config.execution if "execution" in config else None, report_sink
+    )
     action = TestSuiteAction(config.action, resources)
     logger.info("Running top-level test suite action")
     report = action.run(context)
@@ -136,6 +143,10 @@ def execute_test_run(
         logger.info("Final result: SUCCESS")
     else:
         logger.warning("Final result: FAILURE")
+    session_stats = fetch.settings.default_session_stats
+    logger.debug(
+        f"Default sessions sent {session_stats.requests} requests to {session_stats.hosts} hosts using {session_stats.new_connections} new connections (reuse ratio {session_stats.reuse_ratio:.2f})"
+    )
 
     return TestRunReport(
         codebase_version=description.codebase_version,
@@ -153,6 +164,7 @@ def raise_for_unredacted_information(config: USSQualifierConfiguration) -> None:
     required_values = {
         "v1.artifacts.globally_expanded_report.redact_access_tokens": True,
         "v1.artifacts.raw_report.redact_access_tokens": True,
+        "v1.artifacts.scenario_reports.redact_access_tokens": True,
         "v1.artifacts.report_html.redact_access_tokens": True,
         "v1.artifacts.sequence_view.redact_access_tokens": True,
     }
@@ -229,7 +241,12 @@ def run_config(
         )
 
     logger.info("Executing test run")
-    report = execute_test_run(whole_config, description)
+    report_sink = open_scenario_report_sink(config.artifacts, output_path)
+    try:
+        report = execute_test_run(whole_config, description, report_sink)
+    finally:
+        if report_sink is not None:
+            report_sink.close()
 
     if runtime_metadata is not None:
         report.runtime_metadata = runtime_metadata
@@ -1,8 +1,9 @@
-import json
+import multiprocessing
 import os
-from typing import Optional
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
 
-from implicitdict import ImplicitDict
 from loguru import logger
 
 from monitoring.uss_qualifier.configurations.configuration import ArtifactsConfiguration
@@ -10,15 +11,22 @@ from monitoring.uss_qualifier.reports.documents import make_report_html
 from monitoring.uss_qualifier.reports.globally_expanded.generate import (
     generate_globally_expanded_report,
 )
-from monitoring.uss_qualifier.reports.report import TestRunReport, redact_access_tokens
+from monitoring.uss_qualifier.reports.report import TestRunReport
 from monitoring.uss_qualifier.reports.sequence_view.generate import (
     generate_sequence_view,
 )
+from monitoring.uss_qualifier.reports.streaming import (
+    ScenarioReportSink,
+    redacted_view,
+    write_json,
+)
 from monitoring.uss_qualifier.reports.templates import render_templates
 from monitoring.uss_qualifier.reports.tested_requirements.generate import (
     generate_tested_requirements,
 )
 
+SCENARIO_REPORTS_FILE = "scenario_reports.jsonl"
+
 
 def default_output_path(config_name: str) -> str:
     if config_name.lower().endswith(".yaml") or config_name.lower().endswith(".json"):
@@ -30,12 +38,50 @@ def default_output_path(config_name: str) -> str:
     return os.path.join("output", simple_config_name)
 
 
+def open_scenario_report_sink(
+    artifacts: Optional[ArtifactsConfiguration], output_path: str
+) -> Optional[ScenarioReportSink]:
+    """Open the sink for test scenario reports as they complete, if requested by the artifacts configuration."""
+    if (
+        not artifacts
+        or "scenario_reports" not in artifacts
+        or not artifacts.scenario_reports
+    ):
+        return None
+    os.makedirs(output_path, exist_ok=True)
+    path = os.path.join(output_path, SCENARIO_REPORTS_FILE)
+    logger.info(f"Writing test scenario reports to {path} as they complete")
+    return ScenarioReportSink(path, artifacts.scenario_reports.redact_access_tokens)
+
+
+_artifact_tasks: List[Tuple[str, Callable[[], None]]] = []
+"""Artifact generation tasks for the current call to generate_artifacts.
+
+Worker processes are forked after this list is populated, so they inherit the tasks
+and the (read-only) report they reference without any need to pickle either.
+"""
+
+
+def _run_artifact_task(index: int) -> float:
+    """Run the artifact generation task at the specified index, returning its duration in seconds."""
+    t0 = time.monotonic()
+    _artifact_tasks[index][1]()
+    return time.monotonic() - t0
+
+
 def generate_artifacts(
     report: TestRunReport,
     artifacts: ArtifactsConfiguration,
     output_path: str,
     disallow_unredacted: bool,
+    parallel: bool = True,
 ):
+    """Generate all artifacts specified in the configuration.
+
+    When parallel is True and the platform supports forking, the artifacts are
+    generated concurrently in separate processes which all share the report in
+    memory.
+    """
     logger.debug(f"Writing artifacts to {os.path.abspath(output_path)}")
     os.makedirs(output_path, exist_ok=True)
 
@@ -47,65 +93,123 @@ def generate_artifacts(
             )
         return result
 
+    # Redacted content shares all unredacted subtrees with the original report
     logger.info(f"Redacting access tokens from report")
-    redacted_report = ImplicitDict.parse(json.loads(json.dumps(report)), TestRunReport)
-    redact_access_tokens(redacted_report)
+    redacted_report = redacted_view(report)
+
+    tasks: List[Tuple[str, Callable[[], None]]] = []
 
     if artifacts.raw_report:
         # Raw report
         path = os.path.join(output_path, "report.json")
-        logger.info(f"Writing raw report to {path}")
         raw_report = artifacts.raw_report
-        report_to_write = redacted_report if _should_redact(raw_report) else report
-        with open(path, "w") as f:
-            if "indent" in raw_report and raw_report.indent is not None:
-                json.dump(report_to_write, f, indent=raw_report.indent)
-            else:
-                json.dump(report_to_write, f)
+        indent = raw_report.indent if "indent" in raw_report else None
+        redact = _should_redact(raw_report)
+
+        def _write_raw_report(path=path, indent=indent, redact=redact):
+            logger.info(f"Writing raw report to {path}")
+            with open(path, "w") as f:
+                write_json(report, f, indent, redact_access_tokens=redact)
+
+        tasks.append(("raw report", _write_raw_report))
 
     if artifacts.report_html:
         # HTML rendering of raw report
         path = os.path.join(output_path, "report.html")
-        logger.info(f"Writing HTML report to {path}")
         report_to_write = (
             redacted_report if _should_redact(artifacts.report_html) else report
         )
-        with open(path, "w") as f:
-            f.write(make_report_html(report_to_write))
+
+        def _write_report_html(path=path, report_to_write=report_to_write):
+            logger.info(f"Writing HTML report to {path}")
+            with open(path, "w") as f:
+                f.write(make_report_html(report_to_write))
+
+        tasks.append(("HTML report", _write_report_html))
 
     if artifacts.templated_reports:
         # Templated reports
-        render_templates(
-            output_path,
-            artifacts.templated_reports,
-            redacted_report,
+        tasks.append(
+            (
+                "templated reports",
+                lambda: render_templates(
+                    output_path,
+                    artifacts.templated_reports,
+                    redacted_report,
+                ),
+            )
         )
 
     if artifacts.tested_requirements:
         # Tested requirements view
         for tested_reqs_config in artifacts.tested_requirements:
             path = os.path.join(output_path, tested_reqs_config.report_name)
-            logger.info(f"Writing tested requirements view to {path}")
-            generate_tested_requirements(redacted_report, tested_reqs_config, path)
+
+            def _write_tested_requirements(path=path, cfg=tested_reqs_config):
+                logger.info(f"Writing tested requirements view to {path}")
+                generate_tested_requirements(redacted_report, cfg, path)
+
+            tasks.append(
+                (
+                    f"tested requirements view {tested_reqs_config.report_name}",
+                    _write_tested_requirements,
+                )
+            )
 
     if artifacts.sequence_view:
         # Sequence view
         path = os.path.join(output_path, "sequence")
-        logger.info(f"Writing sequence view to {path}")
         report_to_write = (
             redacted_report if _should_redact(artifacts.sequence_view) else report
         )
-        generate_sequence_view(report_to_write, artifacts.sequence_view, path)
+
+        def _write_sequence_view(path=path, report_to_write=report_to_write):
+            logger.info(f"Writing sequence view to {path}")
+            generate_sequence_view(report_to_write, artifacts.sequence_view, path)
+
+        tasks.append(("sequence view", _write_sequence_view))
 
     if artifacts.globally_expanded_report:
         # Globally-expanded report
         path = os.path.join(output_path, "globally_expanded")
-        logger.info(f"Writing globally-expanded report to {path}")
         report_to_write = (
             redacted_report
             if _should_redact(artifacts.globally_expanded_report)
             else report
         )
-        generate_globally_expanded_report(
-            report_to_write, artifacts.globally_expanded_report, path
-        )
+
+        def _write_globally_expanded_report(path=path, report_to_write=report_to_write):
+            logger.info(f"Writing globally-expanded report to {path}")
+            generate_globally_expanded_report(
+                report_to_write, artifacts.globally_expanded_report, path
+            )
+
+        tasks.append(("globally-expanded report", _write_globally_expanded_report))
+
+    global _artifact_tasks
+    _artifact_tasks = tasks
+    t0 = time.monotonic()
+    try:
+        if (
+            parallel
+            and len(tasks) > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            with ProcessPoolExecutor(
+                max_workers=min(len(tasks), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("fork"),
+            ) as pool:
+                futures = {
+                    pool.submit(_run_artifact_task, i): name
+                    for i, (name, _) in enumerate(tasks)
+                }
+                for future in as_completed(futures):
+                    logger.info(
+                        f"Generated {futures[future]} in {future.result():.2f}s"
+                    )
+        else:
+            for i, (name, _) in enumerate(tasks):
+                logger.info(f"Generated {name} in {_run_artifact_task(i):.2f}s")
+    finally:
+        _artifact_tasks = []
+    logger.info(f"Generated {len(tasks)} artifacts in {time.monotonic() - t0:.2f}s")
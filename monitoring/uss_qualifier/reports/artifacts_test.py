@@ -0,0 +1,34 @@
+import os
+
+from implicitdict import ImplicitDict
+
+from monitoring.uss_qualifier.configurations.configuration import ArtifactsConfiguration
+from monitoring.uss_qualifier.reports.artifacts import generate_artifacts
+
+
+def _read_artifacts(path: str) -> dict:
+    result = {}
+    for name in sorted(os.listdir(path)):
+        with open(os.path.join(path, name), "r") as f:
+            result[name] = f.read()
+    return result
+
+
+def test_parallel_artifacts_match_sequential(tmp_path):
+    artifacts = ImplicitDict.parse(
+        {"raw_report": {"indent": 2}, "report_html": {}}, ArtifactsConfiguration
+    )
+    report = {
+        "configuration": {},
+        "report": {"request": {"headers": {"Authorization": "Bearer a.b.c"}}},
+    }
+
+    sequential_path = str(tmp_path / "sequential")
+    generate_artifacts(report, artifacts, sequential_path, False, parallel=False)
+    parallel_path = str(tmp_path / "parallel")
+    generate_artifacts(report, artifacts, parallel_path, False, parallel=True)
+
+    sequential = _read_artifacts(sequential_path)
+    assert set(sequential) == {"report.json", "report.html"}
+    assert "Bearer a.b.REDACTED" in sequential["report.json"]
+    assert _read_artifacts(parallel_path) == sequential
@@ -746,18 +746,26 @@ class TestRunReport(ImplicitDict):
     """Metadata for the test run specified at runtime."""
 
 
+def redacted_authorization(key: str, value: Any) -> Optional[str]:
+    """Returns the redacted form of `value` if `key` and `value` describe a bearer access token, or None otherwise."""
+    if (
+        key.lower() == "authorization"
+        and isinstance(value, str)
+        and value.lower().startswith("bearer ")
+    ):
+        token_parts = value[len("bearer ") :].split(".")
+        token_parts[-1] = "REDACTED"
+        return value[0 : len("bearer ")] + ".".join(token_parts)
+    return None
+
+
 def redact_access_tokens(report: Union[Dict[str, Any], list]) -> None:
     if isinstance(report, dict):
         changes = {}
         for k, v in report.items():
-            if (
-                k.lower() == "authorization"
-                and isinstance(v, str)
-                and v.lower().startswith("bearer ")
-            ):
-                token_parts = v[len("bearer ") :].split(".")
-                token_parts[-1] = "REDACTED"
-                changes[k] = v[0 : len("bearer ")] + ".".join(token_parts)
+            redacted = redacted_authorization(k, v)
+            if redacted is not None:
+                changes[k] = redacted
             elif isinstance(v, dict) or isinstance(v, list):
                 redact_access_tokens(v)
         for k, v in changes.items():
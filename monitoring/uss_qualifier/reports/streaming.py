@@ -0,0 +1,192 @@
+import copy
+import json
+import threading
+from typing import IO, Any, Iterator, Optional
+
+from monitoring.uss_qualifier.reports.report import (
+    TestScenarioReport,
+    TestSuiteActionReport,
+    redacted_authorization,
+)
+
+WRITE_BUFFER_CHARS = 1 << 16
+"""Number of characters of serialized JSON to accumulate before writing them to the output file."""
+
+
+def _encode_float(o: float) -> str:
+    if o != o:
+        return "NaN"
+    elif o == float("inf"):
+        return "Infinity"
+    elif o == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(o)
+
+
+def iter_json(
+    obj: Any, indent: Optional[int] = None, redact_access_tokens: bool = False
+) -> Iterator[str]:
+    """Serialize obj to JSON piece by piece, without building the whole document in memory.
+
+    The output is identical to json.dump(obj, f, indent=indent), except that bearer
+    access tokens are redacted as they are written when redact_access_tokens is True
+    (without modifying or copying obj).
+    """
+    item_separator = ", " if indent is None else ","
+
+    def _iter(o: Any, level: int) -> Iterator[str]:
+        if isinstance(o, str):
+            yield json.encoder.encode_basestring_ascii(o)
+        elif o is None:
+            yield "null"
+        elif o is True:
+            yield "true"
+        elif o is False:
+            yield "false"
+        elif isinstance(o, int):
+            yield int.__repr__(o)
+        elif isinstance(o, float):
+            yield _encode_float(o)
+        elif isinstance(o, dict):
+            if not o:
+                yield "{}"
+                return
+            if indent is None:
+                newline_indent = ""
+                closing = ""
+            else:
+                newline_indent = "\n" + " " * (indent * (level + 1))
+                closing = "\n" + " " * (indent * level)
+            yield "{"
+            first = True
+            for k, v in o.items():
+                if not isinstance(k, str):
+                    raise TypeError(
+                        f"keys must be str in streamed JSON, not {type(k).__name__}"
+                    )
+                yield newline_indent if first else item_separator + newline_indent
+                first = False
+                yield json.encoder.encode_basestring_ascii(k)
+                yield ": "
+                redacted = (
+                    redacted_authorization(k, v) if redact_access_tokens else None
+                )
+                if redacted is not None:
+                    yield json.encoder.encode_basestring_ascii(redacted)
+                else:
+                    yield from _iter(v, level + 1)
+            yield closing + "}"
+        elif isinstance(o, (list, tuple)):
+            if not o:
+                yield "[]"
+                return
+            if indent is None:
+                newline_indent = ""
+                closing = ""
+            else:
+                newline_indent = "\n" + " " * (indent * (level + 1))
+                closing = "\n" + " " * (indent * level)
+            yield "["
+            first = True
+            for v in o:
+                yield newline_indent if first else item_separator + newline_indent
+                first = False
+                yield from _iter(v, level + 1)
+            yield closing + "]"
+        else:
+            raise TypeError(
+                f"Object of type {type(o).__name__} is not JSON serializable"
+            )
+
+    return _iter(obj, 0)
+
+
+def write_json(
+    obj: Any,
+    f: IO[str],
+    indent: Optional[int] = None,
+    redact_access_tokens: bool = False,
+) -> None:
+    """Stream obj as JSON into f; see iter_json."""
+    buffer = []
+    buffered = 0
+    for chunk in iter_json(obj, indent, redact_access_tokens):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= WRITE_BUFFER_CHARS:
+            f.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        f.write("".join(buffer))
+
+
+def redacted_view(obj: Any) -> Any:
+    """Return a version of obj with bearer access tokens redacted, without modifying obj.
+
+    Only the dicts and lists on the path to a redacted token are (shallowly) copied;
+    all other content is shared with obj, so the result must be treated as read-only.
+    Copies retain their original type so ImplicitDict attribute access still works.
+    """
+    if isinstance(obj, dict):
+        result = None
+        for k, v in obj.items():
+            redacted = redacted_authorization(k, v)
+            if redacted is None:
+                redacted = redacted_view(v)
+                if redacted is v:
+                    continue
+            if result is None:
+                result = copy.copy(obj)
+            result[k] = redacted
+        return obj if result is None else result
+    elif isinstance(obj, list):
+        result = None
+        for i, v in enumerate(obj):
+            redacted = redacted_view(v)
+            if redacted is v:
+                continue
+            if result is None:
+                result = copy.copy(obj)
+            result[i] = redacted
+        return obj if result is None else result
+    return obj
+
+
+class ScenarioReportSink(object):
+    """Appends each test scenario report to a JSON Lines file as soon as the scenario completes.
+
+    This preserves the results of a long test run on disk as it progresses, without
+    waiting for (or needing to hold) the full report at the end of the run.
+    """
+
+    def __init__(self, path: str, redact_access_tokens: bool = True):
+        self.path = path
+        self._redact_access_tokens = redact_access_tokens
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+        self.scenarios_written = 0
+
+    def append(self, report: TestScenarioReport) -> None:
+        line = "".join(
+            iter_json(report, redact_access_tokens=self._redact_access_tokens)
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.scenarios_written += 1
+
+    def append_action(self, report: TestSuiteActionReport) -> None:
+        """Append the test scenario report in the provided action report, if any."""
+        if "test_scenario" in report and report.test_scenario is not None:
+            self.append(report.test_scenario)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ScenarioReportSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -3,7 +3,7 @@ from typing import Optional
 from implicitdict import ImplicitDict
 from loguru import logger
 
-from monitoring.monitorlib.fetch import settings
+from monitoring.monitorlib.fetch import default_sessions, settings
 from monitoring.uss_qualifier.resources.resource import Resource
 
 
@@ -23,6 +23,12 @@ class QueryBehaviorSpecification(ImplicitDict):
     fake_netlocs: Optional[list[str]]
     """Network locations well-known to be fake and for which a request should fail immediately without being attempted."""
 
+    default_session_pool_maxsize: Optional[int]
+    """Maximum number of connections to keep open to each host queried without a client session"""
+
+    default_session_keep_alive: Optional[bool]
+    """Whether connections to hosts queried without a client session are kept alive to be reused by later queries"""
+
 
 class QueryBehaviorResource(Resource[QueryBehaviorSpecification]):
     """When declared, this resource adjusts the settings for all queries made by uss_qualifier.
@@ -90,3 +96,32 @@ class QueryBehaviorResource(Resource[QueryBehaviorSpecification]):
             logger.info(
                 f"QueryBehaviorResource: Fake network locations set to {settings.fake_netlocs}"
             )
+
+        if (
+            "default_session_pool_maxsize" in specification
+            and specification.default_session_pool_maxsize is not None
+        ):
+            if specification.default_session_pool_maxsize < 1:
+                raise ValueError(
+                    "It only makes sense to keep at least one connection per host"
+                )
+            settings.default_session_pool_maxsize = (
+                specification.default_session_pool_maxsize
+            )
+            logger.info(
+                f"QueryBehaviorResource: Default session connection pool size set to {settings.default_session_pool_maxsize}"
+            )
+
+        if (
+            "default_session_keep_alive" in specification
+            and specification.default_session_keep_alive is not None
+        ):
+            settings.default_session_keep_alive = (
+                specification.default_session_keep_alive
+            )
+            logger.info(
+                f"QueryBehaviorResource: Default session connections set to {'' if settings.default_session_keep_alive else 'not '}be kept alive"
+            )
+
+        # Apply any changed settings to subsequent default sessions
+        default_sessions.close()
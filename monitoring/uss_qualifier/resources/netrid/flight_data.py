@@ -71,6 +71,10 @@ class FlightDataKMLFileConfiguration(ImplicitDict):
     kml_file: ExternalFile
     """Location of KML describing a FlightRecordCollection."""
 
+    flight_tracks_cache_path: Optional[str]
+    """Path (folder) in which to cache the flight tracks generated from the KML, so that subsequent runs with the same
+    KML skip their generation.  If not specified, flight tracks are generated every time."""
+
 
 class FlightDataSpecification(ImplicitDict):
     flight_start_delay: StringBasedTimeDelta = StringBasedTimeDelta("15s")
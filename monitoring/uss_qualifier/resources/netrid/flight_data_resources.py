@@ -1,10 +1,11 @@
 import copy
 import json
 import uuid
-from datetime import timedelta
-from typing import List, Optional, Self
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Self, Tuple
 
 import arrow
+import numpy as np
 from implicitdict import ImplicitDict, StringBasedDateTime
 from uas_standards.astm.f3411.v22a.api import UASID
 from uas_standards.interuss.automated_testing.rid.v1.injection import (
@@ -17,6 +18,7 @@ from monitoring.uss_qualifier.resources.files import load_content, load_dict
 from monitoring.uss_qualifier.resources.netrid.flight_data import (
     FlightDataSpecification,
     FlightRecordCollection,
+    FullFlightRecord,
 )
 from monitoring.uss_qualifier.resources.netrid.simulation.adjacent_circular_flights_simulator import (
     generate_aircraft_states,
@@ -26,10 +28,25 @@ from monitoring.uss_qualifier.resources.netrid.simulation.kml_flights import (
 )
 from monitoring.uss_qualifier.resources.resource import Resource
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _epoch_us(t: datetime) -> int:
+    return (t - _EPOCH) // timedelta(microseconds=1)
+
 
 class FlightDataResource(Resource[FlightDataSpecification]):
     _flight_start_delay: timedelta
-    flight_collection: FlightRecordCollection
+
+    _flight_records: FlightRecordCollection
+    """Full flight records from the source of flight data; shared (and never mutated) between views of this resource"""
+
+    _state_times_us: Optional[List[np.ndarray]] = None
+    """For each flight, the (unshifted) timestamp of each of its states in microseconds since the epoch; shared between
+    views of this resource once computed"""
+
+    _state_indices: Optional[List[np.ndarray]] = None
+    """For each flight, the indices of the states selected by this view, or None when all states are selected"""
 
     # If set, this field will be removed from the first telemetry frame
     _field_to_clean = None
@@ -51,6 +68,7 @@ class FlightDataResource(Resource[FlightDataSpecification]):
                 kml_content,
                 specification.kml_source.reference_time.datetime,
                 specification.kml_source.random_seed,
+                specification.kml_source.get("flight_tracks_cache_path", None),
             )
         else:
             raise ValueError(
@@ -59,19 +77,76 @@ class FlightDataResource(Resource[FlightDataSpecification]):
             )
         self._flight_start_delay = specification.flight_start_delay.timedelta
 
+    @property
+    def flight_collection(self) -> FlightRecordCollection:
+        """Flight records as selected by this view; states are shared with the full flight records and must not be
+        modified."""
+        if self._state_indices is None:
+            return self._flight_records
+        return FlightRecordCollection(
+            flights=[
+                FullFlightRecord(
+                    reference_time=flight.reference_time,
+                    states=self._flight_states(i),
+                    flight_details=flight.flight_details,
+                    aircraft_type=flight.aircraft_type,
+                )
+                for i, flight in enumerate(self._flight_records.flights)
+            ]
+        )
+
+    @flight_collection.setter
+    def flight_collection(self, value: FlightRecordCollection) -> None:
+        self._flight_records = value
+        self._state_times_us = None
+        self._state_indices = None
+
+    def _flight_states(self, i: int) -> List[RIDAircraftState]:
+        states = self._flight_records.flights[i].states
+        if self._state_indices is None:
+            return states
+        return [states[j] for j in self._state_indices[i]]
+
+    def _selected_state_times_us(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(indices, timestamps in microseconds since the epoch) of the selected states of each flight."""
+        if self._state_times_us is None:
+            self._state_times_us = [
+                np.array(
+                    [_epoch_us(state.timestamp.datetime) for state in flight.states],
+                    dtype=np.int64,
+                )
+                for flight in self._flight_records.flights
+            ]
+        result = []
+        for i, times_us in enumerate(self._state_times_us):
+            if self._state_indices is None:
+                indices = np.arange(len(times_us))
+            else:
+                indices = self._state_indices[i]
+            result.append((indices, times_us[indices]))
+        return result
+
+    def _view(self, state_indices: Optional[List[np.ndarray]] = None) -> Self:
+        """Create a new view of this resource sharing its flight records, optionally selecting a subset of states."""
+        self_copy = copy.copy(self)
+        if state_indices is not None:
+            self_copy._state_indices = state_indices
+        return self_copy
+
     def get_test_flights(self) -> List[TestFlight]:
         t0 = arrow.utcnow() + self._flight_start_delay
 
         test_flights: List[TestFlight] = []
 
-        for flight in self.flight_collection.flights:
-            dt = t0 - flight.reference_time.datetime
+        for i, flight in enumerate(self._flight_records.flights):
+            # Flight data is only shifted to the time of test as the test flight is materialized
+            dt = t0.datetime - flight.reference_time.datetime
 
             telemetry: List[RIDAircraftState] = []
 
             removed_field = False
 
-            for state in flight.states:
+            for state in self._flight_states(i):
                 shifted_state = RIDAircraftState(state)
                 shifted_state.timestamp = StringBasedDateTime(
                     state.timestamp.datetime + dt
@@ -120,16 +195,15 @@ class FlightDataResource(Resource[FlightDataSpecification]):
 
         Intended to be used for simulating the disconnection of a networked UAS.
         """
-        self_copy = copy.deepcopy(self)
-        for flight in self_copy.flight_collection.flights:
-            latest_allowed_end = flight.reference_time.datetime + duration
+        duration_us = duration // timedelta(microseconds=1)
+        state_indices = []
+        for flight, (indices, times_us) in zip(
+            self._flight_records.flights, self._selected_state_times_us()
+        ):
+            latest_allowed_end = _epoch_us(flight.reference_time.datetime) + duration_us
             # Keep only the states within the allowed duration
-            flight.states = [
-                state
-                for state in flight.states
-                if state.timestamp.datetime <= latest_allowed_end
-            ]
-        return self_copy
+            state_indices.append(indices[times_us <= latest_allowed_end])
+        return self._view(state_indices)
 
     def truncate_flights_field(self, field_name: str) -> Self:
         """
@@ -141,7 +215,7 @@ class FlightDataResource(Resource[FlightDataSpecification]):
 
         Intended to be used for simulating missing field scenario.
         """
-        self_copy = copy.deepcopy(self)
+        self_copy = self._view()
         self_copy._field_to_clean = field_name  # Cleanup is done in get_test_flights
 
         return self_copy
@@ -154,7 +228,7 @@ class FlightDataResource(Resource[FlightDataSpecification]):
 
         Intended to be used for having the boundaries of the flight's span available before injection.
         """
-        self_copy = copy.deepcopy(self)
+        self_copy = self._view()
 
         flights = self_copy.get_test_flights()
 
@@ -175,10 +249,9 @@ class FlightDataResource(Resource[FlightDataSpecification]):
 
         Intended to be used for simulating slow updates from a networked UAS.
         """
-        self_copy = copy.deepcopy(self)
-        for flight in self_copy.flight_collection.flights:
-            flight.states = flight.states[::n]
-        return self_copy
+        return self._view(
+            [indices[::n] for indices, _ in self._selected_state_times_us()]
+        )
 
 
 class FlightDataStorageSpecification(ImplicitDict):
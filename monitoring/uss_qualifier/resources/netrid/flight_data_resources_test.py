@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from monitoring.uss_qualifier.resources.netrid.flight_data import (
+    AdjacentCircularFlightsSimulatorConfiguration,
+    FlightDataSpecification,
+)
+from monitoring.uss_qualifier.resources.netrid.flight_data_resources import (
+    FlightDataResource,
+)
+
+
+def _flight_data() -> FlightDataResource:
+    return FlightDataResource(
+        FlightDataSpecification(
+            adjacent_circular_flights_simulation_source=AdjacentCircularFlightsSimulatorConfiguration()
+        ),
+        "test",
+    )
+
+
+def test_views_select_states_without_changing_original():
+    flight_data = _flight_data()
+    original = flight_data.flight_collection
+    n_states = [len(f.states) for f in original.flights]
+
+    truncated = flight_data.truncate_flights_duration(timedelta(seconds=10))
+    dropped = truncated.drop_every_n_state(3)
+
+    for flight, truncated_flight, dropped_flight in zip(
+        original.flights,
+        truncated.flight_collection.flights,
+        dropped.flight_collection.flights,
+    ):
+        latest = flight.reference_time.datetime + timedelta(seconds=10)
+        expected = [s for s in flight.states if s.timestamp.datetime <= latest]
+        assert truncated_flight.states == expected
+        assert dropped_flight.states == expected[::3]
+    assert [len(f.states) for f in flight_data.flight_collection.flights] == n_states
+
+    test_flights = dropped.get_test_flights()
+    for test_flight, flight in zip(test_flights, dropped.flight_collection.flights):
+        assert len(test_flight.telemetry) == len(flight.states)
+        dt = (
+            test_flight.telemetry[0].timestamp.datetime
+            - flight.states[0].timestamp.datetime
+        )
+        for shifted, state in zip(test_flight.telemetry, flight.states):
+            assert shifted.timestamp.datetime - state.timestamp.datetime == dt
+            assert shifted.timestamp.endswith("Z")
+            assert shifted.position == state.position
+
+
+def test_truncate_flights_field_only_cleans_test_flights():
+    flight_data = _flight_data()
+    cleaned = flight_data.truncate_flights_field("position.lat")
+    for test_flight in cleaned.get_test_flights():
+        assert test_flight.telemetry[0].position.lat is None
+        assert test_flight.telemetry[1].position.lat is not None
+    for flight in flight_data.flight_collection.flights:
+        assert flight.states[0].position.lat is not None
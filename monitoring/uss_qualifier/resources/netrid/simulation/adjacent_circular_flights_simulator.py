@@ -1,10 +1,11 @@
 import random
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List
 
 import arrow
+import numpy as np
 import shapely.geometry
-from implicitdict import ImplicitDict
+from implicitdict import StringBasedDateTime
 from pyproj import Geod, Proj, Transformer
 from shapely.geometry import Point, Polygon
 from uas_standards.interuss.automated_testing.rid.v1 import injection
@@ -19,6 +20,83 @@ from monitoring.uss_qualifier.resources.netrid.simulation import operator_flight
 from .utils import FlightPoint, GridCellFlight, QueryBoundingBox
 
 
+class CircularFlightTelemetry(object):
+    """Telemetry of a simulated flight around its track, as arrays with one element per telemetry sample."""
+
+    time_offsets_s: np.ndarray
+    """Time of each sample, in seconds after the simulation reference time."""
+
+    lat: np.ndarray
+    lng: np.ndarray
+    alt: np.ndarray
+    speed: np.ndarray
+    bearing: np.ndarray
+
+    def __init__(
+        self,
+        track: List[FlightPoint],
+        time_offsets_s: np.ndarray,
+        point_indices: np.ndarray,
+    ):
+        """Select the track point flown at each of the specified times.
+
+        Args:
+            track: Points of the flight track.
+            time_offsets_s: Time of each sample, in seconds after the simulation reference time.
+            point_indices: Index of the track point at each sample.
+        """
+        self.time_offsets_s = time_offsets_s
+        self.lat = np.array([p.lat for p in track])[point_indices]
+        self.lng = np.array([p.lng for p in track])[point_indices]
+        self.alt = np.array([p.alt for p in track])[point_indices]
+        self.speed = np.array([p.speed for p in track])[point_indices]
+        self.bearing = np.array([p.bearing for p in track])[point_indices]
+
+    def __len__(self) -> int:
+        return len(self.time_offsets_s)
+
+    def rid_states(
+        self, reference_time: datetime, altitude_agl: float
+    ) -> List[injection.RIDAircraftState]:
+        """Materialize each sample as an RIDAircraftState, in time order.
+
+        FullFlightRecord.states is a list that is indexed, sliced, and serialized by its consumers, so all states are
+        materialized at once.
+        """
+        height = injection.RIDHeight(
+            distance=altitude_agl,
+            reference=injection.RIDHeightReference.TakeoffLocation,
+        )
+        return [
+            injection.RIDAircraftState(
+                timestamp=StringBasedDateTime(reference_time + timedelta(seconds=dt)),
+                operational_status=injection.RIDOperationalStatus.Airborne,
+                position=injection.RIDAircraftPosition(
+                    lat=lat,
+                    lng=lng,
+                    alt=alt,
+                    accuracy_h=injection.HorizontalAccuracy.HAUnknown,
+                    accuracy_v=injection.VerticalAccuracy.VAUnknown,
+                    extrapolated=False,
+                ),
+                height=injection.RIDHeight(height),
+                track=bearing,
+                speed=speed,
+                timestamp_accuracy=0.0,
+                speed_accuracy=injection.SpeedAccuracy.SA3mps,
+                vertical_speed=0.0,
+            )
+            for dt, lat, lng, alt, speed, bearing in zip(
+                self.time_offsets_s.tolist(),
+                self.lat.tolist(),
+                self.lng.tolist(),
+                self.alt.tolist(),
+                self.speed.tolist(),
+                self.bearing.tolist(),
+            )
+        ]
+
+
 class AdjacentCircularFlightsSimulator:
     """A class to generate Flight Paths given a bounding box, this is the main module to generate flight path datasets, the data is generated as latitude / longitude pairs with assoiated with the flights. Additional flight metadata e.g. flight id, altitude, registration number can also be generated"""
 
@@ -50,6 +128,7 @@ class AdjacentCircularFlightsSimulator:
         self.query_bboxes: List[QueryBoundingBox] = []
 
         self.flights: List[FullFlightRecord] = []
+        self.flight_telemetry: List[CircularFlightTelemetry] = []
         self.bbox_center: List[shapely.geometry.Point] = []
 
         self.geod = Geod(ellps="WGS84")
@@ -260,88 +339,43 @@ class AdjacentCircularFlightsSimulator:
             registration_number=my_flight_details_generator.generate_registration_number(),
         )
 
-    def generate_rid_state(self, duration):
-        """
-
-        This method generates rid_state objects that can be submitted as flight telemetry
-
+    def generate_telemetry(self, duration: int) -> None:
+        """Compute the telemetry of each flight for the specified number of seconds, as arrays.
 
+        Each flight reports one track point per second starting one second after the reference time (plus its start
+        shift), going around its track and starting over at the beginning of the track (skipping one second) when it
+        reaches the closing point of the track.
         """
-        all_flight_telemetry: List[List[injection.RIDAircraftState]] = []
-        flight_track_details = {}  # Develop a index of flight length and their index
-        # Store where on the track the current index is, since the tracks are circular, once the end of the track is reached, the index is reset to 0 to indicate beginning of the track again.
-        flight_current_index = {}
-        # Get the number of flights
-        num_flights = len(self.grid_cells_flight_tracks)
-        time_increment_seconds = 1  # the number of seconds it takes to go from one point to next on the track
-        now = self.reference_time
-        now_isoformat = now.isoformat()
-        for i in range(num_flights):
-            flight_positions_len = len(self.grid_cells_flight_tracks[i].track)
-
-            # in a circular flight pattern increment direction
-            angle_increment = 360 / flight_positions_len
-
-            # the resolution of track is 1 degree minimum
-            angle_increment = 1.0 if angle_increment == 0.0 else angle_increment
-
-            if i not in flight_track_details:
-                flight_track_details[i] = {}
-            flight_track_details[i]["track_length"] = flight_positions_len
-            flight_current_index[i] = 0
-            all_flight_telemetry.append([])
-
-        timestamp = now
-        for j in range(duration):
-            timestamp = timestamp.shift(seconds=time_increment_seconds)
-
-            for k in range(num_flights):
-                timestamp_isoformat = timestamp.shift(
-                    seconds=k * self.flight_start_shift_time
-                ).isoformat()
-                list_end = (
-                    flight_track_details[k]["track_length"] - flight_current_index[k]
+        steps = np.arange(duration)
+        self.flight_telemetry = []
+        for k, grid_cell_flight in enumerate(self.grid_cells_flight_tracks):
+            track_length = len(grid_cell_flight.track)
+            track_index = steps % track_length
+            reported = track_index != track_length - 1
+            self.flight_telemetry.append(
+                CircularFlightTelemetry(
+                    track=grid_cell_flight.track,
+                    time_offsets_s=steps[reported]
+                    + 1
+                    + k * self.flight_start_shift_time,
+                    point_indices=track_index[reported],
                 )
+            )
 
-                if list_end != 1:
-                    flight_point = self.grid_cells_flight_tracks[k].track[
-                        flight_current_index[k]
-                    ]
-                    aircraft_position = injection.RIDAircraftPosition(
-                        lat=flight_point.lat,
-                        lng=flight_point.lng,
-                        alt=flight_point.alt,
-                        accuracy_h=injection.HorizontalAccuracy.HAUnknown,
-                        accuracy_v=injection.VerticalAccuracy.VAUnknown,
-                        extrapolated=False,
-                    )
-                    aircraft_height = injection.RIDHeight(
-                        distance=self.altitude_agl, reference="TakeoffLocation"
-                    )
-
-                    rid_aircraft_state = injection.RIDAircraftState(
-                        timestamp=timestamp_isoformat,
-                        operational_status="Airborne",
-                        position=aircraft_position,
-                        height=aircraft_height,
-                        track=flight_point.bearing,
-                        speed=flight_point.speed,
-                        timestamp_accuracy=0.0,
-                        speed_accuracy="SA3mps",
-                        vertical_speed=0.0,
-                    )
+    def generate_rid_state(self, duration):
+        """
 
-                    all_flight_telemetry[k].append(rid_aircraft_state)
+        This method generates rid_state objects that can be submitted as flight telemetry
 
-                    flight_current_index[k] += 1
-                else:
-                    flight_current_index[k] = 0
 
+        """
+        self.generate_telemetry(duration)
+        reference_time = StringBasedDateTime(self.reference_time.isoformat())
         flights = []
-        for m in range(num_flights):
+        for m, telemetry in enumerate(self.flight_telemetry):
             flight = FullFlightRecord(
-                reference_time=now_isoformat,
-                states=all_flight_telemetry[m],
+                reference_time=reference_time,
+                states=telemetry.rid_states(reference_time.datetime, self.altitude_agl),
                 flight_details=self.generate_flight_details(id=str(m)),
                 aircraft_type="Helicopter",
             )
@@ -362,7 +396,5 @@ def generate_aircraft_states(
     my_path_generator.generate_rid_state(duration=30)
     flights = my_path_generator.flights
 
-    result = FlightRecordCollection(flights=flights)
-
-    # Fix type errors (TODO: fix these at the source rather than here)
-    return ImplicitDict.parse(result, FlightRecordCollection)
+    # Telemetry is generated with the proper types, so the records do not need to be re-parsed
+    return FlightRecordCollection(flights=flights)
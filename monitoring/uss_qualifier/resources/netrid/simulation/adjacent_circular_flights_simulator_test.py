@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from monitoring.uss_qualifier.resources.netrid.flight_data import (
+    AdjacentCircularFlightsSimulatorConfiguration,
+)
+from monitoring.uss_qualifier.resources.netrid.simulation.adjacent_circular_flights_simulator import (
+    AdjacentCircularFlightsSimulator,
+    generate_aircraft_states,
+)
+
+
+def test_generate_aircraft_states():
+    config = AdjacentCircularFlightsSimulatorConfiguration(flight_start_shift=7)
+    flights = generate_aircraft_states(config).flights
+    t0 = config.reference_time.datetime
+
+    assert len(flights) == 6
+    for k, flight in enumerate(flights):
+        assert flight.reference_time.datetime == t0
+        assert len(flight.states) == 30
+        for j, state in enumerate(flight.states):
+            assert state.timestamp.datetime == t0 + timedelta(seconds=j + 1 + 7 * k)
+            assert state.position.alt == config.altitude_of_ground_level_wgs_84 + 50
+        # Flights circle their tracks one point per second
+        assert (
+            flight.states[1].position.lat != flight.states[0].position.lat
+            or flight.states[1].position.lng != flight.states[0].position.lng
+        )
+
+
+def test_generate_rid_state_wraps_around_track():
+    config = AdjacentCircularFlightsSimulatorConfiguration(flight_start_shift=3)
+    simulator = AdjacentCircularFlightsSimulator(config)
+    simulator.generate_flight_grid_and_path_points(
+        altitude_of_ground_level_wgs_84=config.altitude_of_ground_level_wgs_84
+    )
+    simulator.generate_query_bboxes()
+    duration = 200
+    simulator.generate_rid_state(duration=duration)
+    t0 = config.reference_time.datetime
+
+    for k, (flight, grid_cell_flight) in enumerate(
+        zip(simulator.flights, simulator.grid_cells_flight_tracks)
+    ):
+        track = grid_cell_flight.track
+        assert duration > 2 * len(track)
+        # The closing point of the track (identical to its first point) is skipped, along with its second
+        steps = [s for s in range(duration) if s % len(track) != len(track) - 1]
+        assert len(flight.states) == len(steps)
+        for step, state in zip(steps, flight.states):
+            point = track[step % len(track)]
+            assert state.timestamp.datetime == t0 + timedelta(seconds=step + 1 + 3 * k)
+            assert (state.position.lat, state.position.lng) == (point.lat, point.lng)
+            assert state.speed == point.speed
+            assert state.track == point.bearing
@@ -1,20 +1,29 @@
 #!/usr/bin/env python
 
 # A file to generate Flight Records from KML.
+import functools
+import hashlib
+import json
 import math
+import os
 import random
 import uuid
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
-from typing import List
+from typing import List, Optional, Tuple
 
+import numpy as np
 import s2sphere
 from implicitdict import StringBasedDateTime
-from shapely.geometry import LineString, Point, Polygon
+from loguru import logger
+from shapely.geometry import LineString
 from uas_standards.astm.f3411.v22a import constants
 from uas_standards.interuss.automated_testing.rid.v1 import injection
 
+from monitoring.monitorlib import geo
 from monitoring.monitorlib.geo import flatten, unflatten
+from monitoring.monitorlib.kml import parsing
 from monitoring.monitorlib.kml.parsing import get_kml_content, get_polygon_speed
 from monitoring.uss_qualifier.resources.netrid.flight_data import (
     FlightRecordCollection,
@@ -23,6 +32,14 @@ from monitoring.uss_qualifier.resources.netrid.flight_data import (
 
 STATE_INCREMENT_SECONDS = 1
 
+_GENERATOR_MODULES = [
+    __file__,
+    parsing.__file__,
+    geo.__file__,
+]
+"""Source files of the code generating flight state coordinates; cached coordinates are only reused while these are
+unchanged."""
+
 
 Coordinate = namedtuple("Coordinate", ["lng", "lat", "alt"])
 
@@ -300,9 +317,44 @@ def get_polygons_distances_from_point(point, polygons):
     Returns:
         A list of distances in meters.
     """
-    distances = []
-    for poly in polygons:
-        distances.append(Point(*point).distance(Polygon(poly)))
+    return get_polygons_distances_from_points([point], polygons)[0].tolist()
+
+
+def get_polygons_distances_from_points(points, polygons) -> np.ndarray:
+    """Returns the distance of each of many points from each of the surrounding polygons.
+    Args:
+        points: A list of x,y coordinates.
+        polygons: A list of flattened polygons.
+    Returns:
+        An array of distances in meters, with one row per point and one column per polygon.  The distance from a point
+        inside a polygon is 0.
+    """
+    xy = np.array(points, dtype=float).reshape(-1, 2)
+    px = xy[:, 0:1]
+    py = xy[:, 1:2]
+    distances = np.empty((len(xy), len(polygons)))
+    for i, poly in enumerate(polygons):
+        vertices = np.array(poly, dtype=float)[:, 0:2]
+        ax = vertices[:, 0]
+        ay = vertices[:, 1]
+        bx = np.roll(ax, -1)
+        by = np.roll(ay, -1)
+        dx = bx - ax
+        dy = by - ay
+
+        # Distance from each point to the closest point of each edge
+        length2 = dx * dx + dy * dy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(length2 > 0, ((px - ax) * dx + (py - ay) * dy) / length2, 0)
+            t = np.clip(t, 0, 1)
+            edge_distances = np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+            # Even-odd rule: points inside the polygon cross an odd number of edges rightward
+            crossing = (ay > py) != (by > py)
+            x_cross = ax + (py - ay) * dx / np.where(dy != 0, dy, 1)
+        inside = np.count_nonzero(crossing & (px < x_cross), axis=1) % 2 == 1
+
+        distances[:, i] = np.where(inside, 0, edge_distances.min(axis=1))
     return distances
 
 
@@ -329,6 +381,28 @@ def get_interpolated_value(point, polygons, all_possible_values, round_value=Fal
     return round(interpolated_value, 2) if round_value else interpolated_value
 
 
+def get_interpolated_values(points, polygons, all_possible_values) -> List[float]:
+    """Returns the value interpolated (as per get_interpolated_value) at each of many points at once.
+    Args:
+        points: A list of flattened x,y points.
+        polygons: A list of flattened polygons.
+        all_possible_values: All surrounding polygons' values. Values can be altitude or speed.
+    Returns:
+        An interpolated value for altitude or speed at each point.
+    """
+    if not points:
+        return []
+    distances = get_polygons_distances_from_points(points, polygons)
+    values = np.array(all_possible_values, dtype=float)
+    nearest = np.argmin(distances, axis=1)
+    on_polygon = distances[np.arange(len(points)), nearest] < 0.1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dividend = (values / distances).sum(axis=1)
+        divisor = (1 / distances).sum(axis=1)
+        interpolated_values = np.where(on_polygon, values[nearest], dividend / divisor)
+    return interpolated_values.tolist()
+
+
 def get_speeds_from_speed_polygons(speed_polygons):
     return [get_polygon_speed(n) for n in list(speed_polygons)]
 
@@ -357,9 +431,10 @@ def get_flight_state_coordinates(flight_details):
         )
 
     speed_polygons = flight_details["speed_polygons"]
-    flattened_speed_polygons = get_flight_polygons_flattened(
-        reference_point, speed_polygons
-    )
+    flattened_speed_polygons = [
+        np.array(p)
+        for p in get_flight_polygons_flattened(reference_point, speed_polygons)
+    ]
     all_polygon_speeds = get_speeds_from_speed_polygons(speed_polygons)
     (
         flight_state_vertices,
@@ -375,11 +450,9 @@ def get_flight_state_coordinates(flight_details):
     )
     all_polygon_alts = [p[0][2] for p in list(alt_polygons.values())]
 
-    flight_state_altitudes = []
-    for point in flight_state_vertices:
-        flight_state_altitudes.append(
-            get_interpolated_value(point, flattened_alt_polygons, all_polygon_alts)
-        )
+    flight_state_altitudes = get_interpolated_values(
+        flight_state_vertices, flattened_alt_polygons, all_polygon_alts
+    )
     flight_state_vertices_unflatten = [
         unflatten(s2sphere.LatLng.from_degrees(*reference_point[:2]), v)
         for v in flight_state_vertices
@@ -394,23 +467,101 @@ def get_flight_state_coordinates(flight_details):
     return flight_state_coordinates, flight_state_speeds, flight_track_angles
 
 
+@functools.lru_cache(maxsize=1)
+def _generator_hash() -> str:
+    h = hashlib.sha256()
+    for path in _GENERATOR_MODULES:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _cache_key(kml_content: str) -> str:
+    h = hashlib.sha256(_generator_hash().encode("utf-8"))
+    h.update(kml_content.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _get_cached_flight_state_coordinates(
+    cache_path: str,
+) -> Optional[List[Tuple[List[Coordinate], List[float], List[float]]]]:
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return [
+        ([Coordinate(*c) for c in coordinates], speeds, angles)
+        for coordinates, speeds, angles in cached
+    ]
+
+
+def _cache_flight_state_coordinates(
+    cache_path: str,
+    flight_state_coordinates: List[Tuple[List[Coordinate], List[float], List[float]]],
+) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(flight_state_coordinates, f)
+    os.replace(tmp_path, cache_path)
+
+
+def get_all_flight_state_coordinates(
+    kml_content: str, flights: List[dict], cache_dir: Optional[str] = None
+) -> List[Tuple[List[Coordinate], List[float], List[float]]]:
+    """Returns the state coordinates, speeds and angles (see get_flight_state_coordinates) of each flight.
+
+    Flights are processed in parallel.  If cache_dir is specified, the results are cached there according to the KML
+    content they were generated from and the code generating them.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{_cache_key(kml_content)}.json")
+        cached = _get_cached_flight_state_coordinates(cache_path)
+        if cached is not None and len(cached) == len(flights):
+            return cached
+
+    if len(flights) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(len(flights), os.cpu_count() or 1)
+        ) as executor:
+            result = list(executor.map(get_flight_state_coordinates, flights))
+    else:
+        result = [get_flight_state_coordinates(f) for f in flights]
+
+    if cache_path:
+        try:
+            _cache_flight_state_coordinates(cache_path, result)
+        except IOError as e:
+            logger.warning(
+                f"Unable to cache flight state coordinates at {cache_path}: {e}"
+            )
+    return result
+
+
 def get_flight_records(
-    kml_content, reference_time, random_seed
+    kml_content: str,
+    reference_time,
+    random_seed,
+    cache_dir: Optional[str] = None,
 ) -> FlightRecordCollection:
-    kml_content = get_kml_content(kml_content.encode("utf-8"), True)
+    kml_flights = get_kml_content(kml_content.encode("utf-8"), True)
     flight_records = []
-    for flight_name, flight_details in kml_content.items():
-        flight_description = flight_details["description"]
-        operator_location = flight_details["operator_location"]
-        (
-            flight_state_coordinates,
-            flight_state_speeds,
-            flight_track_angles,
-        ) = get_flight_state_coordinates(flight_details)
+    for flight_details, (
+        flight_state_coordinates,
+        flight_state_speeds,
+        flight_track_angles,
+    ) in zip(
+        kml_flights.values(),
+        get_all_flight_state_coordinates(
+            kml_content, list(kml_flights.values()), cache_dir
+        ),
+    ):
         flight_record = generate_flight_record(
             flight_state_coordinates,
-            flight_description,
-            operator_location,
+            flight_details["description"],
+            flight_details["operator_location"],
             flight_state_speeds,
             flight_track_angles,
             reference_time,
@@ -4,6 +4,12 @@ Testing can be invoked from the command line using:
 `pytest [test_*|*_test.py file/filepath]`
 """
 
+import json
+import os
+from datetime import datetime, timezone
+
+from shapely.geometry import Point, Polygon
+
 from . import kml_flights as frk
 
 PACKAGE = "monitoring.uss_qualifier.resources.netrid.simulation"
@@ -97,3 +103,53 @@ def test_get_track_angle():
         frk.get_track_angle(point1, point2) > 270
         and frk.get_track_angle(point1, point2) < 360
     )
+
+
+def test_get_interpolated_values():
+    polygons = [
+        [(0, 0), (10, 0), (10, 10), (0, 10)],
+        [(100, 0), (110, 0), (110, 10), (100, 10)],
+    ]
+    values = [10, 40]
+    points = [(5, 5), (50, 5), (20, -3), (105.05, 5)]
+    expected = [frk.get_interpolated_value(p, polygons, values) for p in points]
+    assert frk.get_interpolated_values(points, polygons, values) == expected
+    assert frk.get_interpolated_values([], polygons, values) == []
+
+
+def test_get_polygons_distances_from_points():
+    polygons = [
+        [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+        [(100, 0), (110, 0), (105, 10)],
+        [(20, 20), (40, 20), (40, 40), (30, 25), (20, 40)],
+    ]
+    points = [(5, 5), (50, 5), (20, -3), (105, 2), (0, 5), (30, 30), (30, 22)]
+    distances = frk.get_polygons_distances_from_points(points, polygons)
+    for point, row in zip(points, distances):
+        for poly, distance in zip(polygons, row):
+            assert abs(distance - Point(*point).distance(Polygon(poly))) < 1e-9
+    assert frk.get_polygons_distances_from_point(points[0], polygons) == list(
+        distances[0]
+    )
+
+
+def test_get_flight_records_cached(mocker, tmp_path):
+    kml_path = os.path.join(
+        os.path.dirname(__file__), "../../../test_data/che/rid/foca.kml"
+    )
+    with open(kml_path, "r") as f:
+        kml_content = f.read()
+    reference_time = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+    uncached = frk.get_flight_records(kml_content, reference_time, 12345, None)
+    generated = frk.get_flight_records(
+        kml_content, reference_time, 12345, str(tmp_path)
+    )
+    assert len(os.listdir(tmp_path)) == 1
+
+    mocker.patch(
+        f"{PACKAGE}.kml_flights.get_flight_state_coordinates",
+        side_effect=AssertionError("Flight state coordinates should be cached"),
+    )
+    cached = frk.get_flight_records(kml_content, reference_time, 12345, str(tmp_path))
+    assert json.dumps(cached) == json.dumps(generated) == json.dumps(uncached)
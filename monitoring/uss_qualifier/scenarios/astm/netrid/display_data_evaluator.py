@@ -108,7 +108,7 @@ class FetchedToInjectedCache(object):
 
 
 def map_observations_to_injected_flights(
-    injected_flights: List[InjectedFlight],
+    injected_flights: Union[List[InjectedFlight], InjectedFlightCollection],
     observed_flights: List[ObservationType],
 ) -> Dict[str, TelemetryMapping]:
     """Identify which of the observed flights (if any) matches to each of the injected flights
@@ -118,64 +118,80 @@ def map_observations_to_injected_flights(
     telemetry point in any InjectedFlight.  This assumption is checked by injected_flights_errors.
 
     Args:
-        injected_flights: Flights injected into RID Service Providers under test.
+        injected_flights: Flights injected into RID Service Providers under test.  Provide an InjectedFlightCollection
+            (which indexes the injected telemetry) to avoid indexing the flights on every call.
         observed_flights: Flight observed from an RID Display Provider under test.
 
     Returns: Mapping between InjectedFlight and observed Flight, indexed by injection_id.
     """
-    mapping: Dict[str, TelemetryMapping] = {}
-    for injected_flight in injected_flights:
-        smallest_distance = 1e9
-        best_match = None
-        for observed_flight in observed_flights:
-            if (
-                isinstance(observed_flight, Flight)
-                and "most_recent_position" not in observed_flight
-            ):
-                logger.warning(
-                    "observed_flight {} is missing most_recent_position",
-                    observed_flight.id,
-                )
-                continue
-            p = observed_flight.most_recent_position
-            if p is None:
-                logger.warning(
-                    "most_recent_position is None in observed_flight {}",
-                    observed_flight.id,
-                )
-                continue
-            for t1, injected_telemetry in enumerate(injected_flight.flight.telemetry):
-                dlat = abs(p.lat - injected_telemetry.position.lat)
-                dlng = abs(p.lng - injected_telemetry.position.lng)
-                if dlat < geo.COORD_TOLERANCE_DEG and dlng < geo.COORD_TOLERANCE_DEG:
-                    new_distance = math.sqrt(math.pow(dlat, 2) + math.pow(dlng, 2))
-                    if new_distance < smallest_distance:
-                        best_match = TelemetryMapping(
+    if not isinstance(injected_flights, InjectedFlightCollection):
+        injected_flights = InjectedFlightCollection(injected_flights)
+
+    positioned_flights: List[Tuple[ObservationType, Position]] = []
+    for observed_flight in observed_flights:
+        if (
+            isinstance(observed_flight, Flight)
+            and "most_recent_position" not in observed_flight
+        ):
+            logger.warning(
+                "observed_flight {} is missing most_recent_position",
+                observed_flight.id,
+            )
+            continue
+        p = observed_flight.most_recent_position
+        if p is None:
+            logger.warning(
+                "most_recent_position is None in observed_flight {}",
+                observed_flight.id,
+            )
+            continue
+        positioned_flights.append((observed_flight, p))
+    nearby_telemetry = injected_flights.telemetry_near(
+        [(p.lat, p.lng) for _, p in positioned_flights]
+    )
+
+    # Observed flights and telemetry points are visited in order, so ties go to the first candidate as they always have
+    best_matches: Dict[int, Tuple[float, TelemetryMapping]] = {}
+    for (observed_flight, p), nearby in zip(positioned_flights, nearby_telemetry):
+        for f, t1 in nearby:
+            injected_flight = injected_flights.injected_flights[f]
+            injected_telemetry = injected_flight.flight.telemetry[t1]
+            dlat = abs(p.lat - injected_telemetry.position.lat)
+            dlng = abs(p.lng - injected_telemetry.position.lng)
+            if dlat < geo.COORD_TOLERANCE_DEG and dlng < geo.COORD_TOLERANCE_DEG:
+                new_distance = math.sqrt(math.pow(dlat, 2) + math.pow(dlng, 2))
+                if f not in best_matches or new_distance < best_matches[f][0]:
+                    best_matches[f] = (
+                        new_distance,
+                        TelemetryMapping(
                             injected_flight=injected_flight,
                             telemetry_index=t1,
                             observed_flight=observed_flight,
-                        )
-                        smallest_distance = new_distance
-        if best_match is not None:
-            observed_p = best_match.observed_flight.most_recent_position
-            observed_lat = observed_p.lat if "lat" in observed_p else None
-            observed_lng = observed_p.lng if "lng" in observed_p else None
-            observed_alt = observed_p.alt if "alt" in observed_p else None
-            best_p = best_match.injected_flight.flight.telemetry[
-                best_match.telemetry_index
-            ].position
-            best_lat = best_p.lat if "lat" in best_p else None
-            best_lng = best_p.lng if "lng" in best_p else None
-            best_alt = best_p.alt if "alt" in best_p else None
-            logger.debug(
-                f"For injection ID {best_match.injected_flight.flight.injection_id}, matched observed flight {best_match.observed_flight.id} at ({observed_lat}, {observed_lng})+{observed_alt} to injected flight's telemetry index {best_match.telemetry_index} at ({best_lat}, {best_lng})+{best_alt}"
-            )
-            mapping[best_match.injected_flight.flight.injection_id] = best_match
+                        ),
+                    )
+
+    mapping: Dict[str, TelemetryMapping] = {}
+    for f in sorted(best_matches):
+        best_match = best_matches[f][1]
+        observed_p = best_match.observed_flight.most_recent_position
+        observed_lat = observed_p.lat if "lat" in observed_p else None
+        observed_lng = observed_p.lng if "lng" in observed_p else None
+        observed_alt = observed_p.alt if "alt" in observed_p else None
+        best_p = best_match.injected_flight.flight.telemetry[
+            best_match.telemetry_index
+        ].position
+        best_lat = best_p.lat if "lat" in best_p else None
+        best_lng = best_p.lng if "lng" in best_p else None
+        best_alt = best_p.alt if "alt" in best_p else None
+        logger.debug(
+            f"For injection ID {best_match.injected_flight.flight.injection_id}, matched observed flight {best_match.observed_flight.id} at ({observed_lat}, {observed_lng})+{observed_alt} to injected flight's telemetry index {best_match.telemetry_index} at ({best_lat}, {best_lng})+{best_alt}"
+        )
+        mapping[best_match.injected_flight.flight.injection_id] = best_match
     return mapping
 
 
 def map_fetched_to_injected_flights(
-    injected_flights: List[InjectedFlight],
+    injected_flights: Union[List[InjectedFlight], InjectedFlightCollection],
     fetched_flights: List[FetchedUSSFlights],
     query_cache: FetchedToInjectedCache,
 ) -> Dict[str, TelemetryMapping]:
@@ -248,8 +264,9 @@ class RIDObservationEvaluator(object):
             config, self._test_scenario, rid_version
         )
         self._injected_flights = injected_flights
+        self._injected_flight_collection = InjectedFlightCollection(injected_flights)
         self._virtual_observer = VirtualObserver(
-            injected_flights=InjectedFlightCollection(injected_flights),
+            injected_flights=self._injected_flight_collection,
             repeat_query_rect_period=config.repeat_query_rect_period,
             min_query_diagonal_m=config.min_query_diagonal,
             relevant_past_data_period=rid_version.realtime_period
@@ -287,7 +304,7 @@ class RIDObservationEvaluator(object):
 
             # map observed flights to injected flight and attribute participant ID
             mapping_by_injection_id = map_fetched_to_injected_flights(
-                self._injected_flights,
+                self._injected_flight_collection,
                 list(sp_observation.uss_flight_queries.values()),
                 self._query_cache,
             )
@@ -391,7 +408,7 @@ class RIDObservationEvaluator(object):
                 )
 
         mapping_by_injection_id = map_observations_to_injected_flights(
-            self._injected_flights, observation.flights
+            self._injected_flight_collection, observation.flights
         )
 
         _evaluate_flight_presence(
@@ -1021,6 +1038,7 @@ class DisconnectedUASObservationEvaluator(object):
             config, self._test_scenario, rid_version
         )
         self._injected_flights = injected_flights
+        self._injected_flight_collection = InjectedFlightCollection(injected_flights)
         self._config = config
         self._rid_version = rid_version
         self._dss = dss
@@ -1072,7 +1090,7 @@ class DisconnectedUASObservationEvaluator(object):
 
         # map observed flights to injected flight and attribute participant ID
         mapping_by_injection_id = map_fetched_to_injected_flights(
-            self._injected_flights,
+            self._injected_flight_collection,
             list(sp_observation.uss_flight_queries.values()),
             self._query_cache,
         )
@@ -1,7 +1,12 @@
+import math
+import random
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 import s2sphere
+from uas_standards.interuss.automated_testing.rid.v1.observation import Position
 
+from monitoring.monitorlib import geo
 from monitoring.monitorlib.fetch.rid import Flight
 from monitoring.monitorlib.rid import RIDVersion
 from monitoring.uss_qualifier.resources.netrid.evaluation import EvaluationConfiguration
@@ -11,6 +16,10 @@ from monitoring.uss_qualifier.scenarios.astm.netrid.common_dictionary_evaluator_
 )
 from monitoring.uss_qualifier.scenarios.astm.netrid.display_data_evaluator import (
     RIDObservationEvaluator,
+    map_observations_to_injected_flights,
+)
+from monitoring.uss_qualifier.scenarios.astm.netrid.injected_flight_collection import (
+    InjectedFlightCollection,
 )
 from monitoring.uss_qualifier.scenarios.interuss.unit_test import UnitTestScenario
 
@@ -244,3 +253,61 @@ def test_evaluate_sp_flight_recent_positions_crossing_area_boundary():
         mock_flight(datetime.now(timezone.utc), 7, 10),
         False,
     )
+
+
+def test_map_observations_to_injected_flights_matches_nearest_telemetry():
+    rng = random.Random(1)
+    tol = geo.COORD_TOLERANCE_DEG
+
+    def position(lat: float, lng: float) -> Position:
+        return Position(lat=lat, lng=lng, alt=100)
+
+    injected_flights = [
+        SimpleNamespace(
+            flight=SimpleNamespace(
+                injection_id=f"flight{f}",
+                telemetry=[
+                    SimpleNamespace(
+                        timestamp="2024-01-01T00:00:00Z",
+                        position=position(
+                            34 + f * 10 * tol + t * 0.5 * tol, -118 + t * 0.3 * tol
+                        ),
+                    )
+                    for t in range(50)
+                ],
+            )
+        )
+        for f in range(5)
+    ]
+    observed_flights = [
+        SimpleNamespace(
+            id=f"observed{i}",
+            most_recent_position=position(
+                34 + rng.uniform(-tol, 50 * tol), -118 + rng.uniform(-tol, 16 * tol)
+            ),
+        )
+        for i in range(40)
+    ]
+
+    # Compare against an exhaustive search for the nearest telemetry point within tolerance
+    expected = {}
+    for injected_flight in injected_flights:
+        candidates = []
+        for o, observed_flight in enumerate(observed_flights):
+            p = observed_flight.most_recent_position
+            for t, telemetry in enumerate(injected_flight.flight.telemetry):
+                dlat = abs(p.lat - telemetry.position.lat)
+                dlng = abs(p.lng - telemetry.position.lng)
+                if dlat < tol and dlng < tol:
+                    candidates.append((math.hypot(dlat, dlng), o, t))
+        if candidates:
+            _, o, t = min(candidates)
+            expected[injected_flight.flight.injection_id] = (observed_flights[o].id, t)
+
+    collection = InjectedFlightCollection(injected_flights)
+    for flights in (collection, injected_flights):
+        mapping = map_observations_to_injected_flights(flights, observed_flights)
+        assert {
+            k: (m.observed_flight.id, m.telemetry_index) for k, m in mapping.items()
+        } == expected
+    assert expected
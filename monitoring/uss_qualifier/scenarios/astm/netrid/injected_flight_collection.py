@@ -1,50 +1,147 @@
-from datetime import datetime
-from typing import List
+import bisect
+import math
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
 
 import arrow
+import numpy as np
 from s2sphere import LatLng, LatLngRect
 
 from monitoring.monitorlib import geo
 from monitoring.uss_qualifier.scenarios.astm.netrid.injection import InjectedFlight
 
+TelemetryLocation = Tuple[int, int]
+"""Index of an injected flight in an InjectedFlightCollection and index of a telemetry point in that flight."""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _to_us(t: datetime) -> int:
+    return (t - _EPOCH) // timedelta(microseconds=1)
+
+
+class _RangeExtreme(object):
+    """Sparse table answering queries for the extreme (minimum or maximum) of any contiguous range of values in
+    constant time."""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        extreme: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ):
+        # _levels[k][i] is the extreme of values[i:i + 2**k]
+        self._levels = [values]
+        self._extreme = extreme
+        width = 1
+        while 2 * width <= len(values):
+            previous = self._levels[-1]
+            self._levels.append(extreme(previous[:-width], previous[width:]))
+            width *= 2
+
+    def query(self, i0: int, i1: int) -> float:
+        """Extreme of values[i0:i1], which must not be empty."""
+        k = (i1 - i0).bit_length() - 1
+        level = self._levels[k]
+        return float(self._extreme(level[i0], level[i1 - (1 << k)]))
+
 
 class InjectedFlightCollection(object):
     _injected_flights: List[InjectedFlight]
 
+    _telemetry_grid: Dict[Tuple[int, int], List[TelemetryLocation]]
+    """Locations of all injected telemetry points, grouped by the cell of a lat/lng grid (with cells the size of the
+    coordinate tolerance) containing the point.  Locations in each cell are in order."""
+
+    _times_us: List[int]
+    """Timestamps of all injected telemetry points (microseconds since the Unix epoch), in ascending order."""
+
+    _lat_min: _RangeExtreme
+    _lat_max: _RangeExtreme
+    _lng_min: _RangeExtreme
+    _lng_max: _RangeExtreme
+    """Extremes of the coordinates of any range of telemetry points in timestamp order."""
+
+    _lat_sum: float
+    _lng_sum: float
+    _n_points: int
+
+    _t_end: Optional[arrow.Arrow]
+    """Latest timestamp of any injected telemetry point."""
+
     def __init__(self, injected_flights: List[InjectedFlight]):
         self._injected_flights = injected_flights
 
+        self._telemetry_grid = {}
+        points = []
+        for f, injected_flight in enumerate(injected_flights):
+            for t, telemetry in enumerate(injected_flight.flight.telemetry):
+                cell = _grid_cell(telemetry.position.lat, telemetry.position.lng)
+                self._telemetry_grid.setdefault(cell, []).append((f, t))
+                points.append(
+                    (
+                        arrow.get(telemetry.timestamp),
+                        telemetry.position.lat,
+                        telemetry.position.lng,
+                    )
+                )
+
+        # Envelope of telemetry points over time
+        points.sort(key=lambda p: p[0])
+        self._times_us = [_to_us(p[0].datetime) for p in points]
+        lats = np.array([p[1] for p in points], dtype=float)
+        lngs = np.array([p[2] for p in points], dtype=float)
+        self._lat_min = _RangeExtreme(lats, np.minimum)
+        self._lat_max = _RangeExtreme(lats, np.maximum)
+        self._lng_min = _RangeExtreme(lngs, np.minimum)
+        self._lng_max = _RangeExtreme(lngs, np.maximum)
+        self._lat_sum = sum(p[1] for p in points)
+        self._lng_sum = sum(p[2] for p in points)
+        self._n_points = len(points)
+        self._t_end = points[-1][0] if points else None
+
+    @property
+    def injected_flights(self) -> List[InjectedFlight]:
+        return self._injected_flights
+
+    def telemetry_near(
+        self, positions: List[Tuple[float, float]]
+    ) -> List[List[TelemetryLocation]]:
+        """Find the injected telemetry points that may lie within the coordinate tolerance of each (lat, lng) position.
+
+        Every telemetry point within geo.COORD_TOLERANCE_DEG in both latitude and longitude of a position is included
+        in the result for that position, along with some points slightly further away.
+
+        Returns:
+            For each position, the locations of nearby telemetry points in (flight index, telemetry index) order.
+        """
+        result = []
+        for lat, lng in positions:
+            i_lat, i_lng = _grid_cell(lat, lng)
+            nearby = []
+            for d_lat in (-1, 0, 1):
+                for d_lng in (-1, 0, 1):
+                    nearby.extend(
+                        self._telemetry_grid.get((i_lat + d_lat, i_lng + d_lng), [])
+                    )
+            nearby.sort()
+            result.append(nearby)
+        return result
+
     def get_query_rect(
         self, t_min: datetime, t_max: datetime, min_query_diagonal_m: float
     ) -> LatLngRect:
         # Find the bounds of all relevant points
-        data_exists = False
-        lat_min = 90
-        lng_min = 360
-        lat_max = -90
-        lng_max = -360
-        for injected_flight in self._injected_flights:
-            for telemetry in injected_flight.flight.telemetry:
-                t = arrow.get(telemetry.timestamp).datetime
-                if t_min <= t <= t_max:
-                    data_exists = True
-                    lat_min = min(lat_min, telemetry.position.lat)
-                    lat_max = max(lat_max, telemetry.position.lat)
-                    lng_min = min(lng_min, telemetry.position.lng)
-                    lng_max = max(lng_max, telemetry.position.lng)
-
-        # If there is no flight data yet, look at the center of where the data will be
-        if not data_exists:
-            lat = 0
-            lng = 0
-            n = 0
-            for injected_flight in self._injected_flights:
-                for telemetry in injected_flight.flight.telemetry:
-                    lat += telemetry.position.lat
-                    lng += telemetry.position.lng
-                    n += 1
-            lat_min = lat_max = lat / n
-            lng_min = lng_max = lng / n
+        i0 = bisect.bisect_left(self._times_us, _to_us(t_min))
+        i1 = bisect.bisect_right(self._times_us, _to_us(t_max))
+        if i0 < i1:
+            lat_min = self._lat_min.query(i0, i1)
+            lat_max = self._lat_max.query(i0, i1)
+            lng_min = self._lng_min.query(i0, i1)
+            lng_max = self._lng_max.query(i0, i1)
+        else:
+            # If there is no flight data yet, look at the center of where the data will be
+            lat_min = lat_max = self._lat_sum / self._n_points
+            lng_min = lng_max = self._lng_sum / self._n_points
 
         # Expand view size to meet minimum, if necessary
         OVERSHOOT = 1.01
@@ -80,9 +177,14 @@ class InjectedFlightCollection(object):
         return LatLngRect.from_point_pair(p1, p2)
 
     def get_end_of_injected_data(self) -> datetime:
-        t_end = arrow.utcnow()
-        for injected_flight in self._injected_flights:
-            for telemetry in injected_flight.flight.telemetry:
-                t = arrow.get(telemetry.timestamp)
-                t_end = max(t_end, t)
-        return t_end
+        t_now = arrow.utcnow()
+        if self._t_end is None:
+            return t_now
+        return max(t_now, self._t_end)
+
+
+def _grid_cell(lat: float, lng: float) -> Tuple[int, int]:
+    return (
+        math.floor(lat / geo.COORD_TOLERANCE_DEG),
+        math.floor(lng / geo.COORD_TOLERANCE_DEG),
+    )
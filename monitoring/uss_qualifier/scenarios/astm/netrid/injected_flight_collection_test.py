@@ -0,0 +1,68 @@
+import random
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import arrow
+from pytest import approx
+
+from monitoring.uss_qualifier.scenarios.astm.netrid.injected_flight_collection import (
+    InjectedFlightCollection,
+)
+
+# Telemetry is in the future so the end of injected data is determined by the telemetry
+T0 = datetime(2100, 1, 1, tzinfo=UTC)
+
+
+def _make_flights(rng: random.Random) -> list:
+    return [
+        SimpleNamespace(
+            flight=SimpleNamespace(
+                telemetry=[
+                    SimpleNamespace(
+                        timestamp=(
+                            T0 + timedelta(seconds=rng.randint(0, 600))
+                        ).isoformat(),
+                        position=SimpleNamespace(
+                            lat=34 + rng.uniform(-0.05, 0.05),
+                            lng=-118 + rng.uniform(-0.05, 0.05),
+                        ),
+                    )
+                    for _ in range(rng.randint(1, 40))
+                ]
+            )
+        )
+        for _ in range(6)
+    ]
+
+
+def test_query_rect_bounds_telemetry_in_time_range():
+    rng = random.Random(2)
+    flights = _make_flights(rng)
+    collection = InjectedFlightCollection(flights)
+    points = [t for f in flights for t in f.flight.telemetry]
+
+    for _ in range(50):
+        t_min = T0 + timedelta(seconds=rng.randint(-60, 600))
+        t_max = t_min + timedelta(seconds=rng.randint(0, 120))
+        rect = collection.get_query_rect(t_min, t_max, 0)
+        in_range = [
+            p.position
+            for p in points
+            if t_min <= arrow.get(p.timestamp).datetime <= t_max
+        ]
+        if in_range:
+            assert rect.lat_lo().degrees == approx(
+                min(p.lat for p in in_range), abs=1e-9
+            )
+            assert rect.lat_hi().degrees == approx(
+                max(p.lat for p in in_range), abs=1e-9
+            )
+            assert rect.lng_lo().degrees == approx(
+                min(p.lng for p in in_range), abs=1e-9
+            )
+            assert rect.lng_hi().degrees == approx(
+                max(p.lng for p in in_range), abs=1e-9
+            )
+
+    latest = max(arrow.get(p.timestamp) for p in points)
+    assert collection.get_end_of_injected_data() == latest
@@ -3,9 +3,11 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Dict, Iterator, List, Optional, Type, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import arrow
 import yaml
@@ -39,6 +41,7 @@ from monitoring.uss_qualifier.reports.report import (
     TestSuiteActionReport,
     TestSuiteReport,
 )
+from monitoring.uss_qualifier.reports.streaming import ScenarioReportSink
 from monitoring.uss_qualifier.resources.definitions import ResourceID
 from monitoring.uss_qualifier.resources.resource import (
     MissingResourceError,
@@ -331,31 +334,86 @@ class TestSuite(object):
         return report
 
 
+def _evaluate_action_report(
+    a: int,
+    action: Union[TestSuiteAction, SkippedActionReport],
+    action_report: TestSuiteActionReport,
+) -> Tuple[bool, bool]:
+    """Determine the consequences of the report of the action at index `a`.
+
+    Returns:
+        * True if the action was successful
+        * True if no further actions should be run
+    """
+    if action_report.has_critical_problem():
+        return False, True
+    if not action_report.successful():
+        if action.declaration.on_failure == ReactionToFailure.Abort:
+            return False, True
+        elif action.declaration.on_failure == ReactionToFailure.Continue:
+            return False, False
+        else:
+            raise ValueError(
+                f"Action {a} indicated an unrecognized reaction to failure: {str(action.declaration.on_failure)}"
+            )
+    return True, False
+
+
 def _run_actions(
     actions: Iterator[Union[TestSuiteAction, SkippedActionReport]],
     context: ExecutionContext,
     report: Union[TestSuiteReport, ActionGeneratorReport],
 ) -> None:
     success = True
+    stop = False
+
+    # Adjacent actions selected to run concurrently, along with their indices
+    concurrent: List[Tuple[int, ActionStackFrame]] = []
+
+    def run_concurrent_actions() -> None:
+        nonlocal success, stop
+
+        def stops_execution(
+            a_frame: Tuple[int, ActionStackFrame], action_report: TestSuiteActionReport
+        ) -> bool:
+            return _evaluate_action_report(
+                a_frame[0], a_frame[1].action, action_report
+            )[1]
+
+        action_reports = context.run_concurrently(concurrent, stops_execution)
+        for (a, frame), action_report in zip(concurrent, action_reports):
+            if action_report is None:
+                # Action was not started because an earlier action stopped execution
+                continue
+            report.actions.append(action_report)
+            action_success, action_stop = _evaluate_action_report(
+                a, frame.action, action_report
+            )
+            success = success and action_success
+            stop = stop or action_stop
+        concurrent.clear()
+
     for a, action in enumerate(actions):
+        if isinstance(action, TestSuiteAction):
+            frame = context.reserve_concurrent_frame(action)
+            if frame is not None:
+                concurrent.append((a, frame))
+                continue
+        if concurrent:
+            run_concurrent_actions()
+            if stop:
+                break
         if isinstance(action, SkippedActionReport):
             action_report = TestSuiteActionReport(skipped_action=action)
         else:
             action_report = action.run(context)
         report.actions.append(action_report)
-        if action_report.has_critical_problem():
-            success = False
+        action_success, stop = _evaluate_action_report(a, action, action_report)
+        success = success and action_success
+        if stop:
             break
-        if not action_report.successful():
-            success = False
-            if action.declaration.on_failure == ReactionToFailure.Abort:
-                break
-            elif action.declaration.on_failure == ReactionToFailure.Continue:
-                continue
-            else:
-                raise ValueError(
-                    f"Action {a} indicated an unrecognized reaction to failure: {str(action.declaration.on_failure)}"
-                )
+    if concurrent:
+        run_concurrent_actions()
     report.successful = success
     report.end_time = StringBasedDateTime(datetime.now(UTC))
 
@@ -366,6 +424,8 @@ class ActionStackFrame(object):
     parent: Optional[ActionStackFrame]
     children: List[ActionStackFrame]
     report: Optional[TestSuiteActionReport] = None
+    concurrent_group: Optional[object] = None
+    """Token shared by all frames run together by a single ExecutionContext.run_concurrently call."""
 
     def address(self) -> JSONAddress:
         if self.action.test_scenario is not None:
@@ -398,14 +458,37 @@ class ExecutionContext(object):
     start_time: datetime
     config: Optional[ExecutionConfiguration]
     top_frame: Optional[ActionStackFrame]
-    current_frame: Optional[ActionStackFrame]
+    report_sink: Optional[ScenarioReportSink]
+
+    _current_frame: Optional[ActionStackFrame]
+    """Current frame for all threads not running concurrent actions."""
+
+    _thread_state: threading.local
+    """Current and pending frames for each thread running a concurrent action."""
 
-    def __init__(self, config: Optional[ExecutionConfiguration]):
+    def __init__(
+        self,
+        config: Optional[ExecutionConfiguration],
+        report_sink: Optional[ScenarioReportSink] = None,
+    ):
         self.config = config
+        self.report_sink = report_sink
         self.top_frame = None
-        self.current_frame = None
+        self._current_frame = None
+        self._thread_state = threading.local()
         self.start_time = arrow.utcnow().datetime
 
+    @property
+    def current_frame(self) -> Optional[ActionStackFrame]:
+        return getattr(self._thread_state, "current_frame", self._current_frame)
+
+    @current_frame.setter
+    def current_frame(self, value: Optional[ActionStackFrame]) -> None:
+        if hasattr(self._thread_state, "current_frame"):
+            self._thread_state.current_frame = value
+        else:
+            self._current_frame = value
+
     def sibling_queries(self) -> Iterator[Query]:
         if self.current_frame.parent is None:
             return
@@ -450,20 +533,38 @@ class ExecutionContext(object):
         return False
 
     def _compute_n_of(
-        self, target: TestSuiteAction, condition: TestSuiteActionSelectionCondition
+        self, target: ActionStackFrame, condition: TestSuiteActionSelectionCondition
     ) -> int:
+        # Descendants of actions running concurrently with one of target's ancestors are created in an order that
+        # depends on timing, so they are not counted; only the concurrent actions themselves (whose frames were
+        # reserved in declaration order) are.
+        lineage = set()
+        concurrent_groups = set()
+        ancestor = target
+        while ancestor is not None:
+            lineage.add(id(ancestor))
+            if ancestor.concurrent_group is not None:
+                concurrent_groups.add(id(ancestor.concurrent_group))
+            ancestor = ancestor.parent
+
         n = 0
         queue = [self.top_frame]
         while queue:
             frame = queue.pop(0)
             if self._is_selected_by(frame, condition):
                 n += 1
-            if frame.action is target:
+            if frame is target:
                 return n
+            if (
+                frame.concurrent_group is not None
+                and id(frame.concurrent_group) in concurrent_groups
+                and id(frame) not in lineage
+            ):
+                continue
             for c, child in enumerate(frame.children):
                 queue.insert(c, child)
         raise RuntimeError(
-            f"Could not find target action '{target.get_name()}' anywhere in ExecutionContext"
+            f"Could not find target action '{target.action.get_name()}' anywhere in ExecutionContext"
         )
 
     def _ancestor_selected_by(
@@ -548,7 +649,7 @@ class ExecutionContext(object):
 
         if "nth_instance" in f and f.nth_instance is not None:
             if self._is_selected_by(frame, f.nth_instance.where_action):
-                n = self._compute_n_of(frame.action, f.nth_instance.where_action)
+                n = self._compute_n_of(frame, f.nth_instance.where_action)
                 if not any(r.includes(n) for r in f.nth_instance.n):
                     return False
                 result = True
@@ -610,10 +711,97 @@ class ExecutionContext(object):
 
         return None
 
+    def reserve_concurrent_frame(
+        self, action: TestSuiteAction
+    ) -> Optional[ActionStackFrame]:
+        """Reserve a frame for the specified child of the current action if the child is selected to run concurrently.
+
+        Returns: Reserved frame if the action should be run concurrently (via run_concurrently), otherwise None.
+        """
+        if (
+            not self.config
+            or "concurrency" not in self.config
+            or not self.config.concurrency
+            or self.current_frame is None
+        ):
+            return None
+
+        # The frame must be in place so that address- and instance-based conditions evaluate properly
+        frame = ActionStackFrame(action=action, parent=self.current_frame, children=[])
+        self.current_frame.children.append(frame)
+        if any(
+            self._is_selected_by(frame, condition)
+            for condition in self.config.concurrency.concurrent_action_when
+        ):
+            return frame
+        self.current_frame.children.pop()
+        return None
+
+    def run_concurrently(
+        self,
+        frames: List[Tuple[int, ActionStackFrame]],
+        stops_execution: Callable[
+            [Tuple[int, ActionStackFrame], TestSuiteActionReport], bool
+        ],
+    ) -> List[Optional[TestSuiteActionReport]]:
+        """Run the actions in frames reserved by reserve_concurrent_frame on a pool of worker threads.
+
+        While these actions run, nth_instance conditions evaluated inside one of them do not count instances inside
+        the others (see _compute_n_of) so that selection does not depend on timing.
+
+        Once an action completes with a report for which stops_execution returns True,
+        no further actions are started (but actions already started are completed).
+
+        Returns: Report for each frame, in the same order as frames, or None if the action in the frame was not started.
+        """
+        stop = threading.Event()
+        parent = self.current_frame
+        group = object()
+        for _, frame in frames:
+            frame.concurrent_group = group
+
+        def run(
+            a_frame: Tuple[int, ActionStackFrame],
+        ) -> Optional[TestSuiteActionReport]:
+            if stop.is_set():
+                return None
+            frame = a_frame[1]
+            self._thread_state.current_frame = parent
+            self._thread_state.pending_frame = frame
+            try:
+                action_report = frame.action.run(self)
+            finally:
+                del self._thread_state.current_frame
+                del self._thread_state.pending_frame
+            if stops_execution(a_frame, action_report):
+                stop.set()
+            return action_report
+
+        with ThreadPoolExecutor(
+            max_workers=self.config.concurrency.max_workers
+        ) as pool:
+            action_reports = list(pool.map(run, frames))
+
+        # Remove frames for actions that never started
+        not_started = {
+            id(frame)
+            for (_, frame), action_report in zip(frames, action_reports)
+            if action_report is None
+        }
+        if not_started:
+            parent.children[:] = [
+                c for c in parent.children if id(c) not in not_started
+            ]
+        return action_reports
+
     def begin_action(self, action: TestSuiteAction) -> None:
+        pending_frame = getattr(self._thread_state, "pending_frame", None)
         if self.top_frame is None:
             self.top_frame = ActionStackFrame(action=action, parent=None, children=[])
             self.current_frame = self.top_frame
+        elif pending_frame is not None and pending_frame.action is action:
+            self._thread_state.pending_frame = None
+            self.current_frame = pending_frame
         else:
             self.current_frame = ActionStackFrame(
                 action=action, parent=self.current_frame, children=[]
@@ -628,4 +816,6 @@ class ExecutionContext(object):
                 f"Action {self.current_frame.action.declaration.get_action_type()} {self.current_frame.action.declaration.get_child_type()} was started, but a different action {action.declaration.get_action_type()} {action.declaration.get_child_type()} was ended"
             )
         self.current_frame.report = report
+        if self.report_sink is not None:
+            self.report_sink.append_action(report)
         self.current_frame = self.current_frame.parent
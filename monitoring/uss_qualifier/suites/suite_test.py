@@ -0,0 +1,199 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from implicitdict import ImplicitDict
+
+from monitoring.uss_qualifier.configurations.configuration import (
+    ExecutionConfiguration,
+    TestSuiteActionSelectionCondition,
+)
+from monitoring.uss_qualifier.suites import suite
+from monitoring.uss_qualifier.suites.definitions import ReactionToFailure
+from monitoring.uss_qualifier.suites.suite import ExecutionContext, _run_actions
+
+
+class _FakeActionReport(object):
+    def __init__(self, name: str, successful: bool, critical: bool):
+        self.name = name
+        self._successful = successful
+        self._critical = critical
+
+    def successful(self) -> bool:
+        return self._successful
+
+    def has_critical_problem(self) -> bool:
+        return self._critical
+
+
+class _FakeAction(suite.TestSuiteAction):
+    def __init__(
+        self,
+        name: str,
+        delay_s: float = 0,
+        successful: bool = True,
+        critical: bool = False,
+        log: Dict[str, Tuple[float, float]] = None,
+    ):
+        self.declaration = SimpleNamespace(on_failure=ReactionToFailure.Continue)
+        self._name = name
+        self._delay_s = delay_s
+        self._successful = successful
+        self._critical = critical
+        self._log = log if log is not None else {}
+        self.frame_address = None
+
+    def get_name(self) -> str:
+        return self._name
+
+    def run(self, context: ExecutionContext) -> _FakeActionReport:
+        context.begin_action(self)
+        t0 = time.monotonic()
+        parent = context.current_frame.parent
+        self.frame_address = parent.children.index(context.current_frame)
+        time.sleep(self._delay_s)
+        self._log[self._name] = (t0, time.monotonic())
+        report = _FakeActionReport(self._name, self._successful, self._critical)
+        context.end_action(self, report)
+        return report
+
+
+def _make_context(max_workers: int) -> ExecutionContext:
+    config = ImplicitDict.parse(
+        {
+            "concurrency": {
+                "concurrent_action_when": [{"regex_matches_name": "^concurrent"}],
+                "max_workers": max_workers,
+            }
+        },
+        ExecutionConfiguration,
+    )
+    context = ExecutionContext(config)
+    context.begin_action(_FakeAction("top"))
+    return context
+
+
+def _run(context: ExecutionContext, actions: List[_FakeAction]):
+    report = SimpleNamespace(actions=[])
+    _run_actions(iter(actions), context, report)
+    return report
+
+
+def test_concurrent_actions_reported_in_order():
+    log = {}
+    actions = [
+        _FakeAction("concurrent1", 0.3, log=log),
+        _FakeAction("concurrent2", 0.1, log=log),
+        _FakeAction("sequential3", 0.1, log=log),
+        _FakeAction("concurrent4", 0.2, log=log),
+        _FakeAction("concurrent5", 0.1, log=log),
+    ]
+    context = _make_context(max_workers=4)
+    report = _run(context, actions)
+
+    assert report.successful
+    assert [r.name for r in report.actions] == [a.get_name() for a in actions]
+    assert [a.frame_address for a in actions] == [0, 1, 2, 3, 4]
+    assert [f.action for f in context.top_frame.children] == actions
+
+    # Adjacent concurrent actions overlap, but never with a sequential action
+    assert log["concurrent2"][0] < log["concurrent1"][1]
+    assert log["concurrent4"][0] < log["concurrent5"][1]
+    assert log["sequential3"][0] >= log["concurrent1"][1]
+    assert log["concurrent4"][0] >= log["sequential3"][1]
+    assert context.current_frame is context.top_frame
+
+
+def test_concurrent_actions_stop_fast():
+    actions = [
+        _FakeAction("concurrent1", critical=True, successful=False),
+        _FakeAction("concurrent2"),
+        _FakeAction("concurrent3"),
+        _FakeAction("sequential4"),
+    ]
+    context = _make_context(max_workers=1)
+    report = _run(context, actions)
+
+    assert not report.successful
+    assert [r.name for r in report.actions] == ["concurrent1"]
+    assert [f.action for f in context.top_frame.children] == actions[0:1]
+
+
+def test_concurrent_action_threads_have_own_frames():
+    barrier = threading.Barrier(2)
+
+    class _WaitingAction(_FakeAction):
+        def run(self, context: ExecutionContext) -> _FakeActionReport:
+            context.begin_action(self)
+            barrier.wait(timeout=5)
+            assert context.current_frame.action is self
+            barrier.wait(timeout=5)
+            report = _FakeActionReport(self._name, True, False)
+            context.end_action(self, report)
+            return report
+
+    context = _make_context(max_workers=2)
+    report = _run(
+        context, [_WaitingAction("concurrent1"), _WaitingAction("concurrent2")]
+    )
+    assert [r.name for r in report.actions] == ["concurrent1", "concurrent2"]
+
+
+class _SelectableAction(_FakeAction):
+    def run(self, context: ExecutionContext) -> _FakeActionReport:
+        context.begin_action(self)
+        self.skipped = context.evaluate_skip() is not None
+        time.sleep(self._delay_s)
+        report = _FakeActionReport(self._name, True, False)
+        context.end_action(self, report)
+        return report
+
+
+class _ParentAction(_FakeAction):
+    def __init__(self, name: str, children: List[_FakeAction]):
+        super(_ParentAction, self).__init__(name)
+        self._children = children
+
+    def run(self, context: ExecutionContext) -> _FakeActionReport:
+        context.begin_action(self)
+        _run(context, self._children)
+        report = _FakeActionReport(self._name, True, False)
+        context.end_action(self, report)
+        return report
+
+
+def test_concurrent_actions_nth_instance_independent_of_timing():
+    for slow_parent in (0, 1):
+        parents = [
+            _ParentAction(
+                f"concurrent{p}",
+                [
+                    _SelectableAction(
+                        f"child{p}.{c}", delay_s=0.2 if p == slow_parent else 0
+                    )
+                    for c in range(2)
+                ],
+            )
+            for p in range(2)
+        ]
+        trailing = _SelectableAction("child")
+        context = _make_context(max_workers=2)
+        context.config.skip_action_when = [
+            ImplicitDict.parse(
+                {
+                    "nth_instance": {
+                        "n": [{"i": 2}, {"i": 5}],
+                        "where_action": {"regex_matches_name": "^child"},
+                    }
+                },
+                TestSuiteActionSelectionCondition,
+            )
+        ]
+        _run(context, parents + [trailing])
+
+        # Within each concurrent action, only its own children are counted
+        for parent in parents:
+            assert [c.skipped for c in parent._children] == [False, True]
+        # Once the concurrent actions are complete, all their children are counted
+        assert trailing.skipped